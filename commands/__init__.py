@@ -5,13 +5,22 @@ from ..lib import fusionAddInUtils as futil
 # TODO Import the modules corresponding to the commands you created.
 # If you want to add an additional command, duplicate one of the existing directories and import it here.
 # You need to use aliases (import "entry" as "my_module") assuming you have the default module named "entry".
-from .commandDialog import entry as commandDialog
-from .paletteShow import entry as paletteShow
-from .paletteSend import entry as paletteSend
-from .steelPlateModule import entry as steelPlateModule
-from .steelTab import entry as steelTab
-from .splicePlate import entry as splicePlate
-from .gussetPlate import entry as gussetPlate
+# Each import is wrapped in futil.profile_step so the startup profile can show
+# which command module is slow to load.
+with futil.profile_step('import', 'commandDialog'):
+    from .commandDialog import entry as commandDialog
+with futil.profile_step('import', 'paletteShow'):
+    from .paletteShow import entry as paletteShow
+with futil.profile_step('import', 'paletteSend'):
+    from .paletteSend import entry as paletteSend
+with futil.profile_step('import', 'steelPlateModule'):
+    from .steelPlateModule import entry as steelPlateModule
+with futil.profile_step('import', 'steelTab'):
+    from .steelTab import entry as steelTab
+with futil.profile_step('import', 'splicePlate'):
+    from .splicePlate import entry as splicePlate
+with futil.profile_step('import', 'gussetPlate'):
+    from .gussetPlate import entry as gussetPlate
 
 # TODO add your imported modules to this list.
 # Fusion will automatically call the start() and stop() functions.
@@ -31,11 +40,20 @@ commands = [
 def start():
     for command in commands:
         try:
-            command.start()
+            with futil.profile_step('start', command.__name__):
+                command.start()
             futil.log(f'command started: {command.__name__}', force_console=True)
         except Exception:
             futil.handle_error(f'{command.__name__}.start', show_message_box=False)
 
+    # The diagnostic below costs several API round-trips per command, so it only
+    # runs while the startup profile is enabled.
+    if futil.startup_profile_enabled():
+        with futil.profile_step('diagnostic', 'resourceFolder'):
+            _log_command_resource_folders()
+
+
+def _log_command_resource_folders():
     # Diagnostic: log command definitions' resource folders to help icon troubleshooting
     try:
         import adsk.core
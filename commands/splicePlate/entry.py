@@ -5,6 +5,7 @@ import json
 import shutil
 from ...lib import fusionAddInUtils as futil
 from ... import config
+from ..steelPlateModule.entry import SPLICE_PLATE_TYPES
 from pathlib import Path
 import math
 
@@ -36,96 +37,8 @@ def load_splice_models():
 
 SPLICE_PLATE_MODELS = load_splice_models()
 
-# スプライスプレートの種類と寸法データ（H鋼フランジ部用）
-SPLICE_PLATE_TYPES = {
-    # H200用
-    'H200用A1': {'width': 285, 'height': 100, 'thickness': 9, 'hole_dia': 18, 
-                 'holes': [(40,18), (100,18), (185,18), (245,18), (40,82), (100,82), (185,82), (245,82)]},
-    'H200用A2': {'width': 285, 'height': 100, 'thickness': 12, 'hole_dia': 18, 
-                 'holes': [(40,18), (100,18), (185,18), (245,18), (40,82), (100,82), (185,82), (245,82)]},
-    
-    # H250用
-    'H250用A3': {'width': 285, 'height': 125, 'thickness': 9, 'hole_dia': 18, 
-                 'holes': [(40,25), (100,25), (185,25), (245,25), (40,100), (100,100), (185,100), (245,100)]},
-    'H250用A4': {'width': 285, 'height': 125, 'thickness': 12, 'hole_dia': 18, 
-                 'holes': [(40,25), (100,25), (185,25), (245,25), (40,100), (100,100), (185,100), (245,100)]},
-    'H250用B3': {'width': 285, 'height': 50, 'thickness': 9, 'hole_dia': 18, 
-                 'holes': [(40,25), (100,25), (185,25), (245,25)]},
-    
-    # H300用
-    'H300用A5': {'width': 285, 'height': 150, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,30), (100,30), (185,30), (245,30), (40,120), (100,120), (185,120), (245,120)]},
-    'H300用A6': {'width': 405, 'height': 150, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,30), (100,30), (160,30), (245,30), (305,30), (365,30), 
-                          (40,120), (100,120), (160,120), (245,120), (305,120), (365,120)]},
-    'H300用A7': {'width': 405, 'height': 150, 'thickness': 12, 'hole_dia': 22, 
-                 'holes': [(40,30), (100,30), (160,30), (245,30), (305,30), (365,30), 
-                          (40,120), (100,120), (160,120), (245,120), (305,120), (365,120)]},
-    'H300用B5': {'width': 285, 'height': 60, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,30), (100,30), (185,30), (245,30)]},
-    'H300用B6': {'width': 405, 'height': 60, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,30), (100,30), (160,30), (245,30), (305,30), (365,30)]},
-    
-    # H350用
-    'H350用A8': {'width': 285, 'height': 175, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,35), (100,35), (185,35), (245,35), (40,140), (100,140), (185,140), (245,140)]},
-    'H350用A9': {'width': 405, 'height': 175, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,35), (100,35), (160,35), (245,35), (305,35), (365,35), 
-                          (40,140), (100,140), (160,140), (245,140), (305,140), (365,140)]},
-    'H350用A10': {'width': 405, 'height': 175, 'thickness': 12, 'hole_dia': 22, 
-                  'holes': [(40,35), (100,35), (160,35), (245,35), (305,35), (365,35), 
-                           (40,140), (100,140), (160,140), (245,140), (305,140), (365,140)]},
-    'H350用B8': {'width': 285, 'height': 70, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,35), (100,35), (185,35), (245,35)]},
-    'H350用B9': {'width': 405, 'height': 70, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,35), (100,35), (160,35), (245,35), (305,35), (365,35)]},
-    
-    # H400用
-    'H400用A11': {'width': 405, 'height': 200, 'thickness': 9, 'hole_dia': 22, 
-                  'holes': [(40,40), (100,40), (160,40), (245,40), (305,40), (365,40), 
-                           (40,160), (100,160), (160,160), (245,160), (305,160), (365,160)]},
-    'H400用A12': {'width': 405, 'height': 200, 'thickness': 12, 'hole_dia': 22, 
-                  'holes': [(40,40), (100,40), (160,40), (245,40), (305,40), (365,40), 
-                           (40,160), (100,160), (160,160), (245,160), (305,160), (365,160)]},
-    'H400用B11': {'width': 405, 'height': 75, 'thickness': 9, 'hole_dia': 22, 
-                  'holes': [(40,37), (100,37), (160,37), (245,37), (305,37), (365,37)]},
-    'H400用B12': {'width': 405, 'height': 75, 'thickness': 12, 'hole_dia': 22, 
-                  'holes': [(40,37), (100,37), (160,37), (245,37), (305,37), (365,37)]},
-    
-    # H400・500用
-    'H400・500用A13': {'width': 525, 'height': 200, 'thickness': 12, 'hole_dia': 22, 
-                      'holes': [(40,40), (100,40), (160,40), (220,40), (305,40), (365,40), (425,40), (485,40), 
-                               (40,160), (100,160), (160,160), (220,160), (305,160), (365,160), (425,160), (485,160)]},
-    'H400・500用A14': {'width': 525, 'height': 200, 'thickness': 16, 'hole_dia': 22, 
-                      'holes': [(40,40), (100,40), (160,40), (220,40), (305,40), (365,40), (425,40), (485,40), 
-                               (40,160), (100,160), (160,160), (220,160), (305,160), (365,160), (425,160), (485,160)]},
-    'H400・500用B13': {'width': 525, 'height': 80, 'thickness': 12, 'hole_dia': 22, 
-                      'holes': [(40,40), (100,40), (160,40), (220,40), (305,40), (365,40), (425,40), (485,40)]},
-    'H400・500用B14': {'width': 525, 'height': 80, 'thickness': 16, 'hole_dia': 22, 
-                      'holes': [(40,40), (100,40), (160,40), (220,40), (305,40), (365,40), (425,40), (485,40)]},
-    
-    # H鋼ウェブ部用
-    'H200用W1': {'width': 165, 'height': 140, 'thickness': 6, 'hole_dia': 18, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100)]},
-    'H250用W2': {'width': 165, 'height': 200, 'thickness': 6, 'hole_dia': 18, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160)]},
-    'H300用W3': {'width': 165, 'height': 200, 'thickness': 6, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160)]},
-    'H300用W4': {'width': 165, 'height': 220, 'thickness': 6, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220)]},
-    'H350用W5': {'width': 165, 'height': 260, 'thickness': 6, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220)]},
-    'H350用W6': {'width': 165, 'height': 260, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220)]},
-    'H400用W7': {'width': 165, 'height': 290, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220), (40,250), (85,250), (125,250)]},
-    'H450用W8': {'width': 165, 'height': 320, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220), (40,280), (85,280), (125,280)]},
-    'H500用W9': {'width': 165, 'height': 360, 'thickness': 9, 'hole_dia': 22, 
-                 'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220), (40,280), (85,280), (125,280), (40,320), (85,320), (125,320)]},
-    'H600用W10': {'width': 165, 'height': 440, 'thickness': 9, 'hole_dia': 22, 
-                  'holes': [(40,40), (85,40), (125,40), (40,100), (85,100), (125,100), (40,160), (85,160), (125,160), (40,220), (85,220), (125,220), (40,280), (85,280), (125,280), (40,340), (85,340), (125,340), (40,400), (85,400), (125,400)]},
-}
+# スプライスプレートの種類と寸法データは steelPlateModule の SPLICE_PLATE_TYPES を共用
+# （表を二重管理すると寸法がずれるため）
 
 def start():
     # Disabled - UI elements removed from menu
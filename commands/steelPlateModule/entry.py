@@ -4,11 +4,14 @@ import os
 import json
 import shutil
 from ...lib import fusionAddInUtils as futil
+from ...lib.steelUtils.plate_geometry import PlateGeometry
+from ...lib.steelUtils import splice_rules, bolt_capacity, hole_validator, gusset_specs, gusset_sizing, frame_layout, transforms, bolt_sets, splice_joint, section_recognition, principal_axes, bom, section_properties, cutting_stock, nesting, dxf, dstv, ifc
 from ... import config
 from pathlib import Path
 import math
 import struct
 import zlib
+from array import array
 
 app = adsk.core.Application.get()
 ui = app.userInterface
@@ -212,6 +215,42 @@ SPLICE_PLATE_TYPES = {
                   'holes': [(40,40), (125,40), (40,100), (125,100), (40,160), (125,160), (40,220), (125,220), (40,280), (125,280), (40,340), (125,340), (40,400), (125,400)]},
 }
 
+# スプライスタブの「対象H形鋼」で標準表を選んだときの項目名
+SPLICE_STANDARD_TABLE = '標準表'
+
+# ボルトタブで穴径からボルト呼びを決めるときの項目名
+BOLT_SIZE_AUTO = '穴径から'
+
+# 穴配置を検査済みのプレート表（標準表 / 対象H形鋼名）
+_validated_plate_tables = set()
+
+def get_splice_plate_types(section_name: str = SPLICE_STANDARD_TABLE) -> dict:
+    """対象H形鋼に応じたプレートタイプ表を返す（標準表 または ルールから生成）"""
+    if not section_name or section_name == SPLICE_STANDARD_TABLE:
+        plate_types = SPLICE_PLATE_TYPES
+        section_name = SPLICE_STANDARD_TABLE
+    else:
+        plate_types = splice_rules.splice_plate_table([section_name])
+    _validate_plate_table(section_name, plate_types)
+    return plate_types
+
+def _validate_plate_table(table_name: str, plate_types: dict) -> None:
+    """プレート表の穴配置（縁端距離・ピッチ・重なり）を表ごとに1回だけ検査してログに出す"""
+    if table_name in _validated_plate_tables:
+        return
+    _validated_plate_tables.add(table_name)
+    for plate_type, violations in hole_validator.validate_table(plate_types).items():
+        futil.log(f'穴配置の警告 [{table_name}] {plate_type}: {hole_validator.summarize(violations)}',
+                  force_console=True)
+
+def get_splice_plate_data(plate_type: str):
+    """プレートタイプ名から寸法データを取得（生成プレートは '<形鋼名> <役割>' 形式）"""
+    plate_data = SPLICE_PLATE_TYPES.get(plate_type)
+    if plate_data is None and ' ' in plate_type:
+        section_name = plate_type.rsplit(' ', 1)[0]
+        plate_data = splice_rules.splice_plate_table([section_name]).get(plate_type)
+    return plate_data
+
 # ============================================================================
 # コマンド開始/停止
 # ============================================================================
@@ -284,6 +323,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     # タブ: スプライス / ガセット / カスタム
     tab_splice = inputs.addTabCommandInput('tab_splice', 'スプライスプレート')
     tab_gusset = inputs.addTabCommandInput('tab_gusset', 'ガセットプレート')
+    tab_bolt = inputs.addTabCommandInput('tab_bolt', 'ボルト')
     tab_custom = inputs.addTabCommandInput('tab_custom', 'カスタムプレート')
     tab_section = inputs.addTabCommandInput('tab_section', '形鋼')
     tab_light_section = inputs.addTabCommandInput('tab_light_section', '軽量用形鋼')
@@ -291,9 +331,22 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     # --- スプライスタブ ---
     splice_inputs = tab_splice.children
 
+    # モード選択（標準作成 / 継手）
+    splice_mode = splice_inputs.addDropDownCommandInput('splice_mode', 'モード', adsk.core.DropDownStyles.TextListDropDownStyle)
+    splice_mode.listItems.add('標準作成', True)
+    splice_mode.listItems.add('継手', False)
+
+    # 対象H形鋼: 標準表、または形鋼カタログのH形鋼から継手プレートを生成
+    splice_section_input = splice_inputs.addDropDownCommandInput('splice_section', '対象H形鋼',
+                                                                 adsk.core.DropDownStyles.TextListDropDownStyle)
+    splice_section_input.listItems.add(SPLICE_STANDARD_TABLE, True)
+    for section_name in SECTION_STEEL_MODELS.get('H形鋼', {}).get('models', {}):
+        if splice_rules.parse_h_section(section_name):
+            splice_section_input.listItems.add(section_name, False)
+
     splice_plate_type_input = splice_inputs.addDropDownCommandInput('splice_plate_type', 'プレートタイプ', 
                                                                      adsk.core.DropDownStyles.TextListDropDownStyle)
-    for plate_type in SPLICE_PLATE_TYPES.keys():
+    for plate_type in get_splice_plate_types().keys():
         splice_plate_type_input.listItems.add(plate_type, False)
     splice_plate_type_input.listItems.item(0).isSelected = True
 
@@ -304,6 +357,12 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     splice_inputs.addValueInput('splice_hole_diameter', 'ボルト穴径', 'mm',
                                 adsk.core.ValueInput.createByReal(default_plate['hole_dia'] / 10.0))
 
+    # 設計応力を入れると、足りる最も軽いプレートを選び直す（0 なら検定しない）
+    splice_inputs.addValueInput('splice_design_force', '設計応力 (kN)', '',
+                                adsk.core.ValueInput.createByReal(0))
+    splice_inputs.addTextBoxCommandInput('splice_capacity', '耐力検定', '', 2, True)
+    splice_inputs.addTextBoxCommandInput('splice_hole_check', '穴配置', _hole_check_text(default_plate), 1, True)
+
     preview_path = _build_preview_png(default_plate)
     splice_inputs.addImageCommandInput('splice_plate_preview', 'プレビュー', preview_path.replace('\\','/'))
 
@@ -313,12 +372,21 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     splice_target.addSelectionFilter('Edges')
     splice_target.setSelectionLimits(0, 1)
 
-    # --- ガセットタブ（配置 / 登録 切替） ---
+    # 継手: 同じ材軸に並ぶH形鋼（2本以上）、または H形鋼1本をクリックした位置
+    splice_joint_sel = splice_inputs.addSelectionInput('splice_joint_sel', '部材', 'H形鋼のオカレンス/ボディを選択')
+    splice_joint_sel.addSelectionFilter('Occurrences')
+    splice_joint_sel.addSelectionFilter('SolidBodies')
+    splice_joint_sel.setSelectionLimits(0, 0)
+    splice_inputs.addTextBoxCommandInput('splice_joint_info', '継手', 'H形鋼を選択してください', 2, True)
+
+    # --- ガセットタブ（配置 / 作成 / 自動選定 / 登録 切替） ---
     gusset_inputs = tab_gusset.children
     
-    # モード選択（配置 / 登録）
+    # モード選択（配置 / 作成 / 自動選定 / 登録）
     gusset_mode = gusset_inputs.addDropDownCommandInput('gusset_mode', 'モード', adsk.core.DropDownStyles.TextListDropDownStyle)
     gusset_mode.listItems.add('配置', True)
+    gusset_mode.listItems.add('作成', False)
+    gusset_mode.listItems.add('自動選定', False)
     gusset_mode.listItems.add('登録', False)
     
     # 配置用グループ
@@ -333,6 +401,39 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     gusset_target.addSelectionFilter('Vertices')
     gusset_target.addSelectionFilter('Edges')
     gusset_target.setSelectionLimits(0, 1)
+
+    # 作成用グループ（仕様表から形状を生成）
+    gusset_create_grp = gusset_inputs.addGroupCommandInput('gusset_create_grp', '標準ガセット作成')
+    gusset_create_children = gusset_create_grp.children
+    gusset_spec_input = gusset_create_children.addDropDownCommandInput('gusset_spec', 'ガセット系列',
+                                                                    adsk.core.DropDownStyles.TextListDropDownStyle)
+    for i, name in enumerate(gusset_specs.GUSSET_SPECS):
+        gusset_spec_input.listItems.add(name, i == 0)
+    default_spec = next(iter(gusset_specs.GUSSET_SPECS))
+    gusset_create_children.addValueInput('gusset_spec_thickness', '板厚', 'mm',
+                                         adsk.core.ValueInput.createByReal(gusset_specs.GUSSET_SPECS[default_spec].thickness / 10.0))
+    gusset_create_children.addTextBoxCommandInput('gusset_spec_info', '仕様', gusset_specs.describe(default_spec), 1, True)
+    gusset_create_target = gusset_create_children.addSelectionInput('gusset_create_target_sel', '配置先', '面/点/エッジを選択')
+    gusset_create_target.addSelectionFilter('PlanarFaces')
+    gusset_create_target.addSelectionFilter('Vertices')
+    gusset_create_target.addSelectionFilter('Edges')
+    gusset_create_target.setSelectionLimits(0, 1)
+
+    # 自動選定用グループ（取付部材とブレースから寸法を決める）
+    gusset_size_grp = gusset_inputs.addGroupCommandInput('gusset_size_grp', 'ガセット自動選定')
+    gusset_size_children = gusset_size_grp.children
+    gusset_members = gusset_size_children.addSelectionInput('gusset_members_sel', '部材', '取付部材、ブレースの順に選択')
+    gusset_members.addSelectionFilter('Bodies')
+    gusset_members.addSelectionFilter('Occurrences')
+    gusset_members.addSelectionFilter('LinearEdges')
+    gusset_members.setSelectionLimits(0, 2)
+    gusset_size_children.addValueInput('gusset_brace_force', '設計応力 (kN)', '',
+                                       adsk.core.ValueInput.createByReal(100.0))
+    gusset_size_bolt = gusset_size_children.addDropDownCommandInput('gusset_size_bolt', 'ボルト',
+                                                                    adsk.core.DropDownStyles.TextListDropDownStyle)
+    for bolt in ('M16', 'M20', 'M22'):
+        gusset_size_bolt.listItems.add(bolt, bolt == 'M20')
+    gusset_size_children.addTextBoxCommandInput('gusset_size_result', '選定結果', '取付部材とブレースを選択してください', 2, True)
     
     # 登録用グループ
     gusset_reg_grp = gusset_inputs.addGroupCommandInput('gusset_reg_grp', 'ファイル登録')
@@ -344,8 +445,24 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     
     # 初期表示（デフォルトは「配置」のみ）
     gusset_place_grp.isVisible = True
+    gusset_create_grp.isVisible = False
+    gusset_size_grp.isVisible = False
     gusset_reg_grp.isVisible = False
 
+    # --- ボルトタブ（プレートの穴にボルトセットを配置） ---
+    bolt_inputs = tab_bolt.children
+    bolt_plates = bolt_inputs.addSelectionInput('bolt_plates_sel', 'プレート', 'ボルトを通すプレートを選択')
+    bolt_plates.addSelectionFilter('Occurrences')
+    bolt_plates.addSelectionFilter('Bodies')
+    bolt_plates.setSelectionLimits(0, 0)
+    bolt_size = bolt_inputs.addDropDownCommandInput('bolt_size', 'ボルト', adsk.core.DropDownStyles.TextListDropDownStyle)
+    bolt_size.listItems.add(BOLT_SIZE_AUTO, True)
+    for bolt in bolt_sets.BOLT_DIMENSIONS:
+        bolt_size.listItems.add(bolt, False)
+    # 選んだプレート以外に締め付ける板厚（片側のプレートだけを選んだときの母材など）
+    bolt_inputs.addValueInput('bolt_extra_grip', '追加の締付け長さ', 'mm', adsk.core.ValueInput.createByReal(0.0))
+    bolt_inputs.addTextBoxCommandInput('bolt_info', 'ボルトセット', 'プレートを選択してください', 2, True)
+
     # --- カスタムタブ（配置 / 登録 切替） ---
     custom_inputs = tab_custom.children
     # モード選択（配置 / 登録）
@@ -378,9 +495,11 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
     # --- 形鋼タブ ---
     section_inputs = tab_section.children
-    # モード選択（配置 / 登録）
+    # モード選択（配置 / 2点 / 骨組 / 登録）
     section_mode = section_inputs.addDropDownCommandInput('section_mode', 'モード', adsk.core.DropDownStyles.TextListDropDownStyle)
     section_mode.listItems.add('配置', True)
+    section_mode.listItems.add('2点', False)
+    section_mode.listItems.add('骨組', False)
     section_mode.listItems.add('登録', False)
 
     # 配置用グループ
@@ -393,18 +512,44 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
     section_model_input = section_place_children.addDropDownCommandInput('section_model', 'モデル', adsk.core.DropDownStyles.TextListDropDownStyle)
     refresh_section_model_list(section_model_input, SECTION_STEEL_CATEGORIES[0])
+    section_place_children.addTextBoxCommandInput('section_properties', '断面性能', '', 1, True)
+    _update_section_properties(inputs, 'section_model', 'section_properties')
 
     section_target = section_place_children.addSelectionInput('section_target_sel', '配置先', '面/点/エッジを選択')
     section_target.addSelectionFilter('PlanarFaces')
+    section_target.addSelectionFilter('CylindricalFaces')
     section_target.addSelectionFilter('Vertices')
     section_target.addSelectionFilter('Edges')
-    section_target.setSelectionLimits(0, 1)
+    # 頂点＋エッジの2つを選ぶと頂点からエッジ方向へ配置
+    section_target.setSelectionLimits(0, 2)
 
     # 高さ入力（mm）
     section_place_children.addValueInput(
         'section_height', '高さ', 'mm', adsk.core.ValueInput.createByReal(100.0)
     )
 
+    # 2点配置用グループ（カテゴリ・モデルは配置用グループの選択を使う）
+    section_twopoint_grp = section_inputs.addGroupCommandInput('section_twopoint_grp', '2点配置')
+    section_twopoint_children = section_twopoint_grp.children
+    for input_id, label in (('section_start_sel', '始点'), ('section_end_sel', '終点')):
+        point_sel = section_twopoint_children.addSelectionInput(input_id, label, f'{label}を選択')
+        point_sel.addSelectionFilter('Vertices')
+        point_sel.addSelectionFilter('SketchPoints')
+        point_sel.addSelectionFilter('ConstructionPoints')
+        point_sel.setSelectionLimits(0, 1)
+    section_twopoint_children.addValueInput('section_roll', '材軸まわりの回転', 'deg',
+                                            adsk.core.ValueInput.createByReal(0.0))
+    section_twopoint_children.addTextBoxCommandInput('section_twopoint_info', '部材', '始点と終点を選択してください', 1, True)
+
+    # 骨組用グループ（カテゴリ・モデルは配置用グループの選択を使う）
+    section_frame_grp = section_inputs.addGroupCommandInput('section_frame_grp', '骨組')
+    section_frame_children = section_frame_grp.children
+    section_frame_lines = section_frame_children.addSelectionInput('section_frame_lines', '部材線', 'スケッチ線/エッジを選択')
+    section_frame_lines.addSelectionFilter('SketchLines')
+    section_frame_lines.addSelectionFilter('LinearEdges')
+    section_frame_lines.setSelectionLimits(0, 0)
+    section_frame_children.addTextBoxCommandInput('section_frame_info', '部材', '線が選択されていません', 1, True)
+
     # 登録用グループ
     section_reg_grp = section_inputs.addGroupCommandInput('section_reg_grp', 'ファイル登録')
     section_reg_children = section_reg_grp.children
@@ -419,6 +564,8 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
     # 初期表示（デフォルトは「配置」のみ）
     section_place_grp.isVisible = True
+    section_twopoint_grp.isVisible = False
+    section_frame_grp.isVisible = False
     section_reg_grp.isVisible = False
 
     # --- 軽量形鋼タブ ---
@@ -438,12 +585,16 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
     light_section_model_input = light_section_place_children.addDropDownCommandInput('light_section_model', 'モデル', adsk.core.DropDownStyles.TextListDropDownStyle)
     refresh_light_section_model_list(light_section_model_input, LIGHT_SECTION_CATEGORIES[0])
+    light_section_place_children.addTextBoxCommandInput('light_section_properties', '断面性能', '', 1, True)
+    _update_section_properties(inputs, 'light_section_model', 'light_section_properties')
 
     light_section_target = light_section_place_children.addSelectionInput('light_section_target_sel', '配置先', '面/点/エッジを選択')
     light_section_target.addSelectionFilter('PlanarFaces')
+    light_section_target.addSelectionFilter('CylindricalFaces')
     light_section_target.addSelectionFilter('Vertices')
     light_section_target.addSelectionFilter('Edges')
-    light_section_target.setSelectionLimits(0, 1)
+    # 頂点＋エッジの2つを選ぶと頂点からエッジ方向へ配置
+    light_section_target.setSelectionLimits(0, 2)
 
     light_section_place_children.addValueInput(
         'light_section_height', '高さ', 'mm', adsk.core.ValueInput.createByReal(100.0)
@@ -505,6 +656,40 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     piping_place_grp.isVisible = True
     piping_reg_grp.isVisible = False
 
+    # --- 部材表タブ ---
+    tab_bom = inputs.addTabCommandInput('tab_bom', '部材表')
+    bom_inputs = tab_bom.children
+    bom_format = bom_inputs.addDropDownCommandInput('bom_format', '形式', adsk.core.DropDownStyles.TextListDropDownStyle)
+    bom_format.listItems.add('CSV', True)
+    bom_format.listItems.add('JSON', False)
+    bom_format.listItems.add('切断計画', False)
+    bom_format.listItems.add('板取り', False)
+    bom_format.listItems.add('DXF', False)
+    bom_format.listItems.add('NC1', False)
+    bom_format.listItems.add('IFC', False)
+    # 切断計画（定尺材からの板取り）の条件
+    bom_stock = bom_inputs.addStringValueInput('bom_stock_lengths', '定尺 (mm)',
+                                               ', '.join(f'{v:g}' for v in cutting_stock.STOCK_LENGTHS))
+    bom_kerf = bom_inputs.addValueInput('bom_kerf', '切りしろ', 'mm', adsk.core.ValueInput.createByReal(cutting_stock.KERF / 10.0))
+    bom_exact = bom_inputs.addBoolValueInput('bom_exact', f'{cutting_stock.EXACT_LIMIT}本以下は最適解を探す', True, '', False)
+    # 板取り（鋼板からのプレートのネスティング）の条件
+    bom_sheets = bom_inputs.addStringValueInput('bom_sheet_sizes', '鋼板 (mm)',
+                                                ', '.join(f'{w:g}×{h:g}' for w, h in nesting.SHEET_SIZES))
+    bom_spacing = bom_inputs.addValueInput('bom_spacing', '部品の間隔', 'mm', adsk.core.ValueInput.createByReal(nesting.SPACING / 10.0))
+    bom_polygon = bom_inputs.addBoolValueInput('bom_polygon', 'ガセットを回転・組み合わせて並べる', True, '', False)
+    # プレートの DXF（展開図）の対象と出力先
+    bom_dxf_source = bom_inputs.addDropDownCommandInput('bom_dxf_source', 'プレート', adsk.core.DropDownStyles.TextListDropDownStyle)
+    bom_dxf_source.listItems.add('配置済み', True)
+    bom_dxf_source.listItems.add('カタログ', False)
+    bom_dxf_combined = bom_inputs.addBoolValueInput('bom_dxf_combined', '1つのファイルにまとめる', True, '', False)
+    # DSTV（NC1）の鋼種
+    bom_nc_grade = bom_inputs.addStringValueInput('bom_nc_grade', '鋼種', dstv.DEFAULT_GRADE)
+    for inp in (bom_stock, bom_kerf, bom_exact, bom_sheets, bom_spacing, bom_polygon, bom_dxf_source, bom_dxf_combined,
+                bom_nc_grade):
+        inp.isVisible = False
+    bom_inputs.addBoolValueInput('bom_count', '集計', False, '', False)
+    bom_inputs.addTextBoxCommandInput('bom_info', '部材', '「集計」で配置済みの部材を数えます。OK で書き出します', 2, True)
+
     set_splice_visibility(inputs, '標準作成')
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
     # OK押下時の実行イベント（未登録だと何も起きない）
@@ -513,12 +698,19 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 
 def set_splice_visibility(inputs: adsk.core.CommandInputs, splice_mode: str):
     """スプライスタブ内のモードに応じて表示を切替"""
-    splice_standard = ['splice_plate_type', 'splice_thickness', 'splice_hole_diameter', 'splice_plate_preview']
+    splice_standard = ['splice_section', 'splice_target_sel', 'splice_plate_type', 'splice_thickness',
+                       'splice_hole_diameter', 'splice_design_force', 'splice_capacity', 'splice_hole_check',
+                       'splice_plate_preview']
     splice_register = ['splice_model']
+    splice_joint_inputs = ['splice_joint_sel', 'splice_joint_info']
     for i in splice_standard:
         inp = inputs.itemById(i)
         if inp:
             inp.isVisible = (splice_mode == '標準作成')
+    for i in splice_joint_inputs:
+        inp = inputs.itemById(i)
+        if inp:
+            inp.isVisible = (splice_mode == '継手')
     for i in splice_register:
         inp = inputs.itemById(i)
         if inp:
@@ -536,22 +728,28 @@ def command_execute(args: adsk.core.CommandEventArgs):
 
         tab_splice = inputs.itemById('tab_splice')
         tab_gusset = inputs.itemById('tab_gusset')
+        tab_bolt = inputs.itemById('tab_bolt')
         tab_custom = inputs.itemById('tab_custom')
         tab_section = inputs.itemById('tab_section')
         tab_light_section = inputs.itemById('tab_light_section')
+        tab_bom = inputs.itemById('tab_bom')
 
         if tab_splice and tab_splice.isActive:
-            plate_type = inputs.itemById('splice_plate_type').selectedItem.name
-            thickness = inputs.itemById('splice_thickness').value
-            hole_diameter = inputs.itemById('splice_hole_diameter').value
-            target_sel = inputs.itemById('splice_target_sel')
-            placement_point = adsk.core.Point3D.create(0, 0, 0)
-            if target_sel and target_sel.selectionCount > 0:
-                try:
-                    placement_point = target_sel.selection(0).point
-                except Exception:
-                    placement_point = adsk.core.Point3D.create(0, 0, 0)
-            create_splice_plate(plate_type, thickness, hole_diameter, placement_point)
+            mode_input = inputs.itemById('splice_mode')
+            if mode_input and mode_input.selectedItem and mode_input.selectedItem.name == '継手':
+                create_splice_joint(inputs.itemById('splice_joint_sel'))
+            else:
+                plate_type = inputs.itemById('splice_plate_type').selectedItem.name
+                thickness = inputs.itemById('splice_thickness').value
+                hole_diameter = inputs.itemById('splice_hole_diameter').value
+                target_sel = inputs.itemById('splice_target_sel')
+                placement_point = adsk.core.Point3D.create(0, 0, 0)
+                if target_sel and target_sel.selectionCount > 0:
+                    try:
+                        placement_point = target_sel.selection(0).point
+                    except Exception:
+                        placement_point = adsk.core.Point3D.create(0, 0, 0)
+                create_splice_plate(plate_type, thickness, hole_diameter, placement_point)
 
         elif tab_gusset and tab_gusset.isActive:
             mode_input = inputs.itemById('gusset_mode')
@@ -565,6 +763,19 @@ def command_execute(args: adsk.core.CommandEventArgs):
                     except Exception:
                         placement_point = adsk.core.Point3D.create(0, 0, 0)
                 place_gusset_model(model_name, placement_point)
+            elif mode_input and mode_input.selectedItem and mode_input.selectedItem.name == '作成':
+                spec_name = inputs.itemById('gusset_spec').selectedItem.name
+                thickness = inputs.itemById('gusset_spec_thickness').value
+                target_sel = inputs.itemById('gusset_create_target_sel')
+                placement_point = adsk.core.Point3D.create(0, 0, 0)
+                if target_sel and target_sel.selectionCount > 0:
+                    try:
+                        placement_point = target_sel.selection(0).point
+                    except Exception:
+                        placement_point = adsk.core.Point3D.create(0, 0, 0)
+                create_gusset_plate(spec_name, thickness, placement_point)
+            elif mode_input and mode_input.selectedItem and mode_input.selectedItem.name == '自動選定':
+                create_sized_gusset(inputs)
             else:
                 # 登録処理
                 reg_name_input = inputs.itemById('gusset_register_name')
@@ -599,6 +810,9 @@ def command_execute(args: adsk.core.CommandEventArgs):
                 inputs.itemById('gusset_register_path').value = ''
                 inputs.itemById('gusset_register_desc').value = ''
 
+        elif tab_bolt and tab_bolt.isActive:
+            place_bolt_sets(inputs)
+
         elif tab_custom and tab_custom.isActive:
             # カスタムタブ: モードに応じて配置または登録を実行
             mode_input = inputs.itemById('custom_mode')
@@ -659,10 +873,13 @@ def command_execute(args: adsk.core.CommandEventArgs):
                 target_sel = inputs.itemById('section_target_sel')
                 placement_point = adsk.core.Point3D.create(0, 0, 0)
                 selection_entity = None
+                reference_entity = None
                 if target_sel and target_sel.selectionCount > 0:
                     try:
                         placement_point = target_sel.selection(0).point
                         selection_entity = target_sel.selection(0).entity
+                        if target_sel.selectionCount > 1:
+                            reference_entity = target_sel.selection(1).entity
                     except Exception:
                         placement_point = adsk.core.Point3D.create(0, 0, 0)
                 height_in_mm = None
@@ -673,7 +890,23 @@ def command_execute(args: adsk.core.CommandEventArgs):
                         height_in_mm = h_input.value * 10.0
                     except Exception:
                         height_in_mm = 1000.0
-                place_section_model(cat, model_name, placement_point, selection_entity=selection_entity, target_height_mm=height_in_mm or 1000.0)
+                place_section_model(cat, model_name, placement_point, selection_entity=selection_entity, target_height_mm=height_in_mm or 1000.0,
+                                    reference_entity=reference_entity)
+            elif mode_input.selectedItem and mode_input.selectedItem.name == '2点':
+                cat = inputs.itemById('section_category').selectedItem.name
+                model_name = inputs.itemById('section_model').selectedItem.name
+                start = _selected_point(inputs.itemById('section_start_sel'))
+                end = _selected_point(inputs.itemById('section_end_sel'))
+                if not start or not end:
+                    ui.messageBox('始点と終点を選択してください')
+                    return
+                roll = math.degrees(inputs.itemById('section_roll').value)
+                place_section_between(cat, model_name, start, end, roll)
+            elif mode_input.selectedItem and mode_input.selectedItem.name == '骨組':
+                cat = inputs.itemById('section_category').selectedItem.name
+                model_name = inputs.itemById('section_model').selectedItem.name
+                lines = _selected_member_lines(inputs.itemById('section_frame_lines'))
+                place_section_frame(cat, model_name, lines)
             else:
                 reg_cat = inputs.itemById('section_reg_category').selectedItem.name
                 reg_name = inputs.itemById('section_register_name').value.strip()
@@ -745,10 +978,13 @@ def command_execute(args: adsk.core.CommandEventArgs):
                 target_sel = inputs.itemById('light_section_target_sel')
                 placement_point = adsk.core.Point3D.create(0, 0, 0)
                 selection_entity = None
+                reference_entity = None
                 if target_sel and target_sel.selectionCount > 0:
                     try:
                         placement_point = target_sel.selection(0).point
                         selection_entity = target_sel.selection(0).entity
+                        if target_sel.selectionCount > 1:
+                            reference_entity = target_sel.selection(1).entity
                     except Exception:
                         placement_point = adsk.core.Point3D.create(0, 0, 0)
                 height_in_mm = None
@@ -758,7 +994,8 @@ def command_execute(args: adsk.core.CommandEventArgs):
                         height_in_mm = h_input.value * 10.0
                     except Exception:
                         height_in_mm = 1000.0
-                place_light_section_model(cat, model_name, placement_point, selection_entity=selection_entity, target_height_mm=height_in_mm or 1000.0)
+                place_light_section_model(cat, model_name, placement_point, selection_entity=selection_entity, target_height_mm=height_in_mm or 1000.0,
+                                          reference_entity=reference_entity)
             else:
                 reg_cat = inputs.itemById('light_section_reg_category').selectedItem.name
                 reg_name = inputs.itemById('light_section_register_name').value.strip()
@@ -817,6 +1054,9 @@ def command_execute(args: adsk.core.CommandEventArgs):
                 if current_cat == reg_cat:
                     refresh_light_section_model_list(inputs.itemById('light_section_model'), current_cat)
 
+        elif tab_bom and tab_bom.isActive:
+            export_bom(inputs)
+
         tab_piping = inputs.itemById('tab_piping')
         if tab_piping and tab_piping.isActive:
             mode_input = inputs.itemById('piping_mode')
@@ -908,15 +1148,49 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
     inputs = args.inputs
     futil.log(f'command_input_changed: {changed_input.id}', force_console=True)
     
+    if changed_input.id == 'splice_mode':
+        if changed_input.selectedItem:
+            set_splice_visibility(inputs, changed_input.selectedItem.name)
+
+    if changed_input.id == 'splice_joint_sel':
+        _update_splice_joint_info(inputs)
+
+    if changed_input.id == 'splice_section':
+        section_name = changed_input.selectedItem.name if changed_input.selectedItem else SPLICE_STANDARD_TABLE
+        plate_types = get_splice_plate_types(section_name)
+        type_input = inputs.itemById('splice_plate_type')
+        type_input.listItems.clear()
+        for plate_type in plate_types.keys():
+            type_input.listItems.add(plate_type, False)
+        if type_input.listItems.count > 0:
+            type_input.listItems.item(0).isSelected = True
+            changed_input = type_input
+
+    if changed_input.id == 'splice_design_force':
+        lightest = _select_lightest_splice_plate(inputs)
+        type_input = inputs.itemById('splice_plate_type')
+        if lightest and type_input.selectedItem and lightest != type_input.selectedItem.name:
+            for item in type_input.listItems:
+                if item.name == lightest:
+                    item.isSelected = True
+                    changed_input = type_input
+                    break
+        else:
+            _update_splice_capacity(inputs)
+
     if changed_input.id == 'splice_plate_type':
         plate_type = changed_input.selectedItem.name
-        plate_data = SPLICE_PLATE_TYPES.get(plate_type)
+        plate_data = get_splice_plate_data(plate_type)
         if plate_data:
             thickness_input = inputs.itemById('splice_thickness')
             thickness_input.value = plate_data['thickness'] / 10.0
             hole_diameter_input = inputs.itemById('splice_hole_diameter')
             hole_diameter_input.value = plate_data['hole_dia'] / 10.0
             _update_preview(inputs, plate_data)
+            _update_splice_capacity(inputs)
+
+    if changed_input.id in ('splice_thickness', 'splice_hole_diameter'):
+        _update_splice_capacity(inputs)
     
     
 
@@ -932,10 +1206,48 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
     if changed_input.id == 'gusset_mode':
         selected = changed_input.selectedItem.name if changed_input.selectedItem else '配置'
         place_grp = inputs.itemById('gusset_place_grp')
+        create_grp = inputs.itemById('gusset_create_grp')
         reg_grp = inputs.itemById('gusset_reg_grp')
         if place_grp: place_grp.isVisible = (selected == '配置')
+        if create_grp: create_grp.isVisible = (selected == '作成')
+        size_grp = inputs.itemById('gusset_size_grp')
+        if size_grp: size_grp.isVisible = (selected == '自動選定')
         if reg_grp: reg_grp.isVisible = (selected == '登録')
 
+    # ガセット: 部材・応力・ボルトが変わったら選定し直す
+    if changed_input.id in ('gusset_members_sel', 'gusset_brace_force', 'gusset_size_bolt'):
+        _update_gusset_sizing(inputs)
+
+    # ボルト: プレート・呼び・締付け長さが変わったらボルトセットを決め直す
+    if changed_input.id in ('bolt_plates_sel', 'bolt_size', 'bolt_extra_grip'):
+        _update_bolt_info(inputs)
+
+    # 部材表: 切断計画・板取り・DXF・NC1 のときだけそれぞれの条件を表示
+    if changed_input.id == 'bom_format':
+        fmt = changed_input.selectedItem.name if changed_input.selectedItem is not None else ''
+        for input_id, shown in (('bom_stock_lengths', fmt == '切断計画'), ('bom_kerf', fmt == '切断計画'),
+                                ('bom_exact', fmt == '切断計画'), ('bom_sheet_sizes', fmt == '板取り'),
+                                ('bom_spacing', fmt == '板取り'), ('bom_polygon', fmt == '板取り'),
+                                ('bom_dxf_source', fmt == 'DXF'), ('bom_dxf_combined', fmt == 'DXF'),
+                                ('bom_nc_grade', fmt == 'NC1')):
+            inp = inputs.itemById(input_id)
+            if inp:
+                inp.isVisible = shown
+
+    # 部材表: 集計ボタン
+    if changed_input.id == 'bom_count' and changed_input.value:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if design:
+            inputs.itemById('bom_info').text = bom.summarize(_collect_bom(design))
+        changed_input.value = False
+
+    # ガセット: 系列を変えたら板厚と仕様を更新
+    if changed_input.id == 'gusset_spec' and changed_input.selectedItem:
+        spec = gusset_specs.get_spec(changed_input.selectedItem.name)
+        if spec:
+            inputs.itemById('gusset_spec_thickness').value = spec.thickness / 10.0
+            inputs.itemById('gusset_spec_info').text = gusset_specs.describe(spec)
+
     # ガセット: 登録のファイル参照ボタン
     if changed_input.id == 'gusset_browse_file' and changed_input.value:
         path = _open_file_dialog()
@@ -960,9 +1272,34 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
     if changed_input.id == 'section_mode':
         selected = changed_input.selectedItem.name if changed_input.selectedItem else '配置'
         place_grp = inputs.itemById('section_place_grp')
+        twopoint_grp = inputs.itemById('section_twopoint_grp')
+        frame_grp = inputs.itemById('section_frame_grp')
         reg_grp = inputs.itemById('section_reg_grp')
-        if place_grp: place_grp.isVisible = (selected == '配置')
+        if place_grp: place_grp.isVisible = (selected in ('配置', '2点', '骨組'))
+        if twopoint_grp: twopoint_grp.isVisible = (selected == '2点')
+        if frame_grp: frame_grp.isVisible = (selected == '骨組')
         if reg_grp: reg_grp.isVisible = (selected == '登録')
+        # 2点・骨組では配置先と高さは点や線から決まる
+        for input_id in ('section_target_sel', 'section_height'):
+            point_input = inputs.itemById(input_id)
+            if point_input: point_input.isVisible = (selected == '配置')
+
+    # 形鋼: 2点配置の点が変わったら材長を表示
+    if changed_input.id in ('section_start_sel', 'section_end_sel'):
+        info = inputs.itemById('section_twopoint_info')
+        start = _selected_point(inputs.itemById('section_start_sel'))
+        end = _selected_point(inputs.itemById('section_end_sel'))
+        if info:
+            if start and end:
+                info.text = f'材長 {start.distanceTo(end) * 10.0:.1f}mm'
+            else:
+                info.text = '始点と終点を選択してください'
+
+    # 形鋼: 骨組の線が変わったら本数と長さの種類を表示
+    if changed_input.id == 'section_frame_lines':
+        info = inputs.itemById('section_frame_info')
+        if info:
+            info.text = frame_layout.summarize(frame_layout.group_members(_selected_member_lines(changed_input)))
 
     # 形鋼: カテゴリ変更でモデル一覧を更新
     if changed_input.id == 'section_category':
@@ -970,6 +1307,10 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
         model_input = inputs.itemById('section_model')
         refresh_section_model_list(model_input, cat)
 
+    # 形鋼: モデルの断面積・単位重量・塗装面積を表示
+    if changed_input.id in ('section_category', 'section_model'):
+        _update_section_properties(inputs, 'section_model', 'section_properties')
+
     # 形鋼: 登録のファイル参照ボタン
     if changed_input.id == 'section_browse_file' and changed_input.value:
         path = _open_file_dialog()
@@ -994,6 +1335,10 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
         model_input = inputs.itemById('light_section_model')
         refresh_light_section_model_list(model_input, cat)
 
+    # 軽量形鋼: モデルの断面積・単位重量・塗装面積を表示
+    if changed_input.id in ('light_section_category', 'light_section_model'):
+        _update_section_properties(inputs, 'light_section_model', 'light_section_properties')
+
     # 軽量形鋼: 登録のファイル参照ボタン
     if changed_input.id == 'light_section_browse_file' and changed_input.value:
         path = _open_file_dialog()
@@ -1031,6 +1376,8 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
 def command_destroy(args: adsk.core.CommandEventArgs):
     global local_handlers
     local_handlers = []
+    _placement_frames.clear()
+    _recognized_sections.clear()
 
 # ============================================================================
 # モデル管理関数
@@ -1226,6 +1573,10 @@ def register_section_model_to_json(category: str, model_name: str, model_path: s
             'path': relative_path,
             'description': description or 'ユーザー登録モデル'
         }
+        # 材軸の向き・材長を登録時に測っておき、配置のたびに形状を調べ直さない
+        axis = _measure_model_axis(model_name, local_file_path)
+        if axis:
+            models[category]['models'][model_name]['axis'] = principal_axes.to_metadata(axis)
 
         with open(cfg, 'w', encoding='utf-8') as f:
             json.dump(models, f, ensure_ascii=False, indent=2)
@@ -1264,6 +1615,10 @@ def register_light_section_model_to_json(category: str, model_name: str, model_p
             'path': relative_path,
             'description': description or 'ユーザー登録モデル'
         }
+        # 材軸の向き・材長を登録時に測っておき、配置のたびに形状を調べ直さない
+        axis = _measure_model_axis(model_name, local_file_path)
+        if axis:
+            models[category]['models'][model_name]['axis'] = principal_axes.to_metadata(axis)
 
         with open(cfg, 'w', encoding='utf-8') as f:
             json.dump(models, f, ensure_ascii=False, indent=2)
@@ -1275,6 +1630,69 @@ def register_light_section_model_to_json(category: str, model_name: str, model_p
         ui.messageBox(f'軽量形鋼モデル登録に失敗しました: {e}')
         futil.log(f'軽量形鋼登録エラー: {e}')
 
+def _update_section_properties(inputs: adsk.core.CommandInputs, model_id: str, info_id: str) -> None:
+    """選択中の形鋼モデルの断面積・単位重量・塗装面積を表示（名前の寸法から計算）"""
+    model_input = inputs.itemById(model_id)
+    info = inputs.itemById(info_id)
+    if not model_input or not info:
+        return
+    item = model_input.selectedItem
+    if not item or '登録されていません' in item.name:
+        info.text = ''
+        return
+    info.text = section_properties.describe(section_properties.properties(item.name))
+
+def _body_coordinates(body: adsk.fusion.BRepBody):
+    """ボディの表示メッシュの節点座標を1本の array('d') で返す（取れなければ外接箱の8頂点）"""
+    try:
+        return array('d', body.meshManager.displayMeshes.bestMesh.nodeCoordinatesAsDouble)
+    except Exception as e:
+        futil.log(f'メッシュ座標の取得エラー: {e}')
+        box = body.boundingBox
+        return principal_axes.box_coordinates(box.minPoint.asArray(), box.maxPoint.asArray())
+
+def _measure_model_axis(model_name: str, model_path_obj: Path):
+    """モデルを見えない一時ドキュメントに読み込み、材軸（コンポーネント座標）と材長を求める
+
+    軸は最初のボディの端面とフランジ・ウェブの平面の向き、材長と断面の中心はメッシュの
+    節点の範囲から求め、面から軸が求まらないときだけ節点の主軸を使う。
+    ユーザーのデザインには読み込まないので、タイムラインや元に戻す履歴は変わらない
+    """
+    document = None
+    try:
+        document = app.documents.add(adsk.core.DocumentTypes.FusionDesignDocumentType, False)
+        design = adsk.fusion.Design.cast(document.products.itemByProductType('DesignProductType'))
+        occ = _place_model_impl(design, model_name, model_path_obj, None, do_name_cleanup=False)
+        if not occ:
+            return None
+        coords = array('d')
+        axes = None
+        bodies = occ.component.bRepBodies
+        for i in range(bodies.count):
+            body = bodies.item(i)
+            coords.extend(_body_coordinates(body))
+            if i == 0:
+                planes, _, cylinders = _body_faces(body)
+                axes = section_recognition.member_axes(planes, cylinders)
+        return principal_axes.member_axis(coords, axes)
+    except Exception as e:
+        futil.log(f'材軸の測定エラー: {e}')
+        return None
+    finally:
+        if document:
+            document.close(False)
+
+def _model_axis(model_info: dict):
+    """カタログに保存した材軸（MemberFrame, cm）。登録時に測っていなければ None"""
+    data = model_info.get('axis') if model_info else None
+    return principal_axes.from_metadata(data) if data else None
+
+def _model_axis_local(model_axis):
+    """モデルの材軸を z、始端の断面中心を原点にそろえるローカル変換（材軸がなければ None）"""
+    if not model_axis:
+        return None
+    return transforms.inverse(transforms.frame(model_axis.origin, model_axis.x, model_axis.y, model_axis.z))
+
 def register_piping_model_to_json(category: str, model_name: str, model_path: str, description: str = ''):
     try:
         base_dir = Path(__file__).parent
@@ -1360,55 +1778,19 @@ def create_splice_plate(plate_type: str, thickness: float, hole_diameter: float,
 
         occurrence = target_comp.occurrences.addNewComponent(matrix)
         component = occurrence.component
-        clean_plate = plate_type.replace('用', ' ').replace('_', ' ')
-        comp_name = f'SPL {clean_plate}'
-        # 括弧付き数字を削除し、最後の数字の前にスペースを挿入
-        comp_name = futil.format_component_name(comp_name)
-        component.name = comp_name
+        component.name = _splice_component_name(plate_type)
         
-        plate_data = SPLICE_PLATE_TYPES.get(plate_type)
+        plate_data = get_splice_plate_data(plate_type)
         if not plate_data:
             ui.messageBox(f'プレートタイプ {plate_type} が見つかりません')
             return
         
-        # スケッチを作成
-        sketches = component.sketches
-        xy_plane = component.xYConstructionPlane
-        sketch = sketches.add(xy_plane)
-        
-        # 矩形を描画
-        width = plate_data['width'] / 10.0
-        height = plate_data['height'] / 10.0
-        
-        lines = sketch.sketchCurves.sketchLines
-        rect = lines.addTwoPointRectangle(
-            adsk.core.Point3D.create(0, 0, 0),
-            adsk.core.Point3D.create(width, height, 0)
-        )
-        
-        # ボルト穴を追加
-        circles = sketch.sketchCurves.sketchCircles
-        for hole_pos in plate_data['holes']:
-            x = hole_pos[0] / 10.0
-            y = hole_pos[1] / 10.0
-            center = adsk.core.Point3D.create(x, y, 0)
-            circles.addByCenterRadius(center, hole_diameter / 2.0)
-        
-        # プロファイルを取得して押し出し
-        max_area = 0
-        profile = None
-        for prof in sketch.profiles:
-            area = prof.areaProperties().area
-            if area > max_area:
-                max_area = area
-                profile = prof
-
-        if profile is not None:
-            extrudes = component.features.extrudeFeatures
-            extrude_input = extrudes.createInput(profile, adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
-            distance = adsk.core.ValueInput.createByReal(thickness)
-            extrude_input.setDistanceExtent(False, distance)
-            extrude = extrudes.add(extrude_input)
+        # 外形とボルト穴（穴径はダイアログの入力値 cm を mm に換算して上書き）
+        geometry = PlateGeometry.from_plate_data(plate_data, name=plate_type,
+                                                 thickness=thickness * 10.0, hole_dia=hole_diameter * 10.0)
+        _build_plate_body(component, geometry)
+        _plate_geometries[component.entityToken] = geometry
+        _tag_bom_part(component, bom.plate_part(component.name, geometry), geometry)
         
         ui.messageBox(f'{plate_type} を作成しました')
         
@@ -1416,6 +1798,541 @@ def create_splice_plate(plate_type: str, thickness: float, hole_diameter: float,
         ui.messageBox(f'エラーが発生しました: {str(e)}')
         futil.log(f'エラー: {str(e)}')
 
+def _splice_component_name(plate_type: str) -> str:
+    """スプライスプレートのコンポーネント名（'H300用A5' -> 'SPL H300 A5 '）"""
+    clean_plate = plate_type.replace('用', ' ').replace('_', ' ')
+    # 括弧付き数字を削除し、最後の数字の前にスペースを挿入
+    return futil.format_component_name(f'SPL {clean_plate}')
+
+# 形鋼として認識したボディ {(ボディの entityToken, 指紋): RecognizedSection（ボディ座標）または None}
+# 同じコンポーネントのオカレンス（骨組配置の部材など）は1回の認識を共有する。コマンドを閉じると破棄する
+_recognized_sections = {}
+
+def _body_fingerprint(body: adsk.fusion.BRepBody) -> tuple:
+    """認識結果のキャッシュのキー（ボディの entityToken と、面の数・外接箱の指紋）
+
+    外径と長さが同じで肉厚だけが違う鋼管は指紋が同じなので、ボディは entityToken で区別し、
+    指紋は材長の変更などでボディの形状が変わったことを見分けるのに使う
+    """
+    box = body.boundingBox
+    return (body.entityToken,
+            section_recognition.fingerprint(body.faces.count, box.minPoint.asArray(), box.maxPoint.asArray()))
+
+def _body_faces(body: adsk.fusion.BRepBody) -> tuple:
+    """ボディの平面 [(点, 法線)]、その面番号、円筒面 [(軸上の点, 軸, 半径)]（ボディ座標 cm）"""
+    planes, plane_faces, cylinders = [], [], []
+    for i, face in enumerate(body.faces):
+        geometry = face.geometry
+        plane = adsk.core.Plane.cast(geometry)
+        if plane:
+            planes.append((plane.origin.asArray(), plane.normal.asArray()))
+            plane_faces.append(i)
+            continue
+        cylinder = adsk.core.Cylinder.cast(geometry)
+        if cylinder:
+            cylinders.append((cylinder.origin.asArray(), cylinder.axis.asArray(), cylinder.radius))
+    return planes, plane_faces, cylinders
+
+def _recognize_body(body: adsk.fusion.BRepBody):
+    """ボディ（ネイティブ）の面から形鋼の種類・寸法・材軸を求める。形鋼でなければ None
+
+    Returns:
+    RecognizedSection（ボディ座標 cm）。end_faces は body.faces の番号
+    """
+    key = _body_fingerprint(body)
+    if key not in _recognized_sections:
+        planes, plane_faces, cylinders = _body_faces(body)
+        section = section_recognition.recognize(planes, cylinders)
+        if section and section.end_faces:
+            section = section._replace(end_faces=tuple(plane_faces[i] for i in section.end_faces))
+        _recognized_sections[key] = section
+    return _recognized_sections[key]
+
+def _selected_body(entity):
+    """選択（オカレンス / ボディ）からネイティブのボディとモデル座標への変換を返す"""
+    occurrence = adsk.fusion.Occurrence.cast(entity)
+    if occurrence:
+        if occurrence.bRepBodies.count == 0:
+            return None, None
+        return occurrence.component.bRepBodies.item(0), occurrence.transform2.asArray()
+    body = adsk.fusion.BRepBody.cast(entity)
+    if not body:
+        return None, None
+    if body.assemblyContext:
+        return body.nativeObject, body.assemblyContext.transform2.asArray()
+    return body, transforms.IDENTITY
+
+# 継手で作成したプレートのコンポーネント {プレート名: Component}
+_splice_joint_components = {}
+
+def _member_section(entity):
+    """選択したH形鋼（オカレンス / ボディ）の材軸と断面をワールド座標で返す。H形鋼でなければ None"""
+    body, matrix = _selected_body(entity)
+    if not body:
+        return None
+    section = splice_joint.h_section(_recognize_body(body))
+    return splice_joint.transformed(section, matrix) if section else None
+
+def _selected_splice_joints(selection_input: adsk.core.SelectionCommandInput) -> list:
+    """選択から継手の一覧を求める。1本だけならクリックした位置（分割した面の境界など）を継手にする"""
+    if not selection_input or selection_input.selectionCount == 0:
+        return []
+    sections = []
+    point = None
+    for i in range(selection_input.selectionCount):
+        selection = selection_input.selection(i)
+        section = _member_section(selection.entity)
+        if section:
+            sections.append(section)
+            point = selection.point
+    if len(sections) == 1:
+        return [splice_joint.joint_at(sections[0], point.asArray())] if point else []
+    return splice_joint.find_joints(sections)
+
+def _update_splice_joint_info(inputs: adsk.core.CommandInputs) -> None:
+    """認識した継手の数と断面をダイアログに表示"""
+    info = inputs.itemById('splice_joint_info')
+    if not info:
+        return
+    try:
+        joints = _selected_splice_joints(inputs.itemById('splice_joint_sel'))
+        if not joints:
+            info.text = 'H形鋼の継手が見つかりません'
+            return
+        names = sorted({splice_joint.section_name(j.section) for j in joints})
+        info.text = f'継手 {len(joints)}箇所 ({", ".join(names)})'
+    except Exception as e:
+        info.text = f'継手を認識できません: {e}'
+
+def create_splice_joint(selection_input: adsk.core.SelectionCommandInput):
+    """選択したH形鋼の継手に、フランジ外側・内側とウェブのスプライスプレートをまとめて配置"""
+    try:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+
+        joints = _selected_splice_joints(selection_input)
+        if not joints:
+            ui.messageBox('H形鋼の継手が見つかりません。同じ材軸に並ぶH形鋼2本、またはH形鋼1本の継手位置を選択してください')
+            return
+
+        target_comp = futil.get_target_component(design)
+        occurrences = target_comp.occurrences
+        suffixes = dict(splice_rules.PLATE_ROLES)
+        count = 0
+        for joint in joints:
+            section = joint.section
+            plates = splice_rules.splice_plates_for(section.h, section.b, section.tw, section.tf)
+            section_name = splice_joint.section_name(section)
+            for role, batch in splice_joint.plate_frames(joint, plates).items():
+                plate_type = f'{section_name} {suffixes[role]}'
+                component = _splice_joint_components.get(plate_type)
+                if component is not None and not (component.isValid and component.parentDesign == design):
+                    component = None
+                for i in range(transforms.count(batch)):
+                    matrix = _matrix_from_array(transforms.item(batch, i))
+                    if component is None:
+                        # 役割ごとに最初の1枚だけ形状を作る
+                        occurrence = occurrences.addNewComponent(matrix)
+                        component = occurrence.component
+                        component.name = _splice_component_name(plate_type)
+                        geometry = PlateGeometry.from_plate_data(plates[role], name=plate_type)
+                        _build_plate_body(component, geometry)
+                        _plate_geometries[component.entityToken] = geometry
+                        _tag_bom_part(component, bom.plate_part(component.name, geometry), geometry)
+                        _splice_joint_components[plate_type] = component
+                    else:
+                        occurrences.addExistingComponent(component, matrix)
+                    count += 1
+
+        ui.messageBox(f'継手{len(joints)}箇所にスプライスプレートを{count}枚配置しました')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _build_plate_body(component: adsk.fusion.Component, geometry: PlateGeometry) -> None:
+    """PlateGeometry（mm）から板ボディを作成（外形の押し出し＋穴の切り取り）"""
+    sketch = component.sketches.add(component.xYConstructionPlane)
+    _draw_plate_outline(sketch, geometry)
+
+    # 外形だけのスケッチなのでプロファイルは1つ。面積を比べて探す必要はない
+    if sketch.profiles.count == 0:
+        return
+    extrudes = component.features.extrudeFeatures
+    extrude_input = extrudes.createInput(sketch.profiles.item(0), adsk.fusion.FeatureOperations.NewBodyFeatureOperation)
+    extrude_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(geometry.thickness / 10.0))
+    extrudes.add(extrude_input)
+
+    _cut_plate_holes(component, geometry)
+
+def _draw_plate_outline(sketch: adsk.fusion.Sketch, geometry: PlateGeometry) -> None:
+    """PlateGeometry（mm）の外形をスケッチ（cm）に描画"""
+    lines = sketch.sketchCurves.sketchLines
+    if geometry.is_rectangle():
+        x0, y0, x1, y1 = geometry.bounding_box()
+        lines.addTwoPointRectangle(
+            adsk.core.Point3D.create(x0 / 10.0, y0 / 10.0, 0),
+            adsk.core.Point3D.create(x1 / 10.0, y1 / 10.0, 0)
+        )
+    else:
+        pts = [adsk.core.Point3D.create(x / 10.0, y / 10.0, 0) for x, y in geometry.outline]
+        for i in range(len(pts)):
+            lines.addByTwoPoints(pts[i], pts[(i + 1) % len(pts)])
+
+def _cut_plate_holes(component: adsk.fusion.Component, geometry: PlateGeometry) -> None:
+    """ボルト穴を切り取る
+
+    穴が等間隔の矩形配列に分解できる場合は、配列ごとの基準穴だけを描いて切り取り、
+    矩形パターンで複製する。同じ並び方の配列はまとめて1つのパターンにする。
+    分解できない場合は全穴を1つのスケッチに描き、1回の切り取りで抜く。
+    """
+    if not geometry.hole_count:
+        return
+
+    grids = geometry.hole_grids()
+    if grids is None:
+        _cut_circles(component, [(x, y, d) for x, y, d in geometry.holes], geometry.thickness)
+        return
+
+    groups = {}
+    for g in grids:
+        groups.setdefault((g.nx, g.dx, g.ny, g.dy), []).append((g.x0, g.y0, g.dia))
+
+    patterns = component.features.rectangularPatternFeatures
+    spacing = adsk.fusion.PatternDistanceType.SpacingPatternDistanceType
+    for (nx, dx, ny, dy), seeds in groups.items():
+        cut = _cut_circles(component, seeds, geometry.thickness)
+        if cut is None or (nx == 1 and ny == 1):
+            continue
+        entities = adsk.core.ObjectCollection.create()
+        entities.add(cut)
+        if nx > 1:
+            pattern_input = patterns.createInput(entities, component.xConstructionAxis,
+                                                 adsk.core.ValueInput.createByReal(nx),
+                                                 adsk.core.ValueInput.createByReal(dx / 10.0), spacing)
+            if ny > 1:
+                pattern_input.setDirectionTwo(component.yConstructionAxis,
+                                              adsk.core.ValueInput.createByReal(ny),
+                                              adsk.core.ValueInput.createByReal(dy / 10.0))
+        else:
+            pattern_input = patterns.createInput(entities, component.yConstructionAxis,
+                                                 adsk.core.ValueInput.createByReal(ny),
+                                                 adsk.core.ValueInput.createByReal(dy / 10.0), spacing)
+        patterns.add(pattern_input)
+
+def _cut_circles(component: adsk.fusion.Component, circles_mm: list, thickness_mm: float):
+    """円 [(x, y, 径), ...]（mm）を描いたスケッチを板厚分切り取り、押し出しフィーチャーを返す"""
+    sketch = component.sketches.add(component.xYConstructionPlane)
+    sketch_circles = sketch.sketchCurves.sketchCircles
+    for x, y, d in circles_mm:
+        sketch_circles.addByCenterRadius(adsk.core.Point3D.create(x / 10.0, y / 10.0, 0), d / 20.0)
+
+    # 円だけのスケッチなので、全プロファイルがそのまま穴になる
+    profiles = adsk.core.ObjectCollection.create()
+    for prof in sketch.profiles:
+        profiles.add(prof)
+    if profiles.count == 0:
+        return None
+    extrudes = component.features.extrudeFeatures
+    cut_input = extrudes.createInput(profiles, adsk.fusion.FeatureOperations.CutFeatureOperation)
+    cut_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(thickness_mm / 10.0))
+    return extrudes.add(cut_input)
+
+# 生成したガセットのコンポーネント {(GussetSpec, 名前): Component}
+# 同じ仕様の2枚目以降は形状を作り直さず、既存コンポーネントのオカレンスを追加する
+_gusset_components = {}
+
+def create_gusset_plate(spec_name: str, thickness: float, placement_point: adsk.core.Point3D):
+    """仕様表のガセットプレートを生成して配置（板厚は cm）"""
+    try:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+
+        spec = gusset_specs.get_spec(spec_name)
+        if not spec:
+            ui.messageBox(f'ガセット系列 {spec_name} が見つかりません')
+            return
+        spec = spec._replace(thickness=round(thickness * 10.0, 3))
+
+        base_pt = placement_point or adsk.core.Point3D.create(0, 0, 0)
+        matrix = adsk.core.Matrix3D.create()
+        matrix.translation = adsk.core.Vector3D.create(base_pt.x, base_pt.y, base_pt.z)
+        target_comp = futil.get_target_component(design)
+
+        created = _add_gusset_occurrence(design, target_comp, (spec, spec_name), matrix,
+                                         lambda: gusset_specs.gusset_geometry(spec, name=spec_name))
+        ui.messageBox(f'{spec_name} を{"作成" if created else "配置"}しました')
+
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {str(e)}')
+        futil.log(f'エラー: {str(e)}')
+
+def _add_gusset_occurrence(design: adsk.fusion.Design, target_comp: adsk.fusion.Component, key: tuple,
+                           matrix: adsk.core.Matrix3D, make_geometry) -> bool:
+    """key のガセットを配置。生成済みなら既存コンポーネントのオカレンスを追加して False を返す"""
+    component = _gusset_components.get(key)
+    if component is not None and component.isValid and component.parentDesign == design:
+        target_comp.occurrences.addExistingComponent(component, matrix)
+        return False
+
+    geometry = make_geometry()
+    occurrence = target_comp.occurrences.addNewComponent(matrix)
+    component = occurrence.component
+    component.name = futil.format_component_name(f'GPL {geometry.name} t{geometry.thickness:g}')
+    _build_plate_body(component, geometry)
+    _gusset_components[key] = component
+    _plate_geometries[component.entityToken] = geometry
+    _tag_bom_part(component, bom.plate_part(component.name, geometry), geometry)
+    return True
+
+def _member_axis(entity):
+    """選択した部材（ボディ / オカレンス / 直線エッジ）の (軸上の点, 軸方向) を cm で返す"""
+    edge = adsk.fusion.BRepEdge.cast(entity)
+    if edge:
+        p0 = edge.startVertex.geometry
+        p1 = edge.endVertex.geometry
+        return (p0.x, p0.y, p0.z), (p1.x - p0.x, p1.y - p0.y, p1.z - p0.z)
+
+    occurrence = adsk.fusion.Occurrence.cast(entity)
+    body = adsk.fusion.BRepBody.cast(entity)
+    if occurrence and occurrence.bRepBodies.count > 0:
+        body = occurrence.bRepBodies.item(0)
+    if not body:
+        return None
+    # 向き付き最小外接箱の最も長い辺を部材軸とする
+    box = body.orientedMinimumBoundingBox
+    length_dir = box.lengthDirection
+    width_dir = box.widthDirection
+    height_dir = length_dir.crossProduct(width_dir)
+    _, axis = max((box.length, length_dir), (box.width, width_dir), (box.height, height_dir),
+                  key=lambda item: item[0])
+    c = box.centerPoint
+    return (c.x, c.y, c.z), (axis.x, axis.y, axis.z)
+
+def _gusset_sizing_inputs(inputs: adsk.core.CommandInputs):
+    """自動選定の入力から (座標系, 選定結果) を求める。部材が足りなければ None"""
+    members_sel = inputs.itemById('gusset_members_sel')
+    if not members_sel or members_sel.selectionCount < 2:
+        return None
+    main_axis = _member_axis(members_sel.selection(0).entity)
+    brace_axis = _member_axis(members_sel.selection(1).entity)
+    if not main_axis or not brace_axis:
+        return None
+    frame = gusset_sizing.connection_frame(main_axis[0], main_axis[1], brace_axis[0], brace_axis[1])
+    force = inputs.itemById('gusset_brace_force').value
+    bolt_input = inputs.itemById('gusset_size_bolt')
+    bolt = bolt_input.selectedItem.name if bolt_input and bolt_input.selectedItem else 'M20'
+    return frame, gusset_sizing.size_gusset(frame[4], force, bolt=bolt)
+
+def _update_gusset_sizing(inputs: adsk.core.CommandInputs) -> None:
+    """自動選定の結果をダイアログに表示"""
+    result_box = inputs.itemById('gusset_size_result')
+    if not result_box:
+        return
+    try:
+        found = _gusset_sizing_inputs(inputs)
+        if found is None:
+            result_box.text = '取付部材とブレースを選択してください'
+        elif found[1] is None:
+            result_box.text = f'角度 {found[0][4]:.1f}° で収まるガセットがありません'
+        else:
+            result_box.text = gusset_sizing.describe(found[1])
+    except Exception as e:
+        result_box.text = f'選定できません: {e}'
+
+def create_sized_gusset(inputs: adsk.core.CommandInputs):
+    """自動選定したガセットを取付部材とブレースの交点に配置"""
+    try:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+
+        found = _gusset_sizing_inputs(inputs)
+        if found is None:
+            ui.messageBox('取付部材とブレースを選択してください')
+            return
+        (origin, x_axis, y_axis, z_axis, angle), result = found
+        if result is None:
+            ui.messageBox(f'角度 {angle:.1f}° で収まるガセットがありません')
+            return
+
+        # 作業点を原点、取付部材を x 軸とし、板厚の中心をブレースの軸に合わせる
+        half_t = result.spec.thickness / 20.0
+        matrix = _matrix_from_array(transforms.compose(
+            transforms.frame(origin, x_axis, y_axis, z_axis), transforms.translation((0.0, 0.0, -half_t))))
+
+        target_comp = futil.get_target_component(design)
+        key = (result.spec, result.name, tuple(result.geometry.holes))
+        _add_gusset_occurrence(design, target_comp, key, matrix, lambda: result.geometry)
+        ui.messageBox(f'{gusset_sizing.describe(result)}\nを配置しました')
+
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {str(e)}')
+        futil.log(f'エラー: {str(e)}')
+
+# 作成したプレートの形状 {コンポーネントの entityToken: PlateGeometry}。ボルト配置で穴位置を読む
+# 同じ名前のコンポーネント（板厚・穴径だけが違うスプライスプレートなど）を取り違えないよう名前では引かない
+_plate_geometries = {}
+
+# 作成したボルトセットのコンポーネント {BoltSet: Component}
+# 同じ呼び・長さのボルトは形状を作り直さず、既存コンポーネントのオカレンスを追加する
+_bolt_components = {}
+
+def _plate_geometry(component: adsk.fusion.Component):
+    """プレートの形状。コンポーネントの属性に記録したもの、なければ標準表のスプライス名から探す"""
+    token = component.entityToken
+    geometry = _plate_geometries.get(token)
+    if geometry is not None:
+        return geometry
+    attribute = component.attributes.itemByName(bom.ATTRIBUTE_GROUP, bom.GEOMETRY_ATTRIBUTE_NAME)
+    geometry = bom.decode_geometry(attribute.value, component.name) if attribute else None
+    if geometry is None:
+        for plate_type, plate_data in SPLICE_PLATE_TYPES.items():
+            if _splice_component_name(plate_type) == component.name:
+                geometry = PlateGeometry.from_plate_data(plate_data, name=plate_type)
+                break
+    if geometry is not None:
+        _plate_geometries[token] = geometry
+    return geometry
+
+def _cylinder_hole_axes(body: adsk.fusion.BRepBody) -> list:
+    """ボディのボルト穴（両端が円のエッジの円筒面）を HoleAxis の一覧にする（ワールド座標 cm）"""
+    axes = []
+    for face in body.faces:
+        cylinder = adsk.core.Cylinder.cast(face.geometry)
+        if not cylinder or cylinder.radius * 20.0 > bolt_sets.MAX_HOLE_DIAMETER:
+            continue
+        centers = []
+        for edge in face.edges:
+            circle = adsk.core.Circle3D.cast(edge.geometry)
+            if circle:
+                centers.append(circle.center.asArray())
+        if len(centers) >= 2:
+            axes.append(bolt_sets.HoleAxis(centers[0], centers[-1], cylinder.radius * 20.0))
+    return axes
+
+def _plate_hole_axes(entity) -> list:
+    """選択したプレート（オカレンス / ボディ）の穴の軸（ワールド座標 cm）"""
+    occurrence = adsk.fusion.Occurrence.cast(entity)
+    body = adsk.fusion.BRepBody.cast(entity)
+    if occurrence:
+        geometry = _plate_geometry(occurrence.component)
+        if geometry is not None:
+            return bolt_sets.hole_axes(geometry, occurrence.transform2.asArray())
+        bodies = [occurrence.bRepBodies.item(i) for i in range(occurrence.bRepBodies.count)]
+    elif body:
+        bodies = [body]
+    else:
+        return []
+    axes = []
+    for b in bodies:
+        axes.extend(_cylinder_hole_axes(b))
+    return axes
+
+def _bolt_plan(inputs: adsk.core.CommandInputs):
+    """ボルトタブの入力から {BoltSet: 配置行列} を求める。プレートが未選択なら None"""
+    plates_sel = inputs.itemById('bolt_plates_sel')
+    if not plates_sel or plates_sel.selectionCount == 0:
+        return None
+    axes = []
+    for i in range(plates_sel.selectionCount):
+        axes.extend(_plate_hole_axes(plates_sel.selection(i).entity))
+    size_input = inputs.itemById('bolt_size')
+    bolt = size_input.selectedItem.name if size_input and size_input.selectedItem else BOLT_SIZE_AUTO
+    extra_grip = inputs.itemById('bolt_extra_grip').value * 10.0
+    return bolt_sets.plan(bolt_sets.stack_holes(axes), None if bolt == BOLT_SIZE_AUTO else bolt, extra_grip)
+
+def _update_bolt_info(inputs: adsk.core.CommandInputs) -> None:
+    """配置するボルトセットの呼び・長さ・本数をダイアログに表示"""
+    info = inputs.itemById('bolt_info')
+    if not info:
+        return
+    try:
+        batches = _bolt_plan(inputs)
+        info.text = 'プレートを選択してください' if batches is None else bolt_sets.summarize(batches)
+    except Exception as e:
+        info.text = f'ボルトを決められません: {e}'
+
+def _build_bolt_set_body(component: adsk.fusion.Component, bolt_set) -> None:
+    """ボルトセット（mm）の簡略形状を作る。頭側の座金が当たる面を z = 0、締付け方向を +z とする"""
+    bs = bolt_set
+    tw = bs.washer_thickness
+    # (形, 寸法, 開始位置, 長さ)。軸を最初に作り、残りは結合する
+    pieces = (
+        ('circle', bs.diameter, -tw, bs.length),
+        ('hexagon', bs.across_flats, -tw - bs.head_height, bs.head_height),
+        ('circle', bs.washer_diameter, -tw, tw),
+        ('circle', bs.washer_diameter, bs.grip, tw),
+        ('hexagon', bs.across_flats, bs.grip + tw, bs.nut_height),
+    )
+    extrudes = component.features.extrudeFeatures
+    operation = adsk.fusion.FeatureOperations.NewBodyFeatureOperation
+    for shape, size, start, length in pieces:
+        sketch = component.sketches.add(component.xYConstructionPlane)
+        if shape == 'circle':
+            sketch.sketchCurves.sketchCircles.addByCenterRadius(adsk.core.Point3D.create(0, 0, 0), size / 20.0)
+        else:
+            # 二面幅 size の六角形（外接円の半径 = size / √3）
+            r = size / 10.0 / math.sqrt(3.0)
+            pts = [adsk.core.Point3D.create(r * math.cos(math.radians(30 + 60 * i)),
+                                            r * math.sin(math.radians(30 + 60 * i)), 0) for i in range(6)]
+            lines = sketch.sketchCurves.sketchLines
+            for i in range(6):
+                lines.addByTwoPoints(pts[i], pts[(i + 1) % 6])
+        if sketch.profiles.count == 0:
+            continue
+        extrude_input = extrudes.createInput(sketch.profiles.item(0), operation)
+        extrude_input.startExtent = adsk.fusion.OffsetStartDefinition.create(adsk.core.ValueInput.createByReal(start / 10.0))
+        extrude_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(length / 10.0))
+        extrudes.add(extrude_input)
+        operation = adsk.fusion.FeatureOperations.JoinFeatureOperation
+
+def place_bolt_sets(inputs: adsk.core.CommandInputs):
+    """選択したプレートの穴にボルトセットを配置。同じ軸に重なる穴は1本のボルトにまとめる"""
+    try:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+
+        batches = _bolt_plan(inputs)
+        if batches is None:
+            ui.messageBox('プレートを選択してください')
+            return
+        if not batches:
+            ui.messageBox('ボルト穴が見つかりません')
+            return
+
+        target_comp = futil.get_target_component(design)
+        occurrences = target_comp.occurrences
+        count = 0
+        for bolt_set, batch in batches.items():
+            component = _bolt_components.get(bolt_set)
+            if component is not None and not (component.isValid and component.parentDesign == design):
+                component = None
+            for i in range(transforms.count(batch)):
+                matrix = _matrix_from_array(transforms.item(batch, i))
+                if component is None:
+                    # 最初の1本だけ形状を作る
+                    occurrence = occurrences.addNewComponent(matrix)
+                    component = occurrence.component
+                    component.name = futil.format_component_name(f'HTB {bolt_sets.name(bolt_set)}')
+                    _build_bolt_set_body(component, bolt_set)
+                    _tag_bom_part(component, bom.bolt_part(bolt_set))
+                    _bolt_components[bolt_set] = component
+                else:
+                    occurrences.addExistingComponent(component, matrix)
+                count += 1
+
+        ui.messageBox(f'ボルトセットを{count}本配置しました（{bolt_sets.summarize(batches)}）')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
 def place_splice_model(model_name: str, placement_point: adsk.core.Point3D):
     """登録されたスプライスプレートモデルを配置"""
     try:
@@ -1489,8 +2406,82 @@ def place_gusset_model(model_name: str, placement_point: adsk.core.Point3D):
         ui.messageBox(f'エラーが発生しました: {e}')
         futil.log(f'エラー: {e}')
 
-def place_section_model(category: str, model_name: str, placement_point: adsk.core.Point3D, selection_entity=None, target_height_mm: float = 1000.0):
-    """登録された形鋼モデルを配置。選択面に整列し、指定高さ(mm)にスケール。"""
+# 配置先の要素ごとの基準座標系 {entityToken: (MemberFrame, 原点を軸上に取るか)}
+# コマンドを開き直すと破棄する（形状が編集されても同じトークンが使われることがあるため）
+_placement_frames = {}
+
+def _entity_frame(entity):
+    """面・エッジの基準座標系を求める。平面は法線、円筒面・円形エッジは中心軸、直線エッジはエッジ方向を材軸にする"""
+    if entity is None:
+        return None
+    token = None
+    try:
+        token = entity.entityToken
+    except Exception:
+        pass
+    if token and token in _placement_frames:
+        return _placement_frames[token]
+
+    found = None
+    face = adsk.fusion.BRepFace.cast(entity)
+    edge = adsk.fusion.BRepEdge.cast(entity)
+    geom = face.geometry if face else (edge.geometry if edge else None)
+    plane = adsk.core.Plane.cast(geom)
+    cylinder = adsk.core.Cylinder.cast(geom)
+    line = adsk.core.Line3D.cast(geom)
+    circle = adsk.core.Circle3D.cast(geom) or adsk.core.Arc3D.cast(geom)
+    if plane:
+        found = (frame_layout.plane_frame(plane.origin.asArray(), plane.normal.asArray()), False)
+    elif cylinder:
+        found = (frame_layout.axis_frame(cylinder.origin.asArray(), cylinder.axis.asArray()), True)
+    elif circle:
+        found = (frame_layout.axis_frame(circle.center.asArray(), circle.normal.asArray()), True)
+    elif line:
+        found = (frame_layout.member_frame(line.startPoint.asArray(), line.endPoint.asArray()), True)
+    if found and found[0] is None:
+        found = None
+
+    if token:
+        _placement_frames[token] = found
+    return found
+
+def _placement_frame(entity, point: adsk.core.Point3D = None, reference=None):
+    """配置先の選択から配置用の座標系 (MemberFrame) を返す。向きが決まらない選択（頂点のみなど）は None
+
+    頂点とエッジ（または面）を組で選ぶと、頂点を原点に相手の向きを使う。
+    エッジは頂点から離れる向きを材軸にする。
+    """
+    vertex = adsk.fusion.BRepVertex.cast(entity)
+    other = reference
+    if not vertex and reference is not None:
+        vertex = adsk.fusion.BRepVertex.cast(reference)
+        other = entity if vertex else None
+
+    if vertex and other is not None:
+        found = _entity_frame(other)
+        if not found:
+            return None
+        frame = found[0]
+        v = vertex.geometry
+        edge = adsk.fusion.BRepEdge.cast(other)
+        if edge:
+            # 頂点から遠い方の端点へ向ける
+            p0, p1 = edge.startVertex.geometry, edge.endVertex.geometry
+            far = p1 if v.distanceTo(p1) >= v.distanceTo(p0) else p0
+            if sum(z * (f - o) for z, f, o in zip(frame.z, far.asArray(), v.asArray())) < 0:
+                frame = frame_layout.reversed_frame(frame)
+        return frame_layout.frame_at(frame, v.asArray())
+
+    found = _entity_frame(entity)
+    if not found:
+        return None
+    frame, on_axis = found
+    if point:
+        frame = frame_layout.frame_at(frame, point.asArray(), on_axis)
+    return frame
+
+def place_section_model(category: str, model_name: str, placement_point: adsk.core.Point3D, selection_entity=None, target_height_mm: float = 1000.0, reference_entity=None):
+    """登録された形鋼モデルを配置。選択した面・エッジ・頂点に整列し、指定高さ(mm)にスケール。"""
     try:
         design = adsk.fusion.Design.cast(app.activeProduct)
         if not design:
@@ -1516,63 +2507,36 @@ def place_section_model(category: str, model_name: str, placement_point: adsk.co
             ui.messageBox(f'モデルファイルが見つかりません:\n{model_path_obj}')
             return
 
-        # 面選択があれば法線方向へ整列する行列を作成
-        x_axis = adsk.core.Vector3D.create(1, 0, 0)
-        y_axis = adsk.core.Vector3D.create(0, 1, 0)
-        z_axis = adsk.core.Vector3D.create(0, 0, 1)
+        # 配置先の面・エッジ・頂点から整列する座標系を求める
         origin = placement_point or adsk.core.Point3D.create(0, 0, 0)
-        matrix = adsk.core.Matrix3D.create()
-        align_applied = False
+        data = None
         try:
-            if selection_entity and hasattr(selection_entity, 'geometry'):
-                geom = selection_entity.geometry
-                # Planar face の場合
-                if hasattr(geom, 'normal') and hasattr(geom, 'origin'):
-                    n = geom.normal
-                    n.normalize()
-                    # 基準upを決定
-                    up = adsk.core.Vector3D.create(0, 0, 1)
-                    if abs(n.dotProduct(up)) > 0.95:
-                        up = adsk.core.Vector3D.create(1, 0, 0)
-                    x_axis = up.crossProduct(n)
-                    x_axis.normalize()
-                    y_axis = n.crossProduct(x_axis)
-                    y_axis.normalize()
-                    z_axis = n
-                    origin = placement_point or geom.origin
-                    matrix.setWithCoordinateSystem(origin, x_axis, y_axis, z_axis)
-                    align_applied = True
-        except Exception as _:
-            align_applied = False
+            frame = _placement_frame(selection_entity, placement_point, reference_entity)
+            if frame:
+                origin = adsk.core.Point3D.create(*frame.origin)
+                data = transforms.frame(frame.origin, frame.x, frame.y, frame.z)
+        except Exception as e:
+            futil.log(f'配置先の座標系エラー: {e}')
+
+        # 登録時に測った材軸があれば、モデルの材軸を配置先の z に合わせる
+        model_axis = _model_axis(model_info)
+        if model_axis:
+            data = transforms.multiply(data or transforms.translation(origin.asArray()), _model_axis_local(model_axis))
+        matrix = _matrix_from_array(data) if data else None
 
         # 目標高さを計算
         target_h_cm = max(0.01, float(target_height_mm) / 10.0)
         
         # モデルをインポート
-        occ = _place_model_impl(design, model_name, model_path_obj, origin, transform=(matrix if align_applied else None))
+        occ = _place_model_impl(design, model_name, model_path_obj, origin, transform=matrix)
         if not occ:
             return
 
-        # --- コンポーネント原点を配置点の頂点座標に移動 ---
+        # --- コンポーネント原点を配置点の頂点座標に移動（材軸があれば始端が配置点に来ている） ---
         try:
             # 現在の回転成分を保持し、平行移動を配置点に合わせた行列を作成
-            cur = occ.transform
-            new_m = adsk.core.Matrix3D.create()
-            # コピーして回転部を保持
-            for r in range(3):
-                for c in range(3):
-                    new_m.setCell(r, c, cur.getCell(r, c))
-            # 平行移動を配置点に設定
-            if placement_point:
-                new_m.setCell(0, 3, placement_point.x)
-                new_m.setCell(1, 3, placement_point.y)
-                new_m.setCell(2, 3, placement_point.z)
-            # 最終行
-            new_m.setCell(3, 0, 0)
-            new_m.setCell(3, 1, 0)
-            new_m.setCell(3, 2, 0)
-            new_m.setCell(3, 3, 1)
-            occ.transform = new_m
+            if not model_axis:
+                occ.transform = _matrix_with_translation(occ.transform, origin)
         except Exception as e:
             futil.log(f'コンポーネント原点移動エラー: {e}')
 
@@ -1583,15 +2547,156 @@ def place_section_model(category: str, model_name: str, placement_point: adsk.co
         # 押し出し編集が失敗した場合はtransformスケールを使用
         if not extrude_updated:
             futil.log(f'押し出し編集失敗、スケール適用', force_console=True)
-            _apply_transform_scale(occ, target_h_cm)
+            _apply_transform_scale(occ, target_h_cm, model_axis.length if model_axis else None)
+        _tag_bom_part(occ.component, bom.member_part(model_name, target_h_cm * 10.0, model_info.get('weight')))
 
         ui.messageBox(f'形鋼モデル"{model_name}"を配置しました')
     except Exception as e:
         ui.messageBox(f'エラーが発生しました: {e}')
         futil.log(f'エラー: {e}')
 
-def place_light_section_model(category: str, model_name: str, placement_point: adsk.core.Point3D, selection_entity=None, target_height_mm: float = 1000.0):
-    """登録された軽量形鋼モデルを配置。選択面に整列し、指定高さ(mm)にスケール。"""
+def _section_model_path(category: str, model_name: str):
+    """形鋼モデルのファイルパスを返す。見つからなければメッセージを出して None"""
+    cat_entry = SECTION_STEEL_MODELS.get(category, {"models": {}})
+    model_info = cat_entry.get('models', {}).get(model_name)
+    if not model_info:
+        ui.messageBox(f'モデル {model_name} が見つかりません')
+        return None
+
+    model_path = model_info.get('path')
+    if not model_path:
+        ui.messageBox(f'モデル {model_name} のパスが設定されていません')
+        return None
+
+    model_path_obj = Path(model_path)
+    if not model_path_obj.is_absolute():
+        base_dir = Path(__file__).parent
+        model_path_obj = base_dir / model_path_obj
+    if not model_path_obj.exists():
+        ui.messageBox(f'モデルファイルが見つかりません:\n{model_path_obj}')
+        return None
+    return model_path_obj
+
+def _selected_point(selection_input: adsk.core.SelectionCommandInput):
+    """点の選択（頂点 / スケッチ点 / 作業点）からワールド座標の Point3D を返す"""
+    if not selection_input or selection_input.selectionCount == 0:
+        return None
+    selection = selection_input.selection(0)
+    entity = selection.entity
+    vertex = adsk.fusion.BRepVertex.cast(entity)
+    if vertex:
+        return vertex.geometry
+    sketch_point = adsk.fusion.SketchPoint.cast(entity)
+    if sketch_point:
+        return sketch_point.worldGeometry
+    construction_point = adsk.fusion.ConstructionPoint.cast(entity)
+    if construction_point:
+        return construction_point.geometry
+    return selection.point
+
+def place_section_between(category: str, model_name: str, start: adsk.core.Point3D, end: adsk.core.Point3D,
+                          roll_deg: float = 0.0):
+    """始点から終点へ形鋼を配置。材軸・材長・回転は2点から直接求め、
+    読み込み時の1回の変換と1回の押し出し長さ変更だけで仕上げる。"""
+    try:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+
+        frame = frame_layout.member_frame((start.x, start.y, start.z), (end.x, end.y, end.z), roll=roll_deg)
+        if frame is None:
+            ui.messageBox('始点と終点が同じ位置です')
+            return
+
+        model_path_obj = _section_model_path(category, model_name)
+        if not model_path_obj:
+            return
+
+        model_info = SECTION_STEEL_MODELS.get(category, {}).get('models', {}).get(model_name) or {}
+        model_axis = _model_axis(model_info)
+        data = transforms.frame(frame.origin, frame.x, frame.y, frame.z)
+        if model_axis:
+            data = transforms.multiply(data, _model_axis_local(model_axis))
+        occ = _place_model_impl(design, model_name, model_path_obj, start, transform=_matrix_from_array(data))
+        if not occ:
+            return
+        if not _try_update_extrude_height(occ.component, frame.length):
+            _apply_transform_scale(occ, frame.length, model_axis.length if model_axis else None)
+        _tag_bom_part(occ.component, bom.member_part(model_name, frame.length * 10.0, model_info.get('weight')))
+
+        ui.messageBox(f'形鋼モデル"{model_name}"を配置しました（材長 {frame.length * 10.0:.1f}mm）')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _selected_member_lines(selection_input: adsk.core.SelectionCommandInput) -> list:
+    """選択したスケッチ線/直線エッジの [(始点, 終点), ...]（ワールド座標 cm）"""
+    lines = []
+    if not selection_input:
+        return lines
+    for i in range(selection_input.selectionCount):
+        entity = selection_input.selection(i).entity
+        sketch_line = adsk.fusion.SketchLine.cast(entity)
+        if sketch_line:
+            p0 = sketch_line.startSketchPoint.worldGeometry
+            p1 = sketch_line.endSketchPoint.worldGeometry
+        else:
+            edge = adsk.fusion.BRepEdge.cast(entity)
+            if not edge:
+                continue
+            p0 = edge.startVertex.geometry
+            p1 = edge.endVertex.geometry
+        lines.append(((p0.x, p0.y, p0.z), (p1.x, p1.y, p1.z)))
+    return lines
+
+def place_section_frame(category: str, model_name: str, lines: list):
+    """線ごとに形鋼を配置して骨組を作る。同じ長さの部材は1つのコンポーネントを共有する。"""
+    try:
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+        if not lines:
+            ui.messageBox('部材線を選択してください')
+            return
+
+        model_path_obj = _section_model_path(category, model_name)
+        if not model_path_obj:
+            return
+
+        model_info = SECTION_STEEL_MODELS.get(category, {}).get('models', {}).get(model_name) or {}
+        model_axis = _model_axis(model_info)
+        groups = frame_layout.group_members(lines)
+        target_comp = futil.get_target_component(design)
+        count = 0
+        for length_cm, frames in groups.items():
+            batch = transforms.frames(frames, _model_axis_local(model_axis))
+
+            # 長さごとに1回だけ読み込んで押し出し長さを合わせる
+            occ = _place_model_impl(design, model_name, model_path_obj, None,
+                                    transform=_matrix_from_array(transforms.item(batch, 0)))
+            if not occ:
+                continue
+            if not _try_update_extrude_height(occ.component, length_cm):
+                _apply_transform_scale(occ, length_cm, model_axis.length if model_axis else None)
+            _tag_bom_part(occ.component, bom.member_part(model_name, length_cm * 10.0, model_info.get('weight')))
+            count += 1
+
+            # 残りは同じコンポーネントのオカレンス
+            component = occ.component
+            occurrences = target_comp.occurrences
+            for i in range(1, transforms.count(batch)):
+                occurrences.addExistingComponent(component, _matrix_from_array(transforms.item(batch, i)))
+                count += 1
+
+        ui.messageBox(f'形鋼モデル"{model_name}"を{count}本配置しました（長さ {len(groups)}種類）')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def place_light_section_model(category: str, model_name: str, placement_point: adsk.core.Point3D, selection_entity=None, target_height_mm: float = 1000.0, reference_entity=None):
+    """登録された軽量形鋼モデルを配置。選択した面・エッジ・頂点に整列し、指定高さ(mm)にスケール。"""
     try:
         design = adsk.fusion.Design.cast(app.activeProduct)
         if not design:
@@ -1617,53 +2722,32 @@ def place_light_section_model(category: str, model_name: str, placement_point: a
             ui.messageBox(f'モデルファイルが見つかりません:\n{model_path_obj}')
             return
 
-        x_axis = adsk.core.Vector3D.create(1, 0, 0)
-        y_axis = adsk.core.Vector3D.create(0, 1, 0)
-        z_axis = adsk.core.Vector3D.create(0, 0, 1)
+        # 配置先の面・エッジ・頂点から整列する座標系を求める
         origin = placement_point or adsk.core.Point3D.create(0, 0, 0)
-        matrix = adsk.core.Matrix3D.create()
-        align_applied = False
+        data = None
         try:
-            if selection_entity and hasattr(selection_entity, 'geometry'):
-                geom = selection_entity.geometry
-                if hasattr(geom, 'normal') and hasattr(geom, 'origin'):
-                    n = geom.normal
-                    n.normalize()
-                    up = adsk.core.Vector3D.create(0, 0, 1)
-                    if abs(n.dotProduct(up)) > 0.95:
-                        up = adsk.core.Vector3D.create(1, 0, 0)
-                    x_axis = up.crossProduct(n)
-                    x_axis.normalize()
-                    y_axis = n.crossProduct(x_axis)
-                    y_axis.normalize()
-                    z_axis = n
-                    origin = placement_point or geom.origin
-                    matrix.setWithCoordinateSystem(origin, x_axis, y_axis, z_axis)
-                    align_applied = True
-        except Exception as _:
-            align_applied = False
+            frame = _placement_frame(selection_entity, placement_point, reference_entity)
+            if frame:
+                origin = adsk.core.Point3D.create(*frame.origin)
+                data = transforms.frame(frame.origin, frame.x, frame.y, frame.z)
+        except Exception as e:
+            futil.log(f'配置先の座標系エラー: {e}')
+
+        # 登録時に測った材軸があれば、モデルの材軸を配置先の z に合わせる
+        model_axis = _model_axis(model_info)
+        if model_axis:
+            data = transforms.multiply(data or transforms.translation(origin.asArray()), _model_axis_local(model_axis))
+        matrix = _matrix_from_array(data) if data else None
 
         target_h_cm = max(0.01, float(target_height_mm) / 10.0)
 
-        occ = _place_model_impl(design, model_name, model_path_obj, origin, transform=(matrix if align_applied else None))
+        occ = _place_model_impl(design, model_name, model_path_obj, origin, transform=matrix)
         if not occ:
             return
 
         try:
-            cur = occ.transform
-            new_m = adsk.core.Matrix3D.create()
-            for r in range(3):
-                for c in range(3):
-                    new_m.setCell(r, c, cur.getCell(r, c))
-            if placement_point:
-                new_m.setCell(0, 3, placement_point.x)
-                new_m.setCell(1, 3, placement_point.y)
-                new_m.setCell(2, 3, placement_point.z)
-            new_m.setCell(3, 0, 0)
-            new_m.setCell(3, 1, 0)
-            new_m.setCell(3, 2, 0)
-            new_m.setCell(3, 3, 1)
-            occ.transform = new_m
+            if not model_axis:
+                occ.transform = _matrix_with_translation(occ.transform, origin)
         except Exception as e:
             futil.log(f'コンポーネント原点移動エラー: {e}')
 
@@ -1672,7 +2756,8 @@ def place_light_section_model(category: str, model_name: str, placement_point: a
 
         if not extrude_updated:
             futil.log(f'押し出し編集失敗、スケール適用', force_console=True)
-            _apply_transform_scale(occ, target_h_cm)
+            _apply_transform_scale(occ, target_h_cm, model_axis.length if model_axis else None)
+        _tag_bom_part(occ.component, bom.member_part(model_name, target_h_cm * 10.0, model_info.get('weight')))
 
         ui.messageBox(f'軽量形鋼モデル"{model_name}"を配置しました')
     except Exception as e:
@@ -1791,15 +2876,36 @@ def _try_update_extrude_height(component: adsk.fusion.Component, target_h_cm: fl
         return False
 
 
-def _apply_transform_scale(occ: adsk.fusion.Occurrence, target_h_cm: float) -> None:
-    """押し出し編集ができない場合のフォールバック: 再インポートでスケールする。"""
+def _matrix_from_array(data) -> adsk.core.Matrix3D:
+    """行優先 16 要素から Matrix3D を作る（API 呼び出しは生成と setWithArray の2回）"""
+    matrix = adsk.core.Matrix3D.create()
+    matrix.setWithArray(list(data))
+    return matrix
+
+def _matrix_with_translation(matrix: adsk.core.Matrix3D, point: adsk.core.Point3D) -> adsk.core.Matrix3D:
+    """回転部分はそのままで平行移動を point に置き換えた行列。point が None なら平行移動も保持"""
+    data = matrix.asArray()
+    target = (point.x, point.y, point.z) if point else (data[3], data[7], data[11])
+    return _matrix_from_array(transforms.with_translation(data, target))
+
+def _apply_transform_scale(occ: adsk.fusion.Occurrence, target_h_cm: float, current_len_cm: float = None) -> None:
+    """押し出し編集ができない場合のフォールバック: 認識した形鋼の終端面を伸縮し、だめならスケールを諦める。
+
+    現在の材長はカタログの材軸メタデータ（current_len_cm）を使い、なければバウンディングボックスの Z とする。
+    """
     try:
-        # バウンディングボックスで現在の高さを取得
-        bbox = occ.boundingBox
-        size_z = abs(bbox.maxPoint.z - bbox.minPoint.z)
-        size_x = abs(bbox.maxPoint.x - bbox.minPoint.x)
-        size_y = abs(bbox.maxPoint.y - bbox.minPoint.y)
-        current_h = size_z if size_z > 1e-6 else max(size_x, size_y, size_z)
+        if _try_update_body_length(occ.component, target_h_cm):
+            return
+
+        if current_len_cm:
+            current_h = current_len_cm
+        else:
+            # バウンディングボックスで現在の高さを取得
+            bbox = occ.boundingBox
+            size_z = abs(bbox.maxPoint.z - bbox.minPoint.z)
+            size_x = abs(bbox.maxPoint.x - bbox.minPoint.x)
+            size_y = abs(bbox.maxPoint.y - bbox.minPoint.y)
+            current_h = size_z if size_z > 1e-6 else max(size_x, size_y, size_z)
         
         if current_h <= 1e-6:
             return
@@ -1822,38 +2928,56 @@ def _apply_transform_scale(occ: adsk.fusion.Occurrence, target_h_cm: float) -> N
     except Exception as e:
         futil.log(f'スケールフォールバックエラー: {e}')
 
-def _apply_height_scale_to_occurrence(occ: adsk.fusion.Occurrence, target_h_cm: float) -> None:
-    """Occurrenceのtransformにスケールを適用して高さを変更。"""
+def _try_update_body_length(component: adsk.fusion.Component, target_len_cm: float) -> bool:
+    """押し出しのないボディ（STEP/IGES など）を形鋼として認識し、終端面の押し出しで材長を合わせる。
+
+    長くするときは終端面から結合、短くするときは終端面から内側へ切り取る。
+    """
+    try:
+        if component.bRepBodies.count == 0:
+            return False
+        body = component.bRepBodies.item(0)
+        section = _recognize_body(body)
+        if not section or not section.end_faces:
+            return False
+        delta = target_len_cm - section_recognition.length(section)
+        if abs(delta) <= 1e-6:
+            return True
+
+        end_face = body.faces.item(section.end_faces[1])
+        operation = (adsk.fusion.FeatureOperations.JoinFeatureOperation if delta > 0
+                     else adsk.fusion.FeatureOperations.CutFeatureOperation)
+        extrudes = component.features.extrudeFeatures
+        extrude_input = extrudes.createInput(end_face, operation)
+        extrude_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(delta))
+        extrudes.add(extrude_input)
+        futil.log(f'{section_recognition.section_name(section)} の材長を {target_len_cm * 10.0:.1f}mm に変更', force_console=True)
+        return True
+    except Exception as e:
+        futil.log(f'材長変更エラー: {e}')
+        return False
+
+def _apply_height_scale_to_occurrence(occ: adsk.fusion.Occurrence, target_h_cm: float, current_len_cm: float = None) -> None:
+    """Occurrenceのtransformにスケールを適用して高さを変更。材軸メタデータの材長があればそれを基準にする。"""
     try:
-        bbox = occ.boundingBox
-        size_x = abs(bbox.maxPoint.x - bbox.minPoint.x)
-        size_y = abs(bbox.maxPoint.y - bbox.minPoint.y)
-        size_z = abs(bbox.maxPoint.z - bbox.minPoint.z)
-        # Z方向を高さとして扱う
-        current_h = size_z if size_z > 1e-6 else max(size_x, size_y, size_z)
+        if current_len_cm:
+            current_h = current_len_cm
+        else:
+            bbox = occ.boundingBox
+            size_x = abs(bbox.maxPoint.x - bbox.minPoint.x)
+            size_y = abs(bbox.maxPoint.y - bbox.minPoint.y)
+            size_z = abs(bbox.maxPoint.z - bbox.minPoint.z)
+            # Z方向を高さとして扱う
+            current_h = size_z if size_z > 1e-6 else max(size_x, size_y, size_z)
         if current_h <= 1e-6:
             return
         scale_factor = target_h_cm / current_h
         if abs(scale_factor - 1.0) <= 1e-6:
             return
         
-        # 現在のtransform2を取得（こちらの方が安全に変更できる）
-        current_transform = occ.transform2
-        
-        # データ配列として取得
-        data = []
-        for row in range(4):
-            for col in range(4):
-                val = current_transform.getCell(row, col)
-                # 回転・スケール部分（0-2行×0-2列）にスケール適用
-                if row < 3 and col < 3:
-                    val *= scale_factor
-                data.append(val)
-        
-        # 新しいtransformをデータから作成
-        new_transform = adsk.core.Matrix3D.create()
-        new_transform.setWithArray(data)
-        occ.transform2 = new_transform
+        # 現在のtransform2（こちらの方が安全に変更できる）の回転・スケール部分にスケール適用
+        data = transforms.scale_linear(occ.transform2.asArray(), scale_factor)
+        occ.transform2 = _matrix_from_array(data)
         
     except Exception as e:
         futil.log(f'高さスケール適用エラー: {e}')
@@ -1971,16 +3095,400 @@ def _place_model_impl(design: adsk.fusion.Design, model_name: str, model_path_ob
         return occ
     return None
 
+# ============================================================================
+# 部材表
+# ============================================================================
+
+def _tag_bom_part(component: adsk.fusion.Component, part, geometry: PlateGeometry = None) -> None:
+    """部材表の情報（BomPart）をコンポーネントの属性に記録。プレートは形状も記録する"""
+    try:
+        component.attributes.add(bom.ATTRIBUTE_GROUP, bom.ATTRIBUTE_NAME, bom.encode(part))
+        if geometry is not None:
+            component.attributes.add(bom.ATTRIBUTE_GROUP, bom.GEOMETRY_ATTRIBUTE_NAME, bom.encode_geometry(geometry))
+    except Exception as e:
+        futil.log(f'部材情報の記録エラー: {e}')
+
+def _bom_part(component: adsk.fusion.Component):
+    """コンポーネントの部材表の情報。属性がなければ名前から判別する。部材でなければ None"""
+    attribute = component.attributes.itemByName(bom.ATTRIBUTE_GROUP, bom.ATTRIBUTE_NAME)
+    part = bom.decode(attribute.value) if attribute else None
+    if part:
+        return part
+
+    name = component.name.strip()
+    kind = bom.kind_from_name(name)
+    if kind == bom.PLATE:
+        geometry = _plate_geometry(component)
+        return bom.plate_part(name, geometry) if geometry else None
+    if kind == bom.BOLT:
+        bolt_set = bolt_sets.from_name(name[len('HTB '):])
+        return bom.bolt_part(bolt_set) if bolt_set else None
+    if kind == bom.MEMBER and component.bRepBodies.count:
+        # 材長は形鋼の認識（ボディごとにキャッシュ）、だめなら最小の外接箱の長辺
+        body = component.bRepBodies.item(0)
+        section = _recognize_body(body)
+        if section:
+            length_cm = section_recognition.length(section)
+        else:
+            length_cm = body.orientedMinimumBoundingBox.length
+        return bom.member_part(name, length_cm * 10.0)
+    return None
+
+def _placed_parts(design: adsk.fusion.Design):
+    """デザインの全オカレンスを1回だけたどり、部材として数えるものを (オカレンス, キー, コンポーネント, BomPart) で返す
+
+    コンポーネントは名前ではなく entityToken をキーに区別します（同じ名前で長さの違う部材があるため）。
+    親は assemblyContext でたどり、部材のコンポーネントの中にあるオカレンスは返しません。
+    部材の判別はコンポーネントごとに1回です（部材表と IFC で共通）。
+    """
+    parts = {}
+    for occurrence in design.rootComponent.allOccurrences:
+        keys = []
+        context = occurrence
+        while context is not None:
+            component = context.component
+            key = component.entityToken
+            if key not in parts:
+                try:
+                    parts[key] = _bom_part(component)
+                except Exception as e:
+                    futil.log(f'部材の判別エラー ({component.name}): {e}')
+                    parts[key] = None
+            keys.append(key)
+            context = context.assemblyContext
+        keys.reverse()
+        part = bom.counted_part(keys, parts)
+        if part is not None:
+            yield occurrence, keys[-1], occurrence.component, part
+
+def _collect_bom(design: adsk.fusion.Design, part_components: dict = None) -> dict:
+    """配置済みの部材ごとの個数 {BomPart: 個数} を返す（_placed_parts の1回の走査）
+
+    part_components を渡すと部材ごとのコンポーネント {BomPart: Component} を入れて返します。
+    """
+    counts = {}
+    for _, _, component, part in _placed_parts(design):
+        counts[part] = counts.get(part, 0) + 1
+        if part_components is not None:
+            part_components.setdefault(part, component)
+    return counts
+
+def export_bom(inputs: adsk.core.CommandInputs):
+    """配置済みの形鋼・プレート・ボルトを集計し、部材表を CSV / JSON で書き出す"""
+    try:
+        fmt = inputs.itemById('bom_format').selectedItem.name
+        if fmt == 'DXF' and inputs.itemById('bom_dxf_source').selectedItem.name == 'カタログ':
+            export_dxf(inputs, _catalog_plates())
+            return
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            ui.messageBox('アクティブなデザインがありません')
+            return
+        if fmt == 'IFC':
+            export_ifc(inputs, design)
+            return
+
+        part_components = {}
+        counts = _collect_bom(design, part_components)
+        if not counts:
+            ui.messageBox('部材表に載せる部材が見つかりません')
+            return
+
+        if fmt == 'DXF':
+            export_dxf(inputs, [geometry for _, geometry, _ in _placed_plates(counts, part_components)])
+            return
+        if fmt == 'NC1':
+            export_nc1(inputs, counts, part_components)
+            return
+        if fmt == '切断計画':
+            export_cutting_plan(inputs, counts)
+            return
+        if fmt == '板取り':
+            export_nesting(inputs, counts, part_components)
+            return
+
+        dlg = ui.createFileDialog()
+        dlg.title = '部材表を保存'
+        dlg.filter = 'CSV Files (*.csv)' if fmt == 'CSV' else 'JSON Files (*.json)'
+        dlg.initialFilename = f'部材表.{fmt.lower()}'
+        if dlg.showSave() != adsk.core.DialogResults.DialogOK:
+            return
+
+        # Excel で開けるよう CSV は BOM 付き UTF-8
+        if fmt == 'CSV':
+            with open(dlg.filename, 'w', encoding='utf-8-sig', newline='') as f:
+                n = bom.write_csv(bom.rows(counts), f)
+        else:
+            with open(dlg.filename, 'w', encoding='utf-8') as f:
+                n = bom.write_json(bom.rows(counts), f)
+
+        inputs.itemById('bom_info').text = bom.summarize(counts)
+        ui.messageBox(f'部材表を書き出しました（{n}行, {bom.summarize(counts)}）\n{dlg.filename}')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _cutting_members(counts: dict) -> dict:
+    """部材表の個数から {形鋼名: [部材長 mm, ...]}（形鋼だけ）"""
+    members = {}
+    for part, n in counts.items():
+        if part.kind == bom.MEMBER and part.length > 0:
+            members.setdefault(part.name, []).extend([part.length] * n)
+    return members
+
+def export_cutting_plan(inputs: adsk.core.CommandInputs, counts: dict):
+    """形鋼ごとに定尺材からの切断計画を作り、材ごとの切断リストを CSV で書き出す"""
+    try:
+        members = _cutting_members(counts)
+        if not members:
+            ui.messageBox('切断する形鋼が見つかりません')
+            return
+        try:
+            stocks = cutting_stock.parse_stock_lengths(inputs.itemById('bom_stock_lengths').value)
+        except ValueError as e:
+            ui.messageBox(str(e))
+            return
+        kerf = inputs.itemById('bom_kerf').value * 10.0
+        plans = cutting_stock.plan_all(members, stocks, kerf, exact=inputs.itemById('bom_exact').value)
+
+        dlg = ui.createFileDialog()
+        dlg.title = '切断計画を保存'
+        dlg.filter = 'CSV Files (*.csv)'
+        dlg.initialFilename = '切断計画.csv'
+        if dlg.showSave() != adsk.core.DialogResults.DialogOK:
+            return
+        with open(dlg.filename, 'w', encoding='utf-8-sig', newline='') as f:
+            cutting_stock.write_csv(plans, f)
+
+        summary = cutting_stock.summarize(plans)
+        inputs.itemById('bom_info').text = summary
+        ui.messageBox(f'切断計画を書き出しました\n{summary}\n{dlg.filename}')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _plate_part_geometries(counts: dict, part_components: dict) -> dict:
+    """部材表の個数から配置済みのプレートの形状 {BomPart: PlateGeometry}。形状が分からないものは除く"""
+    geometries = {}
+    for part in counts:
+        if part.kind != bom.PLATE:
+            continue
+        component = part_components.get(part)
+        geometry = _plate_geometry(component) if component else None
+        if geometry is None:
+            futil.log(f'プレートの形状が分かりません: {part.name}')
+            continue
+        if geometry.name != part.name:
+            geometry = PlateGeometry(geometry.outline, geometry.holes, thickness=geometry.thickness, name=part.name)
+        geometries[part] = geometry
+    return geometries
+
+def _placed_plates(counts: dict, part_components: dict) -> list:
+    """部材表の個数から配置済みのプレート [(名称, PlateGeometry, 枚数), ...]。形状が分からないものは除く"""
+    return [(part.name, geometry, counts[part])
+            for part, geometry in _plate_part_geometries(counts, part_components).items()]
+
+def _pool_workers():
+    """板取り・DXF のプロセスプールの workers。Python の実行ファイルを指定したときだけ並列（None）、ほかは 1
+
+    Fusion の組み込み Python の sys.executable は Fusion 本体なので、そのまま子プロセスを起動すると
+    例外にならずに戻らないことがあります。multiprocessing.set_executable で Python を指定したときだけ使います。
+    """
+    import multiprocessing.spawn
+    import sys
+    executable = multiprocessing.spawn.get_executable()
+    return None if executable and os.fsdecode(executable) != sys.executable else 1
+
+def export_nesting(inputs: adsk.core.CommandInputs, counts: dict, part_components: dict):
+    """プレートを板厚ごとに鋼板へ並べ、部品ごとの配置を CSV で書き出す"""
+    try:
+        parts = _placed_plates(counts, part_components)
+        if not parts:
+            ui.messageBox('板取りするプレートが見つかりません')
+            return
+        try:
+            sheets = nesting.parse_sheet_sizes(inputs.itemById('bom_sheet_sizes').value)
+        except ValueError as e:
+            ui.messageBox(str(e))
+            return
+        spacing = inputs.itemById('bom_spacing').value * 10.0
+        plans = nesting.nest_all(parts, sheets, spacing, polygon=inputs.itemById('bom_polygon').value,
+                                 workers=_pool_workers())
+
+        dlg = ui.createFileDialog()
+        dlg.title = '板取りを保存'
+        dlg.filter = 'CSV Files (*.csv)'
+        dlg.initialFilename = '板取り.csv'
+        if dlg.showSave() != adsk.core.DialogResults.DialogOK:
+            return
+        with open(dlg.filename, 'w', encoding='utf-8-sig', newline='') as f:
+            nesting.write_csv(plans, f)
+
+        summary = nesting.summarize(plans)
+        inputs.itemById('bom_info').text = summary
+        ui.messageBox(f'板取りを書き出しました\n{summary}\n{dlg.filename}')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _catalog_plates() -> list:
+    """カタログ（スプライスプレートの標準表とガセットの規格）の全プレートの形状"""
+    geometries = [PlateGeometry.from_plate_data(plate_data, name=_splice_component_name(plate_type).strip())
+                  for plate_type, plate_data in SPLICE_PLATE_TYPES.items()]
+    for name, spec in gusset_specs.GUSSET_SPECS.items():
+        geometries.append(gusset_specs.gusset_geometry(spec, name=f'GPL {name}'))
+    return geometries
+
+def export_dxf(inputs: adsk.core.CommandInputs, geometries: list):
+    """プレートの形状から DXF を直接書き出す（部品ごとのファイル、または1つのファイル）"""
+    try:
+        if not geometries:
+            ui.messageBox('書き出すプレートが見つかりません')
+            return
+
+        if inputs.itemById('bom_dxf_combined').value:
+            dlg = ui.createFileDialog()
+            dlg.title = 'DXF を保存'
+            dlg.filter = 'DXF Files (*.dxf)'
+            dlg.initialFilename = 'プレート.dxf'
+            if dlg.showSave() != adsk.core.DialogResults.DialogOK:
+                return
+            with open(dlg.filename, 'w', encoding='ascii', newline='\r\n') as f:
+                n = dxf.write_sheet(geometries, f)
+            destination = dlg.filename
+        else:
+            dlg = ui.createFolderDialog()
+            dlg.title = 'DXF の保存先フォルダー'
+            if dlg.showDialog() != adsk.core.DialogResults.DialogOK:
+                return
+            n = len(dxf.export_parts(geometries, dlg.folder, workers=_pool_workers()))
+            destination = dlg.folder
+
+        inputs.itemById('bom_info').text = f'DXF {n}枚'
+        ui.messageBox(f'プレート {n}枚の DXF を書き出しました\n{destination}')
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _nc_parts(counts: dict, part_components: dict):
+    """部材表の行の順に NC1 を書く形鋼・プレート（ジェネレーター）。ボルトは除く"""
+    plates = _plate_part_geometries(counts, part_components)
+    for part in bom.sorted_parts(counts):
+        if part.kind == bom.MEMBER and part.length > 0:
+            yield dstv.NcPart(part.name, part.length, None, counts[part])
+        elif part in plates:
+            yield dstv.NcPart(part.name, 0.0, plates[part], counts[part])
+
+def export_nc1(inputs: adsk.core.CommandInputs, counts: dict, part_components: dict):
+    """配置済みの形鋼・プレートを部材ごとの DSTV（NC1）ファイルに書き出す"""
+    try:
+        dlg = ui.createFolderDialog()
+        dlg.title = 'NC1 の保存先フォルダー'
+        if dlg.showDialog() != adsk.core.DialogResults.DialogOK:
+            return
+        grade = inputs.itemById('bom_nc_grade').value.strip() or dstv.DEFAULT_GRADE
+        n, skipped = dstv.export_all(_nc_parts(counts, part_components), dlg.folder, grade)
+
+        message = f'NC1 を {n}ファイル書き出しました\n{dlg.folder}'
+        if skipped:
+            message += f'\n寸法を読み取れない形鋼 {len(skipped)}種類は書き出していません: {", ".join(skipped[:5])}'
+        inputs.itemById('bom_info').text = f'NC1 {n}ファイル'
+        ui.messageBox(message)
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
+def _catalog_model_axis(model_name: str):
+    """形鋼・軽量形鋼のカタログから名前でモデルの材軸（MemberFrame, cm）を探す。なければ None"""
+    for catalog in (SECTION_STEEL_MODELS, LIGHT_SECTION_MODELS):
+        for cat_entry in catalog.values():
+            model_axis = _model_axis(cat_entry.get('models', {}).get(model_name))
+            if model_axis:
+                return model_axis
+    return None
+
+def _ifc_local_frame(component: adsk.fusion.Component, part) -> tuple:
+    """部材のコンポーネント座標 (cm) での IFC の配置（形鋼は材軸の始端の断面中心、z が材軸）
+
+    形鋼は断面の認識、だめならカタログの材軸（登録時に測ったもの）を使い、どちらもなければ None。
+    """
+    if part.kind != bom.MEMBER:
+        return transforms.IDENTITY
+    section = _recognize_body(component.bRepBodies.item(0)) if component.bRepBodies.count else None
+    if section:
+        origin = tuple(o + section.start * c for o, c in zip(section.origin, section.z))
+        return transforms.frame(origin, section.x, section.y, section.z)
+    model_axis = _catalog_model_axis(part.name)
+    if model_axis:
+        return transforms.frame(model_axis.origin, model_axis.x, model_axis.y, model_axis.z)
+    return None
+
+def _write_ifc(design: adsk.fusion.Design, writer: ifc.IfcWriter) -> list:
+    """部材表と同じ1回の走査（_placed_parts）で、形鋼・プレートを IFC に書く（ボルトは除く）
+
+    オカレンスごとに読むのは変換行列だけで、配置の基準と形状はコンポーネントごとに1回です。
+    材軸が分からない形鋼は書かず、その名前のリストを返します。
+    """
+    frames, geometries, unplaced = {}, {}, []
+    for occurrence, key, component, part in _placed_parts(design):
+        if part.kind == bom.BOLT:
+            continue
+        if key not in frames:
+            frames[key] = _ifc_local_frame(component, part)
+            if frames[key] is None:
+                futil.log(f'材軸が分からないため IFC に書きません: {part.name}')
+                if part.name not in unplaced:
+                    unplaced.append(part.name)
+            if part.kind == bom.PLATE:
+                geometries[key] = _plate_geometry(component)
+        if frames[key] is None:
+            continue
+        matrix = transforms.multiply(occurrence.transform2.asArray(), frames[key])
+        if part.kind == bom.MEMBER:
+            writer.add_member(part.name, part.length, matrix)
+        elif geometries.get(key):
+            writer.add_plate(geometries[key], matrix, part.name)
+    return unplaced
+
+def export_ifc(inputs: adsk.core.CommandInputs, design: adsk.fusion.Design):
+    """配置済みの形鋼・プレートを IFC（IfcBeam / IfcColumn / IfcPlate）に書き出す"""
+    try:
+        dlg = ui.createFileDialog()
+        dlg.title = 'IFC を保存'
+        dlg.filter = 'IFC Files (*.ifc)'
+        dlg.initialFilename = '鉄骨.ifc'
+        if dlg.showSave() != adsk.core.DialogResults.DialogOK:
+            return
+
+        with open(dlg.filename, 'w', encoding='ascii') as f:
+            writer = ifc.IfcWriter(f, design.rootComponent.name, file_name=os.path.basename(dlg.filename))
+            writer.begin()
+            unplaced = _write_ifc(design, writer)
+            writer.end()
+
+        message = f'IFC を書き出しました（形鋼 {writer.members}本, プレート {writer.plates}枚）\n{dlg.filename}'
+        if writer.skipped:
+            message += f'\n寸法を読み取れない形鋼 {len(writer.skipped)}種類は書き出していません: {", ".join(writer.skipped[:5])}'
+        if unplaced:
+            message += f'\n材軸が分からない形鋼 {len(unplaced)}種類は書き出していません: {", ".join(unplaced[:5])}'
+        inputs.itemById('bom_info').text = f'IFC 形鋼 {writer.members}本, プレート {writer.plates}枚'
+        ui.messageBox(message)
+    except Exception as e:
+        ui.messageBox(f'エラーが発生しました: {e}')
+        futil.log(f'エラー: {e}')
+
 # ============================================================================
 # プレビュー関連
 # ============================================================================
 
 def _build_preview_png(plate_data: dict) -> str:
     """選択中プレートの簡易プレビューPNGを生成し、パスを返す"""
-    width = float(plate_data['width'])
-    height = float(plate_data['height'])
-    thickness = float(plate_data['thickness'])
-    holes = plate_data['holes']
+    geometry = PlateGeometry.from_plate_data(plate_data)
+    bx0, by0, _, _ = geometry.bounding_box()
+    width = geometry.width
+    height = geometry.height
+    thickness = geometry.thickness
 
     W, H = 320, 240
     margin = 20
@@ -2040,22 +3548,43 @@ def _build_preview_png(plate_data: dict) -> str:
     x0 = (W - pw) // 2
     y0 = (H - ph) // 2
 
-    for yy in range(y0, y0 + ph):
-        for xx in range(x0, x0 + pw):
-            set_px(xx, yy, plate_fill)
+    if geometry.is_rectangle():
+        for yy in range(y0, y0 + ph):
+            for xx in range(x0, x0 + pw):
+                set_px(xx, yy, plate_fill)
 
-    for xx in range(x0, x0 + pw):
-        set_px(xx, y0, plate_stroke)
-        set_px(xx, y0 + ph - 1, plate_stroke)
-    for yy in range(y0, y0 + ph):
-        set_px(x0, yy, plate_stroke)
-        set_px(x0 + pw - 1, yy, plate_stroke)
+        for xx in range(x0, x0 + pw):
+            set_px(xx, y0, plate_stroke)
+            set_px(xx, y0 + ph - 1, plate_stroke)
+        for yy in range(y0, y0 + ph):
+            set_px(x0, yy, plate_stroke)
+            set_px(x0 + pw - 1, yy, plate_stroke)
+    else:
+        # 多角形の外形はスキャンライン（偶奇規則）で塗りつぶす
+        poly = [(x0 + (x - bx0) * s, y0 + ph - (y - by0) * s) for x, y in geometry.outline]
+        n = len(poly)
+        for yy in range(y0, y0 + ph):
+            yc = yy + 0.5
+            xs = []
+            for i in range(n):
+                ax, ay = poly[i]
+                bx, by = poly[(i + 1) % n]
+                if (ay <= yc) != (by <= yc):
+                    xs.append(ax + (yc - ay) * (bx - ax) / (by - ay))
+            xs.sort()
+            for k in range(0, len(xs) - 1, 2):
+                for xx in range(int(round(xs[k])), int(round(xs[k + 1]))):
+                    set_px(xx, yy, plate_fill)
+        for i in range(n):
+            ax, ay = poly[i]
+            bx, by = poly[(i + 1) % n]
+            draw_line(int(ax), int(ay), int(bx), int(by), plate_stroke)
 
     r = 4
     first_hole = None
-    for hx, hy in holes:
-        cx = int(x0 + hx * s)
-        cy = int(y0 + ph - hy * s)
+    for hx, hy in zip(geometry.hole_x, geometry.hole_y):
+        cx = int(x0 + (hx - bx0) * s)
+        cy = int(y0 + ph - (hy - by0) * s)
         if first_hole is None:
             first_hole = (cx, cy)
         for yy in range(cy - r - 1, cy + r + 2):
@@ -2079,7 +3608,7 @@ def _build_preview_png(plate_data: dict) -> str:
     draw_text(x0 + 2, y0 + ph + 5, f't{int(thickness)}', dim_color)
     
     if first_hole:
-        hole_dia = plate_data.get('hole_dia', 18)
+        hole_dia = geometry.hole_d[0]
         draw_text(first_hole[0] + 8, first_hole[1] - 3, f'φ{int(hole_dia)}', dim_color)
 
     def chunk(tag, data):
@@ -2103,6 +3632,51 @@ def _build_preview_png(plate_data: dict) -> str:
     return str(out_path)
 
 
+def _select_lightest_splice_plate(inputs: adsk.core.CommandInputs):
+    """一覧中のプレートから、選択中と同じ役割・同じH形鋼用で設計応力に足りる最も軽いものを返す"""
+    force_input = inputs.itemById('splice_design_force')
+    type_input = inputs.itemById('splice_plate_type')
+    section_input = inputs.itemById('splice_section')
+    if not force_input or force_input.value <= 0 or not type_input or not type_input.selectedItem:
+        return None
+
+    current = type_input.selectedItem.name
+    section_name = section_input.selectedItem.name if section_input and section_input.selectedItem else SPLICE_STANDARD_TABLE
+    heights = bolt_capacity.plate_member_heights(current)
+    return bolt_capacity.select_lightest(get_splice_plate_types(section_name), force_input.value,
+                                         role=bolt_capacity.plate_role(current),
+                                         member_height=heights[0] if heights else None)
+
+def _hole_check_text(plate_data: dict) -> str:
+    """穴配置の検査結果の表示文字列"""
+    violations = hole_validator.validate_plate(plate_data)
+    return hole_validator.summarize(violations) if violations else 'OK'
+
+def _update_splice_capacity(inputs: adsk.core.CommandInputs) -> None:
+    """選択中プレート（ダイアログの板厚・穴径）の耐力検定と穴配置の検査結果を表示"""
+    text_input = inputs.itemById('splice_capacity')
+    force_input = inputs.itemById('splice_design_force')
+    type_input = inputs.itemById('splice_plate_type')
+    if not text_input or not force_input or not type_input or not type_input.selectedItem:
+        return
+    plate_type = type_input.selectedItem.name
+    plate_data = get_splice_plate_data(plate_type)
+    if not plate_data:
+        return
+
+    plate_data = dict(plate_data)
+    plate_data['thickness'] = inputs.itemById('splice_thickness').value * 10.0
+    plate_data['hole_dia'] = inputs.itemById('splice_hole_diameter').value * 10.0
+    hole_check_input = inputs.itemById('splice_hole_check')
+    if hole_check_input:
+        hole_check_input.formattedText = _hole_check_text(plate_data)
+    if force_input.value <= 0:
+        text_input.formattedText = ''
+        return
+    result = bolt_capacity.evaluate({plate_type: plate_data}, force_input.value)
+    text_input.formattedText = bolt_capacity.describe(result, plate_type, force_input.value)
+
+
 def _update_preview(inputs: adsk.core.CommandInputs, plate_data: dict) -> None:
     """プレビュー画像を再生成してImageCommandInputに反映"""
     preview_input = inputs.itemById('splice_plate_preview')
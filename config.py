@@ -10,6 +10,12 @@ import os
 # are ready to distribute it.
 DEBUG = True
 
+# Flag that enables the startup profile. When True, the import time of each
+# command module, the duration of each start() and the command resource
+# diagnostic are written to startup_profiles/ once per launch. It can also be
+# enabled without editing this file by setting TEKKOTSU_PROFILE_STARTUP=1.
+PROFILE_STARTUP = False
+
 # Gets the name of the add-in from the name of the folder the py file is in.
 # This is used when defining unique internal names for various UI elements 
 # that need a unique name. It's also recommended to use a company name as 
@@ -0,0 +1,93 @@
+"""Fusion を起動せずにアドインを動かすための adsk API スタブ。
+
+Linux などの素の Python 環境で、ダイアログ構築・配置・登録フローを
+テストやベンチマークにかけるために使います。Fusion 上では読み込まれません。
+
+使い方::
+
+    from lib import fakeAdsk
+    adsk = fakeAdsk.install()
+    addin = fakeAdsk.load_addin()
+    entry = importlib.import_module(f'{addin.__name__}.commands.steelPlateModule.entry')
+
+    fakeAdsk.set_latency('ImportManager.importToTarget', 0.05)
+"""
+
+import importlib
+import os
+import sys
+import types
+
+STUB_ROOT = os.path.dirname(os.path.abspath(__file__))
+ADDIN_ROOT = os.path.dirname(os.path.dirname(STUB_ROOT))
+
+
+def install():
+    """スタブの adsk を import 可能にして返します。"""
+    mod = sys.modules.get('adsk')
+    if mod is not None:
+        if os.path.dirname(os.path.dirname(os.path.abspath(mod.__file__))) != STUB_ROOT:
+            raise RuntimeError('本物の adsk が既に読み込まれています')
+        return mod
+    if STUB_ROOT not in sys.path:
+        sys.path.insert(0, STUB_ROOT)
+    import adsk
+    import adsk.core
+    import adsk.fusion
+    return adsk
+
+
+def load_addin(package_name: str = 'tekkotsu'):
+    """アドインのルートフォルダを package_name のパッケージとして登録します。
+
+    Fusion はアドインのフォルダをパッケージとして読み込むため、
+    commands 以下の相対 import (from ... import config) もそのまま動きます。
+    """
+    install()
+    pkg = sys.modules.get(package_name)
+    if pkg is None:
+        pkg = types.ModuleType(package_name)
+        pkg.__path__ = [ADDIN_ROOT]
+        pkg.__package__ = package_name
+        sys.modules[package_name] = pkg
+    return pkg
+
+
+def import_addin_module(name: str, package_name: str = 'tekkotsu'):
+    """アドイン内のモジュール ('commands.steelPlateModule.entry' など) を import します。"""
+    load_addin(package_name)
+    return importlib.import_module(f'{package_name}.{name}')
+
+
+def reset():
+    """UI・デザイン・呼び出し回数・レイテンシ設定を初期状態に戻します。"""
+    install()
+    from adsk import _runtime, core
+    _runtime.reset()
+    core.Application.get().simulate_reset()
+
+
+def set_latency(name: str, seconds: float):
+    """API ごとの擬似レイテンシ(秒)を設定します。name='*' で全 API に適用。"""
+    install()
+    from adsk import _runtime
+    _runtime.LATENCIES[name] = float(seconds)
+
+
+def clear_latencies():
+    install()
+    from adsk import _runtime
+    _runtime.LATENCIES.clear()
+
+
+def call_counts() -> dict:
+    """API 名ごとの呼び出し回数を返します。"""
+    install()
+    from adsk import _runtime
+    return dict(_runtime.CALLS)
+
+
+def reset_call_counts():
+    install()
+    from adsk import _runtime
+    _runtime.CALLS.clear()
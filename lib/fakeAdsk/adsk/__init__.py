@@ -0,0 +1,13 @@
+# Fusion を起動せずにアドインを動かすための adsk スタブパッケージ。
+# 本物の adsk と同じ名前で import されるため、lib/fakeAdsk を sys.path に
+# 追加したときだけ有効になります（fakeAdsk.install() を参照）。
+
+autoTerminate = True
+
+
+def doEvents():
+    return True
+
+
+def terminate():
+    return True
@@ -0,0 +1,38 @@
+# スタブ adsk 共通のランタイム状態（API呼び出し回数と擬似レイテンシ）
+
+import collections
+import functools
+import time
+
+# API名 ('CommandInputs.addValueInput' など) -> 1呼び出しあたりの待ち時間(秒)
+# '*' を指定すると、個別指定のない全APIに適用されます。
+LATENCIES = {}
+
+# API名 -> 呼び出し回数
+CALLS = collections.Counter()
+
+
+def api_call(name: str):
+    """API呼び出しを記録し、設定されたレイテンシだけ待機します。"""
+    CALLS[name] += 1
+    delay = LATENCIES.get(name, LATENCIES.get('*', 0.0))
+    if delay > 0:
+        time.sleep(delay)
+
+
+def api(fn):
+    """メソッドをスタブAPIとして計測対象にするデコレータ。"""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        api_call(name)
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def reset():
+    """呼び出し回数とレイテンシ設定をクリアします。"""
+    CALLS.clear()
+    LATENCIES.clear()
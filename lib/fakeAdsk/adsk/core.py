@@ -0,0 +1,1345 @@
+# adsk.core のインメモリ・スタブ
+#
+# このアドインが利用しているサブセットのみを実装しています。Fusion 固有の
+# 挙動を再現する必要がない部分は単純化しています。`simulate_` で始まる
+# メソッドはスタブ専用で、実際の API には存在しません。
+
+import math
+from pathlib import Path
+
+from . import _runtime
+from ._runtime import api
+
+
+# ============================================================================
+# 列挙型
+# ============================================================================
+
+class LogLevels:
+    InfoLogLevel = 0
+    WarningLogLevel = 1
+    ErrorLogLevel = 2
+
+
+class LogTypes:
+    ConsoleLogType = 0
+    FileLogType = 1
+
+
+class DropDownStyles:
+    LabeledIconDropDownStyle = 0
+    CheckBoxDropDownStyle = 1
+    TextListDropDownStyle = 2
+
+
+class DialogResults:
+    DialogError = -1
+    DialogOK = 0
+    DialogCancel = 1
+    DialogYes = 2
+    DialogNo = 3
+
+
+class DocumentTypes:
+    FusionDesignDocumentType = 0
+
+
+class PaletteDockingStates:
+    PaletteDockStateFloating = 0
+    PaletteDockStateTop = 1
+    PaletteDockStateBottom = 2
+    PaletteDockStateLeft = 3
+    PaletteDockStateRight = 4
+
+
+class Base:
+    """全 API オブジェクトの基底クラス。"""
+
+    @classmethod
+    def cast(cls, obj):
+        return obj if isinstance(obj, cls) else None
+
+    @property
+    def objectType(self):
+        return f'{type(self).__module__}::{type(self).__name__}'
+
+    @property
+    def isValid(self):
+        return True
+
+
+# ============================================================================
+# ジオメトリ
+# ============================================================================
+
+class Point3D(Base):
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    @staticmethod
+    @api
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    def copy(self):
+        return Point3D(self.x, self.y, self.z)
+
+    def asArray(self):
+        return (self.x, self.y, self.z)
+
+    def distanceTo(self, other):
+        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2)
+
+    def vectorTo(self, other):
+        return Vector3D(other.x - self.x, other.y - self.y, other.z - self.z)
+
+    def translateBy(self, vector):
+        self.x += vector.x
+        self.y += vector.y
+        self.z += vector.z
+        return True
+
+    def transformBy(self, matrix):
+        m = matrix._m
+        x, y, z = self.x, self.y, self.z
+        self.x = m[0] * x + m[1] * y + m[2] * z + m[3]
+        self.y = m[4] * x + m[5] * y + m[6] * z + m[7]
+        self.z = m[8] * x + m[9] * y + m[10] * z + m[11]
+        return True
+
+    def isEqualTo(self, other):
+        return self.distanceTo(other) < 1e-10
+
+    def __repr__(self):
+        return f'Point3D({self.x}, {self.y}, {self.z})'
+
+
+class Vector3D(Base):
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    @staticmethod
+    @api
+    def create(x=0.0, y=0.0, z=0.0):
+        return Vector3D(x, y, z)
+
+    @property
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def copy(self):
+        return Vector3D(self.x, self.y, self.z)
+
+    def asArray(self):
+        return (self.x, self.y, self.z)
+
+    def asPoint(self):
+        return Point3D(self.x, self.y, self.z)
+
+    def normalize(self):
+        n = self.length
+        if n <= 0:
+            return False
+        self.x /= n
+        self.y /= n
+        self.z /= n
+        return True
+
+    def scaleBy(self, scale):
+        self.x *= scale
+        self.y *= scale
+        self.z *= scale
+        return True
+
+    def add(self, other):
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return True
+
+    def subtract(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return True
+
+    def dotProduct(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def crossProduct(self, other):
+        return Vector3D(
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x,
+        )
+
+    def angleTo(self, other):
+        d = self.length * other.length
+        if d <= 0:
+            return 0.0
+        return math.acos(max(-1.0, min(1.0, self.dotProduct(other) / d)))
+
+    def isParallelTo(self, other):
+        return self.crossProduct(other).length <= 1e-10 * max(1.0, self.length * other.length)
+
+    def transformBy(self, matrix):
+        m = matrix._m
+        x, y, z = self.x, self.y, self.z
+        self.x = m[0] * x + m[1] * y + m[2] * z
+        self.y = m[4] * x + m[5] * y + m[6] * z
+        self.z = m[8] * x + m[9] * y + m[10] * z
+        return True
+
+    def __repr__(self):
+        return f'Vector3D({self.x}, {self.y}, {self.z})'
+
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+
+class Matrix3D(Base):
+    """4x4 行列（行優先、平行移動は第4列）。"""
+
+    def __init__(self, data=None):
+        self._m = list(data) if data is not None else list(_IDENTITY)
+
+    @staticmethod
+    @api
+    def create():
+        return Matrix3D()
+
+    def copy(self):
+        return Matrix3D(self._m)
+
+    @api
+    def getCell(self, row, column):
+        return self._m[row * 4 + column]
+
+    @api
+    def setCell(self, row, column, value):
+        self._m[row * 4 + column] = float(value)
+        return True
+
+    @api
+    def asArray(self):
+        return tuple(self._m)
+
+    @api
+    def setWithArray(self, cells):
+        if len(cells) != 16:
+            return False
+        self._m = [float(v) for v in cells]
+        return True
+
+    def setToIdentity(self):
+        self._m = list(_IDENTITY)
+        return True
+
+    @property
+    def translation(self):
+        return Vector3D(self._m[3], self._m[7], self._m[11])
+
+    @translation.setter
+    def translation(self, vector):
+        self._m[3] = vector.x
+        self._m[7] = vector.y
+        self._m[11] = vector.z
+
+    @api
+    def setWithCoordinateSystem(self, origin, xAxis, yAxis, zAxis):
+        self._m = [xAxis.x, yAxis.x, zAxis.x, origin.x,
+                   xAxis.y, yAxis.y, zAxis.y, origin.y,
+                   xAxis.z, yAxis.z, zAxis.z, origin.z,
+                   0.0, 0.0, 0.0, 1.0]
+        return True
+
+    def getAsCoordinateSystem(self):
+        m = self._m
+        return (Point3D(m[3], m[7], m[11]),
+                Vector3D(m[0], m[4], m[8]),
+                Vector3D(m[1], m[5], m[9]),
+                Vector3D(m[2], m[6], m[10]))
+
+    def transformBy(self, matrix):
+        # self = matrix * self
+        a, b = matrix._m, self._m
+        self._m = [sum(a[r * 4 + k] * b[k * 4 + c] for k in range(4))
+                   for r in range(4) for c in range(4)]
+        return True
+
+    def invert(self):
+        # 剛体変換（回転＋平行移動）のみを想定
+        m = self._m
+        rt = [m[0], m[4], m[8],
+              m[1], m[5], m[9],
+              m[2], m[6], m[10]]
+        t = (m[3], m[7], m[11])
+        inv_t = [-(rt[r * 3] * t[0] + rt[r * 3 + 1] * t[1] + rt[r * 3 + 2] * t[2]) for r in range(3)]
+        self._m = [rt[0], rt[1], rt[2], inv_t[0],
+                   rt[3], rt[4], rt[5], inv_t[1],
+                   rt[6], rt[7], rt[8], inv_t[2],
+                   0.0, 0.0, 0.0, 1.0]
+        return True
+
+    def isEqualTo(self, other):
+        return all(abs(a - b) < 1e-10 for a, b in zip(self._m, other._m))
+
+
+class BoundingBox3D(Base):
+    def __init__(self, minPoint=None, maxPoint=None):
+        self.minPoint = minPoint or Point3D()
+        self.maxPoint = maxPoint or Point3D()
+
+    @staticmethod
+    def create(minPoint, maxPoint):
+        return BoundingBox3D(minPoint.copy(), maxPoint.copy())
+
+    def expand(self, point):
+        self.minPoint = Point3D(min(self.minPoint.x, point.x), min(self.minPoint.y, point.y), min(self.minPoint.z, point.z))
+        self.maxPoint = Point3D(max(self.maxPoint.x, point.x), max(self.maxPoint.y, point.y), max(self.maxPoint.z, point.z))
+        return True
+
+
+class OrientedBoundingBox3D(Base):
+    def __init__(self, centerPoint, lengthDirection, widthDirection, length, width, height):
+        self.centerPoint = centerPoint
+        self.lengthDirection = lengthDirection
+        self.widthDirection = widthDirection
+        self.heightDirection = lengthDirection.crossProduct(widthDirection)
+        self.length = length
+        self.width = width
+        self.height = height
+
+    @staticmethod
+    def create(centerPoint, lengthDirection, widthDirection, length, width, height):
+        return OrientedBoundingBox3D(centerPoint.copy(), lengthDirection.copy(), widthDirection.copy(),
+                                     length, width, height)
+
+
+class Plane(Base):
+    def __init__(self, origin, normal):
+        self.origin = origin
+        self.normal = normal
+
+    @staticmethod
+    def create(origin, normal):
+        return Plane(origin.copy(), normal.copy())
+
+
+class Cylinder(Base):
+    def __init__(self, origin, axis, radius):
+        self.origin = origin
+        self.axis = axis
+        self.radius = radius
+
+    @staticmethod
+    def create(origin, axis, radius):
+        return Cylinder(origin.copy(), axis.copy(), radius)
+
+
+class Line3D(Base):
+    def __init__(self, startPoint, endPoint):
+        self.startPoint = startPoint
+        self.endPoint = endPoint
+
+    @staticmethod
+    def create(startPoint, endPoint):
+        return Line3D(startPoint.copy(), endPoint.copy())
+
+
+class Circle3D(Base):
+    def __init__(self, center, normal, radius):
+        self.center = center
+        self.normal = normal
+        self.radius = radius
+
+    @staticmethod
+    def createByCenter(center, normal, radius):
+        return Circle3D(center.copy(), normal.copy(), radius)
+
+
+class Arc3D(Base):
+    def __init__(self, center, normal, radius):
+        self.center = center
+        self.normal = normal
+        self.radius = radius
+
+
+class ValueInput(Base):
+    def __init__(self, real=None, string=None):
+        self.realValue = real
+        self.stringValue = string
+
+    @staticmethod
+    def createByReal(realValue):
+        return ValueInput(real=float(realValue))
+
+    @staticmethod
+    def createByString(stringValue):
+        return ValueInput(string=str(stringValue))
+
+    def _as_real(self):
+        if self.realValue is not None:
+            return self.realValue
+        try:
+            return float(str(self.stringValue).split()[0])
+        except (ValueError, IndexError):
+            return 0.0
+
+
+class ObjectCollection(Base):
+    def __init__(self):
+        self._items = []
+
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def add(self, item):
+        self._items.append(item)
+        return True
+
+    def item(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ============================================================================
+# イベント
+# ============================================================================
+
+class EventHandler(Base):
+    def notify(self, args):
+        pass
+
+
+class CommandCreatedEventHandler(EventHandler):
+    pass
+
+
+class CommandEventHandler(EventHandler):
+    pass
+
+
+class InputChangedEventHandler(EventHandler):
+    pass
+
+
+class ValidateInputsEventHandler(EventHandler):
+    pass
+
+
+class UserInterfaceGeneralEventHandler(EventHandler):
+    pass
+
+
+class NavigationEventHandler(EventHandler):
+    pass
+
+
+class HTMLEventHandler(EventHandler):
+    pass
+
+
+class Event(Base):
+    def __init__(self, name='', sender=None):
+        self.name = name
+        self.sender = sender
+        self._handlers = []
+
+    def remove(self, handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+            return True
+        return False
+
+    def simulate_fire(self, args):
+        """登録済みハンドラへイベントを配送します（スタブ専用）。"""
+        args.firingEvent = self
+        for handler in list(self._handlers):
+            handler.notify(args)
+
+
+# event_utils.add_handler は add() の注釈からハンドラ型名を解決するため、
+# 注釈は実際の API と同じく文字列で記述します。
+class CommandCreatedEvent(Event):
+    @api
+    def add(self, handler: 'CommandCreatedEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class CommandEvent(Event):
+    @api
+    def add(self, handler: 'CommandEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class InputChangedEvent(Event):
+    @api
+    def add(self, handler: 'InputChangedEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class ValidateInputsEvent(Event):
+    @api
+    def add(self, handler: 'ValidateInputsEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class UserInterfaceGeneralEvent(Event):
+    @api
+    def add(self, handler: 'UserInterfaceGeneralEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class NavigationEvent(Event):
+    @api
+    def add(self, handler: 'NavigationEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class HTMLEvent(Event):
+    @api
+    def add(self, handler: 'HTMLEventHandler') -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class EventArgs(Base):
+    def __init__(self):
+        self.firingEvent = None
+
+
+class CommandCreatedEventArgs(EventArgs):
+    def __init__(self, command):
+        super().__init__()
+        self.command = command
+
+
+class CommandEventArgs(EventArgs):
+    def __init__(self, command):
+        super().__init__()
+        self.command = command
+        self.executeFailed = False
+        self.isValidResult = False
+
+
+class InputChangedEventArgs(EventArgs):
+    def __init__(self, input, inputs):
+        super().__init__()
+        self.input = input
+        self.inputs = inputs
+
+
+class ValidateInputsEventArgs(EventArgs):
+    def __init__(self, inputs):
+        super().__init__()
+        self.inputs = inputs
+        self.areInputsValid = True
+
+
+class UserInterfaceGeneralEventArgs(EventArgs):
+    pass
+
+
+class NavigationEventArgs(EventArgs):
+    def __init__(self, navigationURL=''):
+        super().__init__()
+        self.navigationURL = navigationURL
+        self.launchExternally = False
+
+
+class HTMLEventArgs(EventArgs):
+    def __init__(self, action='', data=''):
+        super().__init__()
+        self.action = action
+        self.data = data
+        self.returnData = ''
+
+
+# ============================================================================
+# コマンド入力
+# ============================================================================
+
+class CommandInput(Base):
+    def __init__(self, inputs, id, name):
+        self.id = id
+        self.name = name
+        self.isVisible = True
+        self.isEnabled = True
+        self.tooltip = ''
+        self.parentCommandInput = inputs._owner
+        self.parentCommand = inputs.command
+        self.commandInputs = inputs
+
+    @api
+    def deleteMe(self):
+        self.commandInputs._remove(self)
+        return True
+
+
+class CommandInputs(Base):
+    """コマンド入力のコレクション。itemById はコマンド全体（子を含む）を検索します。"""
+
+    def __init__(self, command, owner=None, registry=None):
+        self.command = command
+        self._owner = owner
+        self._items = []
+        self._registry = registry if registry is not None else {}
+
+    def _add(self, inp):
+        self._items.append(inp)
+        self._registry[inp.id] = inp
+        return inp
+
+    def _remove(self, inp):
+        if inp in self._items:
+            self._items.remove(inp)
+        self._registry.pop(inp.id, None)
+
+    def _children(self, owner):
+        return CommandInputs(self.command, owner, self._registry)
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return self._items[index]
+
+    @api
+    def itemById(self, id):
+        return self._registry.get(id)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    @api
+    def addTabCommandInput(self, id, name, resourceFolder=''):
+        tab = TabCommandInput(self, id, name)
+        tab.isActive = not any(isinstance(i, TabCommandInput) for i in self._items)
+        return self._add(tab)
+
+    @api
+    def addGroupCommandInput(self, id, name):
+        return self._add(GroupCommandInput(self, id, name))
+
+    @api
+    def addDropDownCommandInput(self, id, name, dropDownStyle):
+        return self._add(DropDownCommandInput(self, id, name, dropDownStyle))
+
+    @api
+    def addValueInput(self, id, name, unitType, initialValue):
+        return self._add(ValueCommandInput(self, id, name, unitType, initialValue))
+
+    @api
+    def addStringValueInput(self, id, name, initialValue=''):
+        return self._add(StringValueCommandInput(self, id, name, initialValue))
+
+    @api
+    def addBoolValueInput(self, id, name, isCheckBox, resourceFolder='', initialValue=False):
+        return self._add(BoolValueCommandInput(self, id, name, isCheckBox, initialValue))
+
+    @api
+    def addImageCommandInput(self, id, name, imageFile):
+        return self._add(ImageCommandInput(self, id, name, imageFile))
+
+    @api
+    def addSelectionInput(self, id, name, commandPrompt):
+        return self._add(SelectionCommandInput(self, id, name, commandPrompt))
+
+    @api
+    def addTextBoxCommandInput(self, id, name, formattedText, numRows, isReadOnly):
+        return self._add(TextBoxCommandInput(self, id, name, formattedText, numRows, isReadOnly))
+
+
+class TabCommandInput(CommandInput):
+    def __init__(self, inputs, id, name):
+        super().__init__(inputs, id, name)
+        self.children = inputs._children(self)
+        self.isActive = False
+
+    @api
+    def activate(self):
+        for inp in self.commandInputs._items:
+            if isinstance(inp, TabCommandInput):
+                inp.isActive = inp is self
+        return True
+
+
+class GroupCommandInput(CommandInput):
+    def __init__(self, inputs, id, name):
+        super().__init__(inputs, id, name)
+        self.children = inputs._children(self)
+        self.isExpanded = True
+        self.isEnabledCheckBoxDisplayed = False
+
+
+class ListItem(Base):
+    def __init__(self, items, name, isSelected, icon=''):
+        self._items = items
+        self.name = name
+        self.icon = icon
+        self._selected = False
+        self.isSelected = isSelected
+
+    @property
+    def index(self):
+        return self._items._items.index(self)
+
+    @property
+    def isSelected(self):
+        return self._selected
+
+    @isSelected.setter
+    def isSelected(self, value):
+        if value:
+            for other in self._items._items:
+                other._selected = False
+        self._selected = bool(value)
+
+    @api
+    def deleteMe(self):
+        self._items._items.remove(self)
+        return True
+
+
+class ListItems(Base):
+    def __init__(self):
+        self._items = []
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def add(self, name, isSelected, icon='', beforeIndex=-1):
+        li = ListItem(self, name, False, icon)
+        if beforeIndex is None or beforeIndex < 0:
+            self._items.append(li)
+        else:
+            self._items.insert(beforeIndex, li)
+        li.isSelected = isSelected
+        return li
+
+    @api
+    def item(self, index):
+        return self._items[index]
+
+    @api
+    def clear(self):
+        self._items = []
+        return True
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DropDownCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, dropDownStyle):
+        super().__init__(inputs, id, name)
+        self.dropDownStyle = dropDownStyle
+        self.listItems = ListItems()
+        self.maxVisibleItems = 20
+
+    @property
+    def selectedItem(self):
+        for li in self.listItems._items:
+            if li.isSelected:
+                return li
+        return None
+
+
+class ValueCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, unitType, initialValue):
+        super().__init__(inputs, id, name)
+        self.unitType = unitType
+        self.value = initialValue._as_real()
+        self.minimumValue = None
+        self.maximumValue = None
+
+    @property
+    def expression(self):
+        # 内部単位は cm（Fusion と同じ）
+        if self.unitType == 'mm':
+            return f'{self.value * 10.0:g} mm'
+        return f'{self.value:g} {self.unitType}'.strip()
+
+    @expression.setter
+    def expression(self, text):
+        self.value = ValueInput.createByString(text)._as_real()
+
+    @property
+    def isValidExpression(self):
+        return True
+
+
+class StringValueCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, initialValue):
+        super().__init__(inputs, id, name)
+        self.value = initialValue
+        self.isReadOnly = False
+
+
+class BoolValueCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, isCheckBox, initialValue):
+        super().__init__(inputs, id, name)
+        self.isCheckBox = isCheckBox
+        self.value = bool(initialValue)
+
+
+class ImageCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, imageFile):
+        super().__init__(inputs, id, name)
+        self.imageFile = imageFile
+        self.isFullWidth = False
+
+
+class TextBoxCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, formattedText, numRows, isReadOnly):
+        super().__init__(inputs, id, name)
+        self.formattedText = formattedText
+        self.text = formattedText
+        self.numRows = numRows
+        self.isReadOnly = isReadOnly
+
+
+class Selection(Base):
+    def __init__(self, entity, point=None):
+        self.entity = entity
+        self.point = point or Point3D()
+
+
+class SelectionCommandInput(CommandInput):
+    def __init__(self, inputs, id, name, commandPrompt):
+        super().__init__(inputs, id, name)
+        self.commandPrompt = commandPrompt
+        self.selectionFilters = []
+        self.minimumSelections = 1
+        self.maximumSelections = 0
+        self._selections = []
+
+    @api
+    def addSelectionFilter(self, filter):
+        self.selectionFilters.append(filter)
+        return True
+
+    @api
+    def clearSelectionFilter(self):
+        self.selectionFilters = []
+        return True
+
+    @api
+    def setSelectionLimits(self, minimum, maximum=0):
+        self.minimumSelections = minimum
+        self.maximumSelections = maximum
+        return True
+
+    @property
+    def selectionCount(self):
+        return len(self._selections)
+
+    @api
+    def selection(self, index):
+        return self._selections[index]
+
+    @api
+    def addSelection(self, selection):
+        point = getattr(selection, 'simulate_point', None)
+        self._selections.append(Selection(selection, point))
+        return True
+
+    @api
+    def clearSelection(self):
+        self._selections = []
+        return True
+
+    def simulate_select(self, entity, point=None):
+        """ユーザーによる選択を模擬します（スタブ専用）。"""
+        self._selections.append(Selection(entity, point))
+        return self._selections[-1]
+
+
+# ============================================================================
+# コマンド
+# ============================================================================
+
+class Command(Base):
+    def __init__(self, parentCommandDefinition):
+        self.parentCommandDefinition = parentCommandDefinition
+        self.commandInputs = CommandInputs(self)
+        self.execute = CommandEvent('execute', self)
+        self.executePreview = CommandEvent('executePreview', self)
+        self.destroy = CommandEvent('destroy', self)
+        self.inputChanged = InputChangedEvent('inputChanged', self)
+        self.validateInputs = ValidateInputsEvent('validateInputs', self)
+        self.isOKButtonVisible = True
+        self.okButtonText = 'OK'
+
+    def simulate_input_changed(self, input):
+        """入力変更イベントを発火します（スタブ専用）。"""
+        args = InputChangedEventArgs(input, self.commandInputs)
+        self.inputChanged.simulate_fire(args)
+        return args
+
+    def simulate_execute(self):
+        """OK 押下（execute → destroy）を模擬します（スタブ専用）。"""
+        args = CommandEventArgs(self)
+        self.execute.simulate_fire(args)
+        self.destroy.simulate_fire(CommandEventArgs(self))
+        return args
+
+
+class CommandDefinition(Base):
+    def __init__(self, definitions, id, name, tooltip, resourceFolder):
+        self._definitions = definitions
+        self.id = id
+        self.name = name
+        self.tooltip = tooltip
+        self.resourceFolder = resourceFolder
+        self.commandCreated = CommandCreatedEvent('commandCreated', self)
+
+    @api
+    def execute(self, input=None):
+        self.simulate_click()
+        return True
+
+    def simulate_click(self):
+        """ボタン押下を模擬して commandCreated を発火し、Command を返します（スタブ専用）。"""
+        command = Command(self)
+        self.commandCreated.simulate_fire(CommandCreatedEventArgs(command))
+        return command
+
+    @api
+    def deleteMe(self):
+        self._definitions._items.pop(self.id, None)
+        return True
+
+
+class CommandDefinitions(Base):
+    def __init__(self):
+        self._items = {}
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return list(self._items.values())[index]
+
+    @api
+    def itemById(self, id):
+        return self._items.get(id)
+
+    @api
+    def addButtonDefinition(self, id, name, tooltip, resourceFolder=''):
+        if id in self._items:
+            raise RuntimeError(f'3 : command definition already exists: {id}')
+        cmd_def = CommandDefinition(self, id, name, tooltip, resourceFolder)
+        self._items[id] = cmd_def
+        return cmd_def
+
+
+# ============================================================================
+# ツールバー / ワークスペース / パレット
+# ============================================================================
+
+class CommandControl(Base):
+    def __init__(self, controls, commandDefinition):
+        self._controls = controls
+        self.commandDefinition = commandDefinition
+        self.id = commandDefinition.id
+        self.isPromoted = False
+        self.isPromotedByDefault = False
+        self.isVisible = True
+
+    @api
+    def deleteMe(self):
+        self._controls._items.pop(self.id, None)
+        return True
+
+
+class ToolbarControls(Base):
+    def __init__(self):
+        self._items = {}
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return list(self._items.values())[index]
+
+    @api
+    def itemById(self, id):
+        return self._items.get(id)
+
+    @api
+    def addCommand(self, commandDefinition, positionID='', isBefore=False):
+        ctrl = CommandControl(self, commandDefinition)
+        self._items[ctrl.id] = ctrl
+        return ctrl
+
+
+class ToolbarPanel(Base):
+    def __init__(self, panels, id, name):
+        self._panels = panels
+        self.id = id
+        self.name = name
+        self.controls = ToolbarControls()
+        self.isVisible = True
+
+    @api
+    def deleteMe(self):
+        self._panels._items.pop(self.id, None)
+        return True
+
+
+class ToolbarPanels(Base):
+    def __init__(self, ids=()):
+        self._items = {}
+        for pid in ids:
+            self._items[pid] = ToolbarPanel(self, pid, pid)
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return list(self._items.values())[index]
+
+    @api
+    def itemById(self, id):
+        return self._items.get(id)
+
+    @api
+    def add(self, id, name, positionID='', isBefore=True):
+        panel = ToolbarPanel(self, id, name)
+        self._items[id] = panel
+        return panel
+
+
+class Workspace(Base):
+    def __init__(self, id, panel_ids=()):
+        self.id = id
+        self.name = id
+        self.toolbarPanels = ToolbarPanels(panel_ids)
+
+
+class Workspaces(Base):
+    def __init__(self):
+        self._items = {
+            'FusionSolidEnvironment': Workspace(
+                'FusionSolidEnvironment', ('SolidCreatePanel', 'SolidScriptsAddinsPanel')),
+        }
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def itemById(self, id):
+        return self._items.get(id)
+
+
+class Palette(Base):
+    def __init__(self, palettes, id, name, htmlFileURL, isVisible, width, height):
+        self._palettes = palettes
+        self.id = id
+        self.name = name
+        self.htmlFileURL = htmlFileURL
+        self.isVisible = isVisible
+        self.width = width
+        self.height = height
+        self.dockingState = PaletteDockingStates.PaletteDockStateFloating
+        self.closed = UserInterfaceGeneralEvent('closed', self)
+        self.navigatingURL = NavigationEvent('navigatingURL', self)
+        self.incomingFromHTML = HTMLEvent('incomingFromHTML', self)
+        self.sent = []
+
+    @api
+    def sendInfoToHTML(self, action, data):
+        self.sent.append((action, data))
+        return ''
+
+    @api
+    def deleteMe(self):
+        self._palettes._items.pop(self.id, None)
+        return True
+
+
+class Palettes(Base):
+    def __init__(self):
+        self._items = {}
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def itemById(self, id):
+        return self._items.get(id)
+
+    @api
+    def add(self, id, name, htmlFileURL, isVisible, showCloseButton, isResizable, width=400, height=400,
+            useNewWebBrowser=False):
+        palette = Palette(self, id, name, htmlFileURL, isVisible, width, height)
+        self._items[id] = palette
+        return palette
+
+
+class FileDialog(Base):
+    def __init__(self, ui):
+        self._ui = ui
+        self.title = ''
+        self.filter = ''
+        self.filterIndex = 0
+        self.initialDirectory = ''
+        self.initialFilename = ''
+        self.isMultiSelectEnabled = False
+        self.filename = ''
+        self.filenames = _StringList([])
+
+    @api
+    def showOpen(self):
+        files = list(self._ui.simulate_file_dialog_files)
+        if not files:
+            return DialogResults.DialogCancel
+        self.filename = files[0]
+        self.filenames = _StringList(files if self.isMultiSelectEnabled else files[:1])
+        return DialogResults.DialogOK
+
+    @api
+    def showSave(self):
+        return self.showOpen()
+
+
+class FolderDialog(Base):
+    def __init__(self, ui):
+        self._ui = ui
+        self.title = ''
+        self.initialDirectory = ''
+        self.folder = ''
+
+    @api
+    def showDialog(self):
+        # ファイルダイアログと同じく simulate_file_dialog_files の先頭を選んだフォルダーとする
+        files = list(self._ui.simulate_file_dialog_files)
+        if not files:
+            return DialogResults.DialogCancel
+        self.folder = files[0]
+        return DialogResults.DialogOK
+
+
+class _StringList:
+    def __init__(self, values):
+        self._values = list(values)
+
+    @property
+    def count(self):
+        return len(self._values)
+
+    def item(self, index):
+        return self._values[index]
+
+
+class UserInterface(Base):
+    def __init__(self):
+        self.commandDefinitions = CommandDefinitions()
+        self.workspaces = Workspaces()
+        self.palettes = Palettes()
+        self.activeSelections = None
+        # messageBox の表示内容（スタブ専用）
+        self.simulate_messages = []
+        # ファイルダイアログで「選択された」とみなすパス（スタブ専用）
+        self.simulate_file_dialog_files = []
+
+    @api
+    def messageBox(self, text, title='', buttons=0, icon=0):
+        self.simulate_messages.append(text)
+        return DialogResults.DialogOK
+
+    @api
+    def createFileDialog(self):
+        return FileDialog(self)
+
+    @api
+    def createFolderDialog(self):
+        return FolderDialog(self)
+
+
+# ============================================================================
+# インポート
+# ============================================================================
+
+class ImportOptions(Base):
+    def __init__(self, filename):
+        self.filename = filename
+        self.isViewFit = True
+
+
+class FusionArchiveImportOptions(ImportOptions):
+    pass
+
+
+class STEPImportOptions(ImportOptions):
+    pass
+
+
+class IGESImportOptions(ImportOptions):
+    pass
+
+
+class ImportManager(Base):
+    # インポートしたモデルのボディ寸法 (cm)。ファイルの中身は読みません。
+    simulate_body_size = (10.0, 10.0, 100.0)
+
+    @api
+    def createFusionArchiveImportOptions(self, filename):
+        return FusionArchiveImportOptions(filename)
+
+    @api
+    def createSTEPImportOptions(self, filename):
+        return STEPImportOptions(filename)
+
+    @api
+    def createIGESImportOptions(self, filename):
+        return IGESImportOptions(filename)
+
+    @api
+    def createImportOptions(self, filename):
+        return ImportOptions(filename)
+
+    @api
+    def importToTarget(self, importOptions, target):
+        name = Path(importOptions.filename).stem
+        occ = target.occurrences.addNewComponent(Matrix3D())
+        occ.component.name = name
+        occ.component.simulate_add_body(name, (0.0, 0.0, 0.0), self.simulate_body_size)
+        return True
+
+
+# ============================================================================
+# ドキュメント
+# ============================================================================
+
+class Products(Base):
+    def __init__(self, design):
+        self._design = design
+
+    @api
+    def itemByProductType(self, productType):
+        return self._design if productType == 'DesignProductType' else None
+
+
+class Document(Base):
+    """ドキュメント（スタブではデザイン1つだけを持つ）。"""
+
+    def __init__(self, documents, design, visible):
+        self._documents = documents
+        self.products = Products(design)
+        self.isVisible = visible
+        self._closed = False
+
+    @property
+    def isValid(self):
+        return not self._closed
+
+    @api
+    def close(self, saveChanges):
+        self._closed = True
+        self._documents._items.remove(self)
+        return True
+
+
+class Documents(Base):
+    def __init__(self):
+        self._items = []
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def add(self, documentType, visible=True, options=None):
+        from . import fusion
+        document = Document(self, fusion.Design(), visible)
+        self._items.append(document)
+        return document
+
+
+# ============================================================================
+# アプリケーション
+# ============================================================================
+
+class Application(Base):
+    _instance = None
+
+    def __init__(self):
+        self.simulate_reset()
+
+    @staticmethod
+    def get():
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    def simulate_reset(self):
+        """UI と新規デザインを初期状態に戻します（スタブ専用）。
+
+        モジュールは import 時に app / ui を保持するため、オブジェクトは
+        作り直さず中身だけを入れ替えます。
+        """
+        from . import fusion
+        ui = getattr(self, 'userInterface', None)
+        if ui is None:
+            self.userInterface = UserInterface()
+        else:
+            ui.__init__()
+        self.importManager = ImportManager()
+        self.documents = Documents()
+        self.activeProduct = fusion.Design()
+        self.simulate_logs = []
+
+    @property
+    def activeDocument(self):
+        return None
+
+    @api
+    def log(self, message, level=LogLevels.InfoLogLevel, type=LogTypes.ConsoleLogType):
+        self.simulate_logs.append((level, message))
+        if len(self.simulate_logs) > 10000:
+            del self.simulate_logs[:5000]
+        return True
@@ -0,0 +1,831 @@
+# adsk.fusion のインメモリ・スタブ
+#
+# コンポーネント / オカレンス / スケッチ / 押し出し / 矩形パターンのみを扱います。
+# スケッチのプロファイルは、線分を端点でつないだ閉ループと円から求めます。
+
+import math
+
+from . import _runtime, core
+from ._runtime import api
+
+
+class FeatureOperations:
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+
+class PatternDistanceType:
+    ExtentPatternDistanceType = 0
+    SpacingPatternDistanceType = 1
+
+
+# ============================================================================
+# デザイン / コンポーネント
+# ============================================================================
+
+class _Tokened(core.Base):
+    """entityToken を持つオブジェクトの基底（スタブでは生成順の連番）。"""
+
+    _next_token = 0
+
+    @property
+    def entityToken(self):
+        _runtime.api_call(f'{type(self).__name__}.entityToken')
+        if not hasattr(self, '_token'):
+            _Tokened._next_token += 1
+            self._token = f'{type(self).__name__}:{_Tokened._next_token}'
+        return self._token
+
+
+class UnitsManager(core.Base):
+    def __init__(self):
+        self.defaultLengthUnits = 'mm'
+        self.internalUnits = 'cm'
+
+
+class Design(core.Base):
+    def __init__(self):
+        self.unitsManager = UnitsManager()
+        self.rootComponent = Component(self, '(Unsaved)')
+        self._active = None
+
+    @property
+    def activeComponent(self):
+        return self._active or self.rootComponent
+
+    def simulate_activate(self, component):
+        """コンポーネント編集モードを模擬します（スタブ専用）。"""
+        self._active = component
+
+    @property
+    def allComponents(self):
+        seen = []
+        stack = [self.rootComponent]
+        while stack:
+            comp = stack.pop()
+            if comp in seen:
+                continue
+            seen.append(comp)
+            stack.extend(o.component for o in comp.occurrences._items)
+        return seen
+
+
+class ConstructionPlane(core.Base):
+    def __init__(self, component, name):
+        self.component = component
+        self.name = name
+
+
+class ConstructionAxis(core.Base):
+    def __init__(self, component, name):
+        self.component = component
+        self.name = name
+
+
+class Attribute(core.Base):
+    def __init__(self, parent, group_name, name, value):
+        self.parent = parent
+        self.groupName = group_name
+        self.name = name
+        self.value = value
+
+
+class Attributes(core.Base):
+    """グループ名と名前で引く属性（値は文字列）。"""
+
+    def __init__(self, parent):
+        self._parent = parent
+        self._items = {}
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def add(self, groupName, name, value):
+        attribute = Attribute(self._parent, groupName, name, value)
+        self._items[(groupName, name)] = attribute
+        return attribute
+
+    @api
+    def itemByName(self, groupName, name):
+        return self._items.get((groupName, name))
+
+
+class Component(_Tokened):
+    def __init__(self, design, name=''):
+        self.parentDesign = design
+        self.name = name
+        self.attributes = Attributes(self)
+        self.occurrences = Occurrences(self)
+        self.sketches = Sketches(self)
+        self.features = Features(self)
+        self.bRepBodies = BRepBodies()
+        self.xYConstructionPlane = ConstructionPlane(self, 'XY')
+        self.xZConstructionPlane = ConstructionPlane(self, 'XZ')
+        self.yZConstructionPlane = ConstructionPlane(self, 'YZ')
+        self.xConstructionAxis = ConstructionAxis(self, 'X')
+        self.yConstructionAxis = ConstructionAxis(self, 'Y')
+        self.zConstructionAxis = ConstructionAxis(self, 'Z')
+
+    @property
+    def allOccurrences(self):
+        result = []
+        stack = list(self.occurrences._items)
+        while stack:
+            occ = stack.pop(0)
+            result.append(occ)
+            stack.extend(occ.component.occurrences._items)
+        return _Collection(result)
+
+    def simulate_add_body(self, name, min_xyz, max_xyz, feature=None):
+        """指定範囲 (cm) のボディを追加します（スタブ専用）。"""
+        body = BRepBody(self, name, min_xyz, max_xyz, feature)
+        self.bRepBodies._items.append(body)
+        return body
+
+
+class _Collection(core.Base):
+    def __init__(self, items=None):
+        self._items = list(items or [])
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    @api
+    def item(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Occurrences(_Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    @api
+    def addNewComponent(self, transform):
+        comp = Component(self._component.parentDesign)
+        return self._add(comp, transform)
+
+    @api
+    def addExistingComponent(self, component, transform):
+        return self._add(component, transform)
+
+    def _add(self, comp, transform):
+        if not comp.name:
+            comp.name = f'Component{len(self._component.parentDesign.allComponents)}'
+        occ = Occurrence(self, comp, transform)
+        occ._index = sum(1 for o in self._items if o.component is comp) + 1
+        self._items.append(occ)
+        return occ
+
+    @property
+    def asList(self):
+        return _Collection(self._items)
+
+
+class Occurrence(core.Base):
+    def __init__(self, occurrences, component, transform):
+        self._occurrences = occurrences
+        self.component = component
+        self._index = 1
+        self._transform = (transform or core.Matrix3D()).copy()
+        self.isLightBulbOn = True
+
+    @property
+    def sourceComponent(self):
+        return self._occurrences._component
+
+    @property
+    def name(self):
+        # Fusion と同じくコンポーネント名と番号（同じ名前のコンポーネントは区別できない）
+        return f'{self.component.name}:{self._index}'
+
+    @name.setter
+    def name(self, value):
+        # Fusion と同じくコンポーネント名が変わる
+        self.component.name = value
+
+    @property
+    def fullPathName(self):
+        _runtime.api_call('Occurrence.fullPathName')
+        return self._path_name()
+
+    @property
+    def assemblyContext(self):
+        _runtime.api_call('Occurrence.assemblyContext')
+        return self._parent()
+
+    def _parent(self):
+        # 親のオカレンス（スタブでは最初に見つかったもの）。ルート直下は None
+        parent = self._occurrences._component
+        design = parent.parentDesign
+        if parent is design.rootComponent:
+            return None
+        for occ in design.rootComponent.allOccurrences:
+            if occ.component is parent:
+                return occ
+        return None
+
+    def _path_name(self):
+        parent = self._parent()
+        if parent is None:
+            return self.name
+        return f'{parent._path_name()}+{self.name}'
+
+    @property
+    def transform(self):
+        _runtime.api_call('Occurrence.transform')
+        return self._transform.copy()
+
+    @transform.setter
+    def transform(self, matrix):
+        _runtime.api_call('Occurrence.transform')
+        self._transform = matrix.copy()
+
+    @property
+    def transform2(self):
+        _runtime.api_call('Occurrence.transform2')
+        return self._transform.copy()
+
+    @transform2.setter
+    def transform2(self, matrix):
+        _runtime.api_call('Occurrence.transform2')
+        self._transform = matrix.copy()
+
+    @property
+    def bRepBodies(self):
+        return self.component.bRepBodies
+
+    @property
+    def childOccurrences(self):
+        return self.component.occurrences
+
+    @property
+    def boundingBox(self):
+        _runtime.api_call('Occurrence.boundingBox')
+        return _transformed_box(_component_box(self.component), self._transform)
+
+    @api
+    def deleteMe(self):
+        self._occurrences._items.remove(self)
+        return True
+
+
+def _component_box(component):
+    box = None
+    for body in component.bRepBodies._items:
+        box = _union_box(box, (body._min, body._max))
+    for occ in component.occurrences._items:
+        child = _component_box(occ.component)
+        if child:
+            child_box = _transformed_box(child, occ._transform)
+            box = _union_box(box, (child_box.minPoint.asArray(), child_box.maxPoint.asArray()))
+    return box
+
+
+def _union_box(a, b):
+    if a is None:
+        return b
+    return (tuple(min(p, q) for p, q in zip(a[0], b[0])),
+            tuple(max(p, q) for p, q in zip(a[1], b[1])))
+
+
+def _transformed_box(box, matrix):
+    if box is None:
+        return core.BoundingBox3D()
+    (x0, y0, z0), (x1, y1, z1) = box
+    result = None
+    for x in (x0, x1):
+        for y in (y0, y1):
+            for z in (z0, z1):
+                p = core.Point3D(x, y, z)
+                p.transformBy(matrix)
+                if result is None:
+                    result = core.BoundingBox3D(p.copy(), p.copy())
+                else:
+                    result.expand(p)
+    return result
+
+
+class TriangleMesh(core.Base):
+    """表示メッシュ（スタブではボディの箱の8頂点だけを節点とする）。"""
+
+    def __init__(self, coordinates):
+        self._coordinates = coordinates
+
+    @property
+    def nodeCount(self):
+        return len(self._coordinates) // 3
+
+    @property
+    def nodeCoordinatesAsDouble(self):
+        _runtime.api_call('TriangleMesh.nodeCoordinatesAsDouble')
+        return list(self._coordinates)
+
+
+class TriangleMeshList(core.Base):
+    def __init__(self, body):
+        self._body = body
+
+    @property
+    def bestMesh(self):
+        _runtime.api_call('TriangleMeshList.bestMesh')
+        (x0, y0, z0), (x1, y1, z1) = self._body._min, self._body._max
+        return TriangleMesh([c for x in (x0, x1) for y in (y0, y1) for z in (z0, z1) for c in (x, y, z)])
+
+
+class MeshManager(core.Base):
+    def __init__(self, body):
+        self.displayMeshes = TriangleMeshList(body)
+
+
+class _BRepEntity(_Tokened):
+    """B-Rep 要素の基底。"""
+
+
+class BRepBodies(_Collection):
+    pass
+
+
+class BRepBody(_BRepEntity):
+    def __init__(self, component, name, min_xyz, max_xyz, feature=None):
+        self.parentComponent = component
+        self.name = name
+        self._min = tuple(float(v) for v in min_xyz)
+        self._max = tuple(float(v) for v in max_xyz)
+        self._feature = feature
+        self.isVisible = True
+        self._faces = []
+        # ルートに直接あるボディとして扱う（プロキシではない）
+        self.assemblyContext = None
+        self.nativeObject = None
+
+    @property
+    def faces(self):
+        return _Collection(self._faces)
+
+    def simulate_add_face(self, face):
+        """面を追加します（スタブ専用。箱の面は自動では作りません）。"""
+        self._faces.append(face)
+        return face
+
+    @property
+    def boundingBox(self):
+        return core.BoundingBox3D(core.Point3D(*self._min), core.Point3D(*self._max))
+
+    @property
+    def meshManager(self):
+        return MeshManager(self)
+
+    @property
+    def orientedMinimumBoundingBox(self):
+        """軸平行な箱を、長い辺から順に length / width / height とみなします（スタブ専用の近似）。"""
+        _runtime.api_call('BRepBody.orientedMinimumBoundingBox')
+        sizes = [q - p for p, q in zip(self._min, self._max)]
+        order = sorted(range(3), key=lambda i: -sizes[i])
+        axes = [core.Vector3D(*(1.0 if j == i else 0.0 for j in range(3))) for i in order]
+        center = core.Point3D(*((p + q) / 2.0 for p, q in zip(self._min, self._max)))
+        return core.OrientedBoundingBox3D(center, axes[0], axes[1], *(sizes[i] for i in order))
+
+    @api
+    def deleteMe(self):
+        self.parentComponent.bRepBodies._items.remove(self)
+        return True
+
+
+class BRepVertex(_BRepEntity):
+    def __init__(self, point):
+        self.geometry = point
+
+
+class BRepEdge(_BRepEntity):
+    """エッジ（スタブでは始点と終点、必要なら円・円弧のジオメトリを持つ）。"""
+
+    def __init__(self, start_point, end_point, geometry=None):
+        self.startVertex = BRepVertex(start_point)
+        self.endVertex = BRepVertex(end_point)
+        self._geometry = geometry
+
+    @property
+    def geometry(self):
+        _runtime.api_call('BRepEdge.geometry')
+        if self._geometry is not None:
+            return self._geometry
+        return core.Line3D(self.startVertex.geometry.copy(), self.endVertex.geometry.copy())
+
+    @property
+    def length(self):
+        return self.startVertex.geometry.distanceTo(self.endVertex.geometry)
+
+
+class BRepFace(_BRepEntity):
+    """面（スタブでは core.Plane / core.Cylinder のジオメトリだけを持つ）。"""
+
+    def __init__(self, geometry, edges=()):
+        self._geometry = geometry
+        self._edges = list(edges)
+
+    @property
+    def geometry(self):
+        _runtime.api_call('BRepFace.geometry')
+        return self._geometry
+
+    @property
+    def edges(self):
+        return _Collection(self._edges)
+
+
+class ConstructionPoint(core.Base):
+    def __init__(self, point):
+        self.geometry = point
+
+
+# ============================================================================
+# スケッチ
+# ============================================================================
+
+class Sketches(_Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    @api
+    def add(self, planarEntity, occurrenceForCreation=None):
+        sketch = Sketch(self._component, planarEntity)
+        self._items.append(sketch)
+        return sketch
+
+
+class SketchPoint(core.Base):
+    def __init__(self, point):
+        self.geometry = point.copy()
+
+    @property
+    def worldGeometry(self):
+        # スタブのスケッチ平面はワールド座標と一致するものとする
+        return self.geometry.copy()
+
+
+class SketchLine(core.Base):
+    def __init__(self, start, end):
+        self.startSketchPoint = SketchPoint(start)
+        self.endSketchPoint = SketchPoint(end)
+        self.isConstruction = False
+
+    @property
+    def length(self):
+        return self.startSketchPoint.geometry.distanceTo(self.endSketchPoint.geometry)
+
+
+class SketchCircle(core.Base):
+    def __init__(self, center, radius):
+        self.centerSketchPoint = SketchPoint(center)
+        self.radius = float(radius)
+        self.isConstruction = False
+
+
+class SketchLines(_Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    @api
+    def addByTwoPoints(self, startPoint, endPoint):
+        line = SketchLine(startPoint, endPoint)
+        self._items.append(line)
+        self._sketch._dirty = True
+        return line
+
+    @api
+    def addTwoPointRectangle(self, pointOne, pointTwo):
+        x0, y0 = pointOne.x, pointOne.y
+        x1, y1 = pointTwo.x, pointTwo.y
+        corners = [core.Point3D(x0, y0), core.Point3D(x1, y0), core.Point3D(x1, y1), core.Point3D(x0, y1)]
+        lines = [SketchLine(corners[i], corners[(i + 1) % 4]) for i in range(4)]
+        self._items.extend(lines)
+        self._sketch._dirty = True
+        return _Collection(lines)
+
+
+class SketchCircles(_Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    @api
+    def addByCenterRadius(self, centerPoint, radius):
+        circle = SketchCircle(centerPoint, radius)
+        self._items.append(circle)
+        self._sketch._dirty = True
+        return circle
+
+
+class SketchCurves(core.Base):
+    def __init__(self, sketch):
+        self.sketchLines = SketchLines(sketch)
+        self.sketchCircles = SketchCircles(sketch)
+
+
+class AreaProperties(core.Base):
+    def __init__(self, area, centroid):
+        self.area = area
+        self.centroid = centroid
+
+
+class Profile(core.Base):
+    def __init__(self, sketch, outline, holes, circle=None):
+        self.parentSketch = sketch
+        self._outline = outline      # [(x, y), ...] または None（円）
+        self._holes = holes          # [(cx, cy, r), ...]
+        self._circle = circle        # (cx, cy, r)
+
+    @api
+    def areaProperties(self, accuracy=0):
+        if self._circle:
+            cx, cy, r = self._circle
+            return AreaProperties(math.pi * r * r, core.Point3D(cx, cy, 0))
+        area = _polygon_area(self._outline)
+        area -= sum(math.pi * r * r for _, _, r in self._holes)
+        xs = [p[0] for p in self._outline]
+        ys = [p[1] for p in self._outline]
+        return AreaProperties(area, core.Point3D(sum(xs) / len(xs), sum(ys) / len(ys), 0))
+
+    def _extent(self):
+        if self._circle:
+            cx, cy, r = self._circle
+            return (cx - r, cy - r), (cx + r, cy + r)
+        xs = [p[0] for p in self._outline]
+        ys = [p[1] for p in self._outline]
+        return (min(xs), min(ys)), (max(xs), max(ys))
+
+
+class Profiles(_Collection):
+    pass
+
+
+class Sketch(core.Base):
+    def __init__(self, component, plane):
+        self.parentComponent = component
+        self.referencePlane = plane
+        self.name = f'Sketch{component.sketches.count + 1}'
+        self.sketchCurves = SketchCurves(self)
+        self.isComputeDeferred = False
+        self._dirty = True
+        self._profiles = Profiles()
+
+    @property
+    def profiles(self):
+        _runtime.api_call('Sketch.profiles')
+        if self._dirty:
+            self._profiles = Profiles(self._solve_profiles())
+            self._dirty = False
+        return self._profiles
+
+    def _solve_profiles(self):
+        circles = [(c.centerSketchPoint.geometry.x, c.centerSketchPoint.geometry.y, c.radius)
+                   for c in self.sketchCurves.sketchCircles._items if not c.isConstruction]
+        profiles = []
+        for loop in _chain_loops(self.sketchCurves.sketchLines._items):
+            holes = [c for c in circles if _point_in_polygon(c[0], c[1], loop)]
+            profiles.append(Profile(self, loop, holes))
+        for c in circles:
+            profiles.append(Profile(self, None, [], circle=c))
+        return profiles
+
+
+def _key(p):
+    return (round(p.x, 9), round(p.y, 9))
+
+
+def _chain_loops(lines):
+    """端点でつながる線分を閉ループにまとめます。"""
+    adjacency = {}
+    for line in lines:
+        if line.isConstruction:
+            continue
+        a = _key(line.startSketchPoint.geometry)
+        b = _key(line.endSketchPoint.geometry)
+        adjacency.setdefault(a, []).append(b)
+        adjacency.setdefault(b, []).append(a)
+    loops = []
+    visited = set()
+    for start in adjacency:
+        if start in visited:
+            continue
+        loop = [start]
+        visited.add(start)
+        prev, cur = None, start
+        while True:
+            nxt = [p for p in adjacency[cur] if p != prev and (p not in visited or p == start)]
+            if not nxt:
+                loop = None
+                break
+            prev, cur = cur, nxt[0]
+            if cur == start:
+                break
+            loop.append(cur)
+            visited.add(cur)
+        if loop and len(loop) >= 3:
+            loops.append(loop)
+    return loops
+
+
+def _polygon_area(points):
+    n = len(points)
+    s = 0.0
+    for i in range(n):
+        x0, y0 = points[i]
+        x1, y1 = points[(i + 1) % n]
+        s += x0 * y1 - x1 * y0
+    return abs(s) / 2.0
+
+
+def _point_in_polygon(x, y, points):
+    inside = False
+    n = len(points)
+    for i in range(n):
+        x0, y0 = points[i]
+        x1, y1 = points[(i + 1) % n]
+        if (y0 > y) != (y1 > y):
+            if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+    return inside
+
+
+# ============================================================================
+# フィーチャー
+# ============================================================================
+
+class ModelParameter(core.Base):
+    def __init__(self, value):
+        self.value = float(value)
+
+    @property
+    def expression(self):
+        return f'{self.value * 10.0:g} mm'
+
+
+class ExtentDefinition(core.Base):
+    pass
+
+
+class DistanceExtentDefinition(ExtentDefinition):
+    def __init__(self, distance):
+        self.distance = ModelParameter(distance)
+
+
+class SymmetricExtentDefinition(ExtentDefinition):
+    def __init__(self, distance):
+        self.distance = ModelParameter(distance)
+
+
+class OffsetStartDefinition(core.Base):
+    def __init__(self, offset):
+        self.offset = ModelParameter(offset)
+
+    @staticmethod
+    @api
+    def create(offset):
+        return OffsetStartDefinition(offset._as_real())
+
+
+class ExtrudeFeatureInput(core.Base):
+    def __init__(self, profile, operation):
+        self.profile = profile
+        self.operation = operation
+        self.startExtent = None
+        self._extent = None
+
+    @api
+    def setDistanceExtent(self, isSymmetric, distance):
+        d = distance._as_real()
+        self._extent = SymmetricExtentDefinition(d / 2.0) if isSymmetric else DistanceExtentDefinition(d)
+        return True
+
+    @api
+    def setSymmetricExtent(self, distance, isFullLength):
+        d = distance._as_real()
+        self._extent = SymmetricExtentDefinition(d / 2.0 if isFullLength else d)
+        return True
+
+
+class ExtrudeFeature(core.Base):
+    def __init__(self, features, profile, operation, extent):
+        self._features = features
+        self.profile = profile
+        self.operation = operation
+        self.extentOne = extent
+        self.name = f'Extrude{features.count + 1}'
+        self.bodies = _Collection()
+
+    @api
+    def deleteMe(self):
+        for body in list(self.bodies._items):
+            body.deleteMe()
+        self._features._items.remove(self)
+        return True
+
+
+class ExtrudeFeatures(_Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    @api
+    def createInput(self, profile, operation):
+        return ExtrudeFeatureInput(profile, operation)
+
+    @api
+    def add(self, input):
+        extent = input._extent or DistanceExtentDefinition(1.0)
+        feature = ExtrudeFeature(self, input.profile, input.operation, extent)
+        self._items.append(feature)
+        if input.operation != FeatureOperations.NewBodyFeatureOperation:
+            # 切り取り・結合は既存ボディの形状だけを変えるので、ボディは増やさない
+            return feature
+        profiles = list(input.profile) if isinstance(input.profile, core.ObjectCollection) else [input.profile]
+        extents = [p._extent() for p in profiles]
+        x0 = min(e[0][0] for e in extents)
+        y0 = min(e[0][1] for e in extents)
+        x1 = max(e[1][0] for e in extents)
+        y1 = max(e[1][1] for e in extents)
+        if isinstance(extent, SymmetricExtentDefinition):
+            z0, z1 = -extent.distance.value, extent.distance.value
+        else:
+            z0, z1 = sorted((0.0, extent.distance.value))
+        if isinstance(input.startExtent, OffsetStartDefinition):
+            z0 += input.startExtent.offset.value
+            z1 += input.startExtent.offset.value
+        body = self._component.simulate_add_body(f'Body{self._component.bRepBodies.count + 1}',
+                                                 (x0, y0, z0), (x1, y1, z1), feature)
+        feature.bodies._items.append(body)
+        return feature
+
+
+class RectangularPatternFeatureInput(core.Base):
+    def __init__(self, inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType):
+        self.inputEntities = inputEntities
+        self.directionOneEntity = directionOneEntity
+        self.quantityOne = quantityOne
+        self.distanceOne = distanceOne
+        self.patternDistanceType = patternDistanceType
+        self.directionTwoEntity = None
+        self.quantityTwo = core.ValueInput.createByReal(1)
+        self.distanceTwo = core.ValueInput.createByReal(0)
+
+    @api
+    def setDirectionTwo(self, directionTwoEntity, quantityTwo, distanceTwo):
+        self.directionTwoEntity = directionTwoEntity
+        self.quantityTwo = quantityTwo
+        self.distanceTwo = distanceTwo
+        return True
+
+
+class RectangularPatternFeature(core.Base):
+    def __init__(self, features, input):
+        self._features = features
+        self.inputEntities = input.inputEntities
+        self.quantityOne = ModelParameter(input.quantityOne._as_real())
+        self.distanceOne = ModelParameter(input.distanceOne._as_real())
+        self.quantityTwo = ModelParameter(input.quantityTwo._as_real())
+        self.distanceTwo = ModelParameter(input.distanceTwo._as_real())
+        self.name = f'RectangularPattern{features.count + 1}'
+
+    @api
+    def deleteMe(self):
+        self._features._items.remove(self)
+        return True
+
+
+class RectangularPatternFeatures(_Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    @api
+    def createInput(self, inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType):
+        return RectangularPatternFeatureInput(inputEntities, directionOneEntity, quantityOne, distanceOne,
+                                              patternDistanceType)
+
+    @api
+    def add(self, input):
+        feature = RectangularPatternFeature(self, input)
+        self._items.append(feature)
+        return feature
+
+
+class Features(core.Base):
+    def __init__(self, component):
+        self.extrudeFeatures = ExtrudeFeatures(component)
+        self.rectangularPatternFeatures = RectangularPatternFeatures(component)
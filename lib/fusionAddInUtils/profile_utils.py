@@ -0,0 +1,101 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from .general_utils import log
+
+# Attempt to read the profiling flag from parent config.
+try:
+    from ... import config
+    PROFILE_STARTUP = getattr(config, 'PROFILE_STARTUP', False)
+except:
+    PROFILE_STARTUP = False
+
+# 起動プロファイルの保存先（アドインフォルダ直下）と保持件数
+_ADDIN_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STARTUP_PROFILE_DIR = os.path.join(_ADDIN_DIR, 'startup_profiles')
+STARTUP_PROFILE_KEEP = 50
+
+# 計測結果: {'kind': 'import'|'start'|'diagnostic'|'addin', 'name': str, 'ms': float}
+_startup_records = []
+
+
+def startup_profile_enabled() -> bool:
+    """起動プロファイルが有効かどうかを返します。
+
+    config.PROFILE_STARTUP または環境変数 TEKKOTSU_PROFILE_STARTUP=1 で有効になります。
+    """
+    return bool(PROFILE_STARTUP) or os.environ.get('TEKKOTSU_PROFILE_STARTUP') == '1'
+
+
+@contextmanager
+def profile_step(kind: str, name: str):
+    """with ブロックの所要時間を起動プロファイルに記録します。
+
+    計測自体は perf_counter を2回呼ぶだけなので、無効時も常に記録します。
+    保存は startup_profile_enabled() のときだけ行います。
+
+    Arguments:
+    kind -- 計測の種類 ('import', 'start', 'diagnostic', 'addin' など)
+    name -- モジュール名などの識別子
+    """
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup_records.append({
+            'kind': kind,
+            'name': name,
+            'ms': round((time.perf_counter() - t0) * 1000.0, 3),
+        })
+
+
+def get_startup_records() -> list:
+    """記録済みの計測結果のコピーを返します。"""
+    return list(_startup_records)
+
+
+def save_startup_profile():
+    """記録した起動プロファイルを1起動1ファイルの JSON として保存し、記録をクリアします。
+
+    Returns:
+    保存したファイルパス。プロファイルが無効、または記録がない場合は None。
+    """
+    global _startup_records
+    records, _startup_records = _startup_records, []
+    if not records or not startup_profile_enabled():
+        return None
+
+    try:
+        totals = {}
+        for rec in records:
+            totals[rec['kind']] = round(totals.get(rec['kind'], 0.0) + rec['ms'], 3)
+
+        os.makedirs(STARTUP_PROFILE_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        path = os.path.join(STARTUP_PROFILE_DIR, f'startup_{stamp}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version.split()[0],
+                'totals_ms': totals,
+                'records': records,
+            }, f, ensure_ascii=False, indent=2)
+
+        # 古いプロファイルを削除
+        files = sorted(n for n in os.listdir(STARTUP_PROFILE_DIR) if n.startswith('startup_') and n.endswith('.json'))
+        for name in files[:-STARTUP_PROFILE_KEEP]:
+            try:
+                os.remove(os.path.join(STARTUP_PROFILE_DIR, name))
+            except OSError:
+                pass
+
+        summary = ', '.join(f'{k}={v:.1f}ms' for k, v in totals.items())
+        log(f'startup profile: {summary} -> {path}', force_console=True)
+        return path
+    except Exception as e:
+        log(f'startup profile の保存に失敗しました: {e}', force_console=True)
+        return None
@@ -0,0 +1,3 @@
+# 鉄骨の形状・計算ロジック（adsk に依存しない純 Python モジュール群）
+# Fusion 外（ベンチマーク、プロセスプール上のエクスポートなど）でも import できるよう、
+# このパッケージ内では adsk を import しないでください。
@@ -0,0 +1,174 @@
+"""スプライスプレートのボルト群耐力と板の有効断面耐力の一括計算。
+
+プレート表（SPLICE_PLATE_TYPES 形式）の全候補について、継手片側のボルト本数・
+摩擦面の数・高力ボルト (F10T) の許容すべり耐力・板の有効断面の許容耐力を
+array('d') にまとめて一度に計算し、設計応力に対して足りる最も軽い板を選びます。
+許容応力度設計（長期／短期）で、力の単位は kN です。
+"""
+
+import math
+import re
+from array import array
+from collections import namedtuple
+
+from .plate_geometry import PlateGeometry
+from .section_names import parse_h_section
+
+# F10T 1面あたりの長期許容すべり耐力 (kN)。短期はこの 1.5 倍
+SLIP_CAPACITY_LONG = {'M12': 17.0, 'M16': 30.2, 'M20': 47.1, 'M22': 57.0, 'M24': 67.9}
+
+# 穴径 = 軸径 + 2mm（M27 以上は +3mm）
+BOLT_HOLE_CLEARANCE = 2.0
+
+TERM_FACTOR = {'long': 1.0, 'short': 1.5}
+
+# 'H300用A5' の末尾の記号 → 役割
+_ROLE_BY_LETTER = {'A': 'flange_outer', 'B': 'flange_inner', 'W': 'web'}
+_ROLE_BY_SUFFIX = {'フランジ外': 'flange_outer', 'フランジ内': 'flange_inner', 'ウェブ': 'web'}
+_NAME_RE = re.compile(r'^(H[\d・]+)用([A-Z]+)\d*$')
+
+CapacityResult = namedtuple('CapacityResult', [
+    'names',          # プレート名のリスト
+    'bolts',          # 継手片側のボルト本数
+    'bolt_capacity',  # ボルト群の許容耐力 (kN)
+    'net_capacity',   # 板の有効断面の許容耐力 (kN)
+    'capacity',       # 上の小さい方 (kN)
+    'ratio',          # 検定比 = 設計応力 / capacity
+    'weight',         # 板の重量 (kg)
+])
+
+
+def bolt_from_hole(hole_dia: float, plate_data: dict = None) -> str:
+    """穴径（または plate_data の 'bolt'）からボルトの呼びを返します。"""
+    if plate_data and plate_data.get('bolt'):
+        return plate_data['bolt']
+    return f'M{int(round(hole_dia - BOLT_HOLE_CLEARANCE))}'
+
+
+def plate_role(name: str) -> str:
+    """プレート名から役割 ('flange_outer' / 'flange_inner' / 'web') を返します。不明なら None。"""
+    m = _NAME_RE.match(name)
+    if m:
+        return _ROLE_BY_LETTER.get(m.group(2)[0])
+    if ' ' in name:
+        return _ROLE_BY_SUFFIX.get(name.rsplit(' ', 1)[1])
+    return None
+
+
+def plate_member_heights(name: str) -> tuple:
+    """プレート名から対象とする H形鋼の呼び寸法（梁せい）を返します。
+
+    'H400・500用A13' -> (400, 500)、'H-300×150×6.5×9 ウェブ' -> (300,)
+    """
+    m = _NAME_RE.match(name)
+    if m:
+        return tuple(int(v) for v in m.group(1)[1:].split('・') if v)
+    dims = parse_h_section(name.rsplit(' ', 1)[0]) if ' ' in name else None
+    if dims:
+        return (nominal_height(dims[0]),)
+    return ()
+
+
+def nominal_height(h: float) -> int:
+    """梁せいの実寸から呼び寸法を返します（294 -> 300、244 -> 250）。"""
+    return int(round(h / 50.0) * 50)
+
+
+def _splice_layout(geometry: PlateGeometry) -> tuple:
+    """(継手片側のボルト本数, 1断面に並ぶ最大の穴数)。力は x 方向（板の長さ方向）とみなす。"""
+    x0, _, x1, _ = geometry.bounding_box()
+    mid = (x0 + x1) / 2.0
+    left = sum(1 for x in geometry.hole_x if x < mid)
+    right = geometry.hole_count - left
+    per_column = {}
+    for x in geometry.hole_x:
+        key = round(x, 3)
+        per_column[key] = per_column.get(key, 0) + 1
+    return min(left, right) if left and right else geometry.hole_count, max(per_column.values(), default=0)
+
+
+def evaluate(plate_types: dict, force_kn: float, shear_planes: int = 2, term: str = 'long',
+             steel_f: float = 235.0) -> CapacityResult:
+    """プレート表の全候補の耐力を一度に計算します。
+
+    Arguments:
+    plate_types -- {名前: plate_data}
+    force_kn -- 板（ウェブ添え板は両面の2枚）とそのボルト群が負担する設計応力 (kN)
+    shear_planes -- 摩擦面の数（添え板が両面なら 2）
+    term -- 'long'（長期）または 'short'（短期）
+    steel_f -- 板の基準強度 F (N/mm2)
+
+    Returns:
+    CapacityResult（各フィールドは plate_types の並び順の配列）
+    """
+    k = TERM_FACTOR[term]
+    names = list(plate_types)
+    geometries = [PlateGeometry.from_plate_data(plate_types[n], name=n) for n in names]
+
+    # 候補ごとの入力値を配列にまとめる
+    bolts = array('d')
+    per_column = array('d')
+    slip = array('d')
+    height = array('d')
+    hole = array('d')
+    thick = array('d')
+    allow = array('d')
+    for n, g in zip(names, geometries):
+        n_side, n_col = _splice_layout(g)
+        d = g.hole_d[0] if g.hole_count else 0.0
+        bolts.append(n_side)
+        per_column.append(n_col)
+        slip.append(SLIP_CAPACITY_LONG.get(bolt_from_hole(d, plate_types[n]), 0.0))
+        height.append(g.height)
+        hole.append(d)
+        thick.append(g.thickness)
+        # ウェブ添え板は両面2枚のせん断、フランジ添え板は1枚の引張で有効断面を検定する
+        if plate_role(n) == 'web':
+            allow.append(2.0 * steel_f / 1.5 / math.sqrt(3.0))
+        else:
+            allow.append(steel_f / 1.5)
+
+    # 一括計算
+    bolt_cap = array('d', map(lambda n, rs: n * shear_planes * rs * k, bolts, slip))
+    net_cap = array('d', map(lambda h, m, d, t, fa: max(h - m * d, 0.0) * t * fa * k / 1000.0,
+                             height, per_column, hole, thick, allow))
+    capacity = array('d', map(min, bolt_cap, net_cap))
+    ratio = array('d', (force_kn / c if c > 0 else math.inf for c in capacity))
+    weight = array('d', (g.weight() for g in geometries))
+    return CapacityResult(names, bolts, bolt_cap, net_cap, capacity, ratio, weight)
+
+
+def adequate_names(result: CapacityResult) -> list:
+    """検定比が 1.0 以下の候補名を軽い順に返します。"""
+    ok = [i for i, r in enumerate(result.ratio) if r <= 1.0]
+    ok.sort(key=lambda i: (result.weight[i], result.names[i]))
+    return [result.names[i] for i in ok]
+
+
+def select_lightest(plate_types: dict, force_kn: float, role: str = None, member_height: int = None,
+                    **kwargs):
+    """設計応力に対して足りる最も軽いプレート名を返します。該当がなければ None。
+
+    Arguments:
+    role -- 指定すると同じ役割のプレートだけを候補にする
+    member_height -- 指定するとその呼び寸法の H形鋼用のプレートだけを候補にする
+    kwargs -- evaluate に渡す引数
+    """
+    candidates = {
+        name: data for name, data in plate_types.items()
+        if (role is None or plate_role(name) == role)
+        and (member_height is None or member_height in plate_member_heights(name))
+    }
+    if not candidates:
+        return None
+    names = adequate_names(evaluate(candidates, force_kn, **kwargs))
+    return names[0] if names else None
+
+
+def describe(result: CapacityResult, name: str, force_kn: float) -> str:
+    """1候補の検定結果を表示用の文字列にします。"""
+    i = result.names.index(name)
+    mark = 'OK' if result.ratio[i] <= 1.0 else 'NG'
+    return (f'ボルト {int(result.bolts[i])}本/片側  ボルト群 {result.bolt_capacity[i]:.0f}kN  '
+            f'有効断面 {result.net_capacity[i]:.0f}kN  設計 {force_kn:.0f}kN  '
+            f'検定比 {result.ratio[i]:.2f} {mark}')
@@ -0,0 +1,185 @@
+"""高力六角ボルトセット（ボルト・ナット・座金2枚）の寸法と配置計算。
+
+プレートの穴から、同じ軸に重なる穴（スプライスの外側・内側プレートなど）を
+1本のボルトにまとめ、締付け長さ（グリップ）からボルト長さを決めます。
+同じ呼び・長さのボルトセットは1つの形状を共有し、配置は軸ごとの変換行列だけを
+array('d') にまとめて返します。寸法は mm です（JIS B 1186 の代表値）。
+"""
+
+import math
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+from . import frame_layout, transforms
+from .gusset_specs import bolt_hole_diameter
+from .plate_geometry import STEEL_DENSITY
+
+# 呼び: (軸径, 頭部高さ, 二面幅, ナット高さ, 座金厚さ, 座金外径)
+BOLT_DIMENSIONS = {
+    'M12': (12.0, 8.0, 22.0, 12.0, 3.2, 26.0),
+    'M16': (16.0, 10.0, 27.0, 16.0, 4.5, 32.0),
+    'M20': (20.0, 13.0, 32.0, 20.0, 4.5, 40.0),
+    'M22': (22.0, 14.0, 36.0, 22.0, 6.0, 44.0),
+    'M24': (24.0, 15.0, 41.0, 24.0, 6.0, 48.0),
+}
+
+# 締付け長さに加える長さ（座金2枚＋ナット＋余長）
+LENGTH_ALLOWANCE = {'M12': 25.0, 'M16': 30.0, 'M20': 35.0, 'M22': 40.0, 'M24': 45.0}
+LENGTH_STEP = 5.0
+
+# 同じ軸とみなす位置・向きの許容差（mm）
+AXIS_TOLERANCE = 0.5
+
+# これより大きい円筒面はボルト穴とみなさない（M24 の穴径 26mm に余裕を見た値, mm）
+MAX_HOLE_DIAMETER = 30.0
+
+BoltSet = namedtuple('BoltSet', [
+    'bolt', 'diameter', 'length', 'grip',
+    'head_height', 'across_flats', 'nut_height', 'washer_thickness', 'washer_diameter',
+])
+
+# 穴の軸。start/end はモデル単位の端点、dia は穴径 (mm)
+HoleAxis = namedtuple('HoleAxis', 'start end dia')
+
+
+def bolt_for_hole(hole_dia: float) -> str:
+    """穴径に合うボルト呼び（穴径 = 軸径 + 2mm に最も近いもの）。"""
+    return min(BOLT_DIMENSIONS, key=lambda b: abs(bolt_hole_diameter(b) - hole_dia))
+
+
+def bolt_length(bolt: str, grip: float) -> float:
+    """締付け長さから必要なボルト長さ（5mm 単位に切り上げ）。"""
+    return math.ceil((grip + LENGTH_ALLOWANCE[bolt]) / LENGTH_STEP - 1e-9) * LENGTH_STEP
+
+
+@lru_cache(maxsize=None)
+def bolt_set(bolt: str, grip: float) -> BoltSet:
+    """呼びと締付け長さからボルトセットの寸法を返します。"""
+    if bolt not in BOLT_DIMENSIONS:
+        raise ValueError(f'未対応のボルトです: {bolt}')
+    d, k, s, m, tw, dw = BOLT_DIMENSIONS[bolt]
+    return BoltSet(bolt, d, bolt_length(bolt, grip), float(grip), k, s, m, tw, dw)
+
+
+def name(bs: BoltSet) -> str:
+    """'M20×75' のような名前。"""
+    return f'{bs.bolt}×{bs.length:g}'
+
+
+def from_name(text: str) -> BoltSet:
+    """'M20×75' のような名前からボルトセットを返します。解析できなければ None。"""
+    bolt, sep, length = text.strip().partition('×')
+    if not sep or bolt not in BOLT_DIMENSIONS:
+        return None
+    try:
+        return bolt_set(bolt, float(length) - LENGTH_ALLOWANCE[bolt])
+    except ValueError:
+        return None
+
+
+def weight(bs: BoltSet, density: float = STEEL_DENSITY) -> float:
+    """ボルト・ナット・座金2枚の概算重量 (kg)。頭部とナットは二面幅の六角柱とします。"""
+    hexagon = math.sqrt(3.0) / 2.0 * bs.across_flats ** 2
+    shank = math.pi * bs.diameter ** 2 / 4.0
+    washer = math.pi * (bs.washer_diameter ** 2 - (bs.diameter + 1.0) ** 2) / 4.0
+    volume = (shank * bs.length + hexagon * bs.head_height
+              + (hexagon - shank) * bs.nut_height + 2.0 * washer * bs.washer_thickness)
+    return volume * density
+
+
+def hole_axes(geometry, matrix=transforms.IDENTITY, unit: float = 10.0) -> list:
+    """PlateGeometry（mm、板は z = 0〜板厚）の穴をモデル座標の軸にします。
+
+    Arguments:
+    matrix -- 板のローカル座標（モデル単位）からモデル座標への変換
+    unit -- 1 モデル単位あたりの mm（cm なら 10）
+    """
+    t = geometry.thickness / unit
+    axes = []
+    for x, y, d in geometry.holes:
+        x, y = x / unit, y / unit
+        axes.append(HoleAxis(transforms.apply(matrix, (x, y, 0.0)), transforms.apply(matrix, (x, y, t)), d))
+    return axes
+
+
+def _canonical(v):
+    """向きの符号をそろえる（z、y、x の順に最初の非ゼロ成分を正にする）。"""
+    for c in (v[2], v[1], v[0]):
+        if abs(c) > 1e-9:
+            return v if c > 0 else (-v[0], -v[1], -v[2])
+    return v
+
+
+def stack_holes(axes, unit: float = 10.0, tolerance: float = AXIS_TOLERANCE) -> list:
+    """同じ直線上の穴をまとめます。
+
+    Returns:
+    [(頭側の端点, 反対側の端点, 穴径 mm), ...]。頭側は軸の向きを z・y・x の順に正にそろえたときの
+    正の側（水平な板なら上面）です。
+    """
+    stacks = {}
+    tol = tolerance / unit
+    for axis in axes:
+        d = (axis.end[0] - axis.start[0], axis.end[1] - axis.start[1], axis.end[2] - axis.start[2])
+        n = math.sqrt(d[0] * d[0] + d[1] * d[1] + d[2] * d[2])
+        if n <= 1e-12:
+            continue
+        u = _canonical((d[0] / n, d[1] / n, d[2] / n))
+        # 直線上で原点に最も近い点と向きで同じ軸を判定する
+        s = axis.start
+        t = s[0] * u[0] + s[1] * u[1] + s[2] * u[2]
+        foot = (s[0] - t * u[0], s[1] - t * u[1], s[2] - t * u[2])
+        key = (tuple(round(c / tol) for c in foot), tuple(round(c * 1000) for c in u))
+        lo, hi = sorted((t, t + (d[0] * u[0] + d[1] * u[1] + d[2] * u[2])))
+        entry = stacks.get(key)
+        if entry is None:
+            stacks[key] = [foot, u, lo, hi, axis.dia]
+        else:
+            entry[2] = min(entry[2], lo)
+            entry[3] = max(entry[3], hi)
+            entry[4] = max(entry[4], axis.dia)
+    result = []
+    for foot, u, lo, hi, dia in stacks.values():
+        head = tuple(f + hi * c for f, c in zip(foot, u))
+        tail = tuple(f + lo * c for f, c in zip(foot, u))
+        result.append((head, tail, dia))
+    return result
+
+
+def plan(stacks, bolt: str = None, extra_grip: float = 0.0, unit: float = 10.0) -> dict:
+    """穴の重なりごとにボルトセットを決め、配置行列をまとめます。
+
+    Arguments:
+    stacks -- stack_holes の結果
+    bolt -- ボルト呼び。None なら穴径から決める
+    extra_grip -- 選んだ板以外の締付け長さ（母材の板厚など, mm）
+    unit -- 1 モデル単位あたりの mm
+
+    Returns:
+    {BoltSet: array('d')}。行列は頭側の座金が当たる面を原点、z を締付け方向（頭側から反対側）とし、
+    平行移動はモデル単位です。
+    """
+    batches = {}
+    for head, tail, dia in stacks:
+        grip = math.sqrt(sum((h - t) ** 2 for h, t in zip(head, tail))) * unit + extra_grip
+        bs = bolt_set(bolt or bolt_for_hole(dia), round(grip, 1))
+        frame = frame_layout.member_frame(head, tail)
+        if frame is None:
+            continue
+        batches.setdefault(bs, array('d')).extend(transforms.frame(frame.origin, frame.x, frame.y, frame.z))
+    return batches
+
+
+def summarize(batches: dict) -> str:
+    """'M20×75 ×16本, M20×80 ×4本' のような要約。"""
+    if not batches:
+        return '穴が見つかりません'
+    parts = [f'{name(bs)} ×{transforms.count(batch)}本'
+             for bs, batch in sorted(batches.items(), key=lambda item: (item[0].bolt, item[0].length))]
+    return ', '.join(parts)
+
+
+def clear_cache() -> None:
+    """メモ化したボルトセットを破棄します。"""
+    bolt_set.cache_clear()
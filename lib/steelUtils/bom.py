@@ -0,0 +1,189 @@
+"""配置した形鋼・プレート・ボルトの部材表（BOM）。
+
+配置時にコンポーネントの属性へ記録した部材情報（古いモデルではコンポーネント名）で
+部材を判別し、区分・名称・長さごとに本数と重量をまとめます。重量は形鋼カタログの
+単位重量 (kg/m)（なければ section_properties）、プレートの形状、ボルトセットの寸法から求め、
+Fusion の物理プロパティ（ボディごとの質量計算）は使いません。行は CSV / JSON に1行ずつ書き出します。
+"""
+
+import csv
+import json
+from collections import namedtuple
+
+from . import bolt_sets, section_properties
+from .plate_geometry import PlateGeometry
+from .section_names import parse_section_name
+
+# 部材情報を記録するコンポーネント属性
+ATTRIBUTE_GROUP = 'ACME_SteelHelper'
+ATTRIBUTE_NAME = 'bom'
+# プレートの形状（外形と穴）を記録する属性。板取りなどで再起動後も形状を使えるようにする
+GEOMETRY_ATTRIBUTE_NAME = 'plate'
+
+# 区分（部材表の並び順）
+MEMBER = '形鋼'
+PLATE = 'プレート'
+BOLT = 'ボルト'
+KINDS = (MEMBER, PLATE, BOLT)
+
+# コンポーネント名の接頭辞 → 区分（format_component_name で付ける名前）
+NAME_PREFIXES = (('SPL ', PLATE), ('GPL ', PLATE), ('HTB ', BOLT))
+
+# 部材1個の情報。length は材長 (mm, 形鋼以外は 0)、unit_weight は単位重量 (kg/m, 形鋼以外は 0)、
+# piece_weight は1個の重量 (kg)
+BomPart = namedtuple('BomPart', 'kind name length unit_weight piece_weight')
+
+# 部材表の1行。count は本数・枚数、weight は合計重量 (kg)
+BomRow = namedtuple('BomRow', 'kind name length count unit_weight piece_weight weight')
+
+CSV_HEADER = ('区分', '名称', '長さ(mm)', '数量', '単位重量(kg/m)', '1個の重量(kg)', '重量(kg)')
+
+# 同じ長さとみなす丸め（0.1mm）
+LENGTH_NDIGITS = 1
+
+
+def unit_weight(name: str, catalog_weight: float = None) -> float:
+    """単位重量 (kg/m)。カタログに登録した値を優先し、なければ断面寸法から求めます（不明なら 0）。"""
+    if catalog_weight:
+        return float(catalog_weight)
+    props = section_properties.properties(name.strip())
+    return props.weight if props else 0.0
+
+
+def member_part(name: str, length: float, catalog_weight: float = None) -> BomPart:
+    """形鋼1本（材長 mm）。"""
+    w = unit_weight(name, catalog_weight)
+    length = round(length, LENGTH_NDIGITS)
+    return BomPart(MEMBER, name.strip(), length, round(w, 3), round(w * length / 1000.0, 3))
+
+
+def plate_part(name: str, geometry) -> BomPart:
+    """PlateGeometry のプレート1枚。"""
+    return BomPart(PLATE, name.strip(), 0.0, 0.0, round(geometry.weight(), 3))
+
+
+def bolt_part(bs) -> BomPart:
+    """ボルトセット1組。"""
+    return BomPart(BOLT, bolt_sets.name(bs), 0.0, 0.0, round(bolt_sets.weight(bs), 3))
+
+
+def kind_from_name(name: str) -> str:
+    """コンポーネント名から区分を返します。形鋼名でもなければ None。"""
+    name = name.strip()
+    for prefix, kind in NAME_PREFIXES:
+        if name.startswith(prefix):
+            return kind
+    return MEMBER if parse_section_name(name) else None
+
+
+def encode(part: BomPart) -> str:
+    """属性に記録する文字列（JSON）。"""
+    return json.dumps(part._asdict(), ensure_ascii=False)
+
+
+def decode(value: str) -> BomPart:
+    """属性の文字列から BomPart に戻します。形式が違えば None。"""
+    try:
+        data = json.loads(value)
+        return BomPart(*(data[f] for f in BomPart._fields))
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def encode_geometry(geometry) -> str:
+    """プレートの形状を属性に記録する文字列（外形・穴 (x, y, 径)・板厚の JSON）。"""
+    data = {'outline': geometry.outline, 'holes': geometry.holes, 'thickness': geometry.thickness}
+    return json.dumps(data, ensure_ascii=False)
+
+
+def decode_geometry(value: str, name: str = ''):
+    """属性の文字列から PlateGeometry に戻します。形式が違えば None。"""
+    try:
+        return PlateGeometry.from_plate_data(json.loads(value), name=name)
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def counted_part(keys, parts: dict):
+    """オカレンスを部材として数えるときの BomPart。数えなければ None。
+
+    部材のコンポーネントの中にあるオカレンス（読み込んだモデルの子など）は数えません。
+
+    Arguments:
+    keys -- ルートからオカレンス自身までのコンポーネントのキー（entityToken など）
+    parts -- {キー: BomPart または None}
+    """
+    part = parts.get(keys[-1])
+    if part is None or any(parts.get(k) is not None for k in keys[:-1]):
+        return None
+    return part
+
+
+def count_parts(paths, parts: dict) -> dict:
+    """オカレンスの並びから部材ごとの個数を数えます。
+
+    Arguments:
+    paths -- 各オカレンスのコンポーネントのキーの並び（counted_part の keys）
+    parts -- {キー: BomPart または None}
+
+    Returns:
+    {BomPart: 個数}
+    """
+    counts = {}
+    for keys in paths:
+        part = counted_part(keys, parts)
+        if part is not None:
+            counts[part] = counts.get(part, 0) + 1
+    return counts
+
+
+def sorted_parts(counts: dict) -> list:
+    """部材を部材表の行の順（区分・名称・長さ）に並べます。"""
+    order = {kind: i for i, kind in enumerate(KINDS)}
+    return sorted(counts, key=lambda p: (order.get(p.kind, len(KINDS)), p.name, p.length))
+
+
+def rows(counts: dict):
+    """部材表の行を区分・名称・長さの順に返します（ジェネレーター）。"""
+    for part in sorted_parts(counts):
+        n = counts[part]
+        yield BomRow(part.kind, part.name, part.length, n, part.unit_weight, part.piece_weight,
+                     round(part.piece_weight * n, 3))
+
+
+def write_csv(bom_rows, stream) -> int:
+    """行を CSV で書き出し、行数を返します。"""
+    writer = csv.writer(stream)
+    writer.writerow(CSV_HEADER)
+    n = 0
+    for row in bom_rows:
+        writer.writerow(['' if (v == 0.0 and f in ('length', 'unit_weight')) else v
+                         for f, v in zip(BomRow._fields, row)])
+        n += 1
+    return n
+
+
+def write_json(bom_rows, stream) -> int:
+    """行を JSON 配列で書き出し、行数を返します（1行ずつ書くので全体を保持しません）。"""
+    stream.write('[')
+    n = 0
+    for row in bom_rows:
+        stream.write(',\n' if n else '\n')
+        stream.write(json.dumps(row._asdict(), ensure_ascii=False))
+        n += 1
+    stream.write('\n]\n')
+    return n
+
+
+def summarize(counts: dict) -> str:
+    """'形鋼 24本, プレート 36枚, ボルト 96本 / 合計 1234.5kg' のような要約。"""
+    if not counts:
+        return '部材が見つかりません'
+    units = {MEMBER: '本', PLATE: '枚', BOLT: '本'}
+    totals = {}
+    weight = 0.0
+    for part, n in counts.items():
+        totals[part.kind] = totals.get(part.kind, 0) + n
+        weight += part.piece_weight * n
+    shown = ', '.join(f'{kind} {totals[kind]}{units[kind]}' for kind in KINDS if kind in totals)
+    return f'{shown} / 合計 {weight:.1f}kg'
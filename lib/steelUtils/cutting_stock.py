@@ -0,0 +1,268 @@
+"""形鋼の定尺材（6m / 9m / 12m など）からの切断計画（1次元の板取り）。
+
+部材の長さを形鋼ごとにまとめ、のこ刃の切りしろ（kerf）を見込んで定尺材1本ごとの
+切断リストを作ります。通常は長い順に最初に入る材へ入れる first-fit decreasing
+（最も長い定尺で詰め、最後に入る最短の定尺へ替える）のあと、使用量の少ない材の部材を
+ほかの材の余りへ移して本数を減らす局所改善を行います。部材数の少ない形鋼は
+分枝限定法で購入長さの合計が最小の計画を探します（節点数の上限あり）。
+
+長さは mm です。1本の材に部材を n 本取るときの必要長さは 部材長の合計 + kerf × (n - 1)
+とします（材端の切りしろは見込みません）。
+"""
+
+import bisect
+import csv
+from collections import namedtuple
+
+# 既定の定尺 (mm) と切りしろ (mm)
+STOCK_LENGTHS = (6000.0, 9000.0, 12000.0)
+KERF = 3.0
+
+# 厳密解を探す部材数の上限と、探索する節点数の上限
+EXACT_LIMIT = 12
+EXACT_NODE_LIMIT = 200000
+
+# 定尺材1本。cuts は部材長（長い順）、remainder は端材の長さ
+Bar = namedtuple('Bar', 'stock cuts remainder')
+
+# 形鋼1種類の切断計画。oversize は最長の定尺より長く、継手が必要な部材長
+CuttingPlan = namedtuple('CuttingPlan', 'section bars oversize')
+
+CSV_HEADER = ('形鋼', '材番号', '定尺(mm)', '切断長さ(mm)', '端材(mm)')
+
+
+class _FirstFit:
+    """最初に入る材の番号を O(log n) で探すための、余り長さの最大値の木。"""
+
+    def __init__(self, count: int, capacity: float):
+        size = 1
+        while size < max(count, 1):
+            size *= 2
+        self.size = size
+        self.tree = [capacity] * (2 * size)
+
+    def find(self, need: float) -> int:
+        """余りが need 以上の最初の材の番号（なければ -1）。"""
+        if self.tree[1] < need:
+            return -1
+        i = 1
+        while i < self.size:
+            i = 2 * i if self.tree[2 * i] >= need else 2 * i + 1
+        return i - self.size
+
+    def take(self, index: int, amount: float) -> None:
+        i = index + self.size
+        self.tree[i] -= amount
+        i //= 2
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+
+def _stock_for(load: float, stocks, kerf: float) -> float:
+    """必要長さ（切りしろ込みの load - kerf）が入る最短の定尺。入らなければ None。"""
+    for stock in stocks:
+        if load <= stock + kerf + 1e-9:
+            return stock
+    return None
+
+
+def _first_fit_decreasing(cuts, stocks, kerf: float) -> list:
+    """長い順に、最長の定尺で最初に入る材へ入れます。戻り値は材ごとの部材長のリスト。"""
+    capacity = stocks[-1] + kerf
+    fit = _FirstFit(len(cuts), capacity)
+    bars = []
+    for length in cuts:
+        need = length + kerf
+        i = fit.find(need - 1e-9)
+        if i == len(bars):
+            bars.append([])
+        bars[i].append(length)
+        fit.take(i, need)
+    return bars
+
+
+def _improve(bars, stocks, kerf: float) -> list:
+    """使用量の少ない材から、部材をほかの材の余り（いまの定尺の範囲）へ移して材を減らします。
+
+    余りは (余り, 材番号) の昇順リストに保ち、最もぴったり入る材（best fit）を二分探索で探します。
+    """
+    loads = [sum(b) + kerf * len(b) for b in bars]
+    room_of = [_stock_for(load, stocks, kerf) + kerf - load for load in loads]
+    rooms = sorted((room, j) for j, room in enumerate(room_of))
+    for i in sorted(range(len(bars)), key=lambda i: loads[i]):
+        own = (room_of[i], i)
+        del rooms[bisect.bisect_left(rooms, own)]
+        moves = []
+        for length in sorted(bars[i], reverse=True):
+            need = length + kerf
+            k = bisect.bisect_left(rooms, (need - 1e-9, -1))
+            if k == len(rooms):
+                break
+            room, j = rooms.pop(k)
+            room_of[j] = room - need
+            bisect.insort(rooms, (room_of[j], j))
+            moves.append((room, j, need, length))
+        if len(moves) < len(bars[i]):
+            # 全部は移せない: 余りを元に戻す
+            for room, j, need, _ in reversed(moves):
+                del rooms[bisect.bisect_left(rooms, (room_of[j], j))]
+                room_of[j] = room
+                bisect.insort(rooms, (room, j))
+            bisect.insort(rooms, own)
+            continue
+        for _, j, need, length in moves:
+            bars[j].append(length)
+            loads[j] += need
+        bars[i] = []
+    return [b for b in bars if b]
+
+
+def _exact(cuts, stocks, kerf: float, upper: float, node_limit: int = EXACT_NODE_LIMIT) -> list:
+    """購入長さの合計が upper より小さい計画を分枝限定法で探します。見つからなければ None。"""
+    n = len(cuts)
+    suffix = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix[i] = suffix[i + 1] + cuts[i]
+    capacity = stocks[-1] + kerf
+    loads, assign = [], [0] * n
+    best = {'cost': upper - 1e-6, 'assign': None, 'nodes': 0}
+
+    def dfs(i, cost, slack):
+        best['nodes'] += 1
+        if best['nodes'] > node_limit:
+            return
+        if i == n:
+            if cost < best['cost']:
+                best['cost'], best['assign'] = cost, assign[:]
+            return
+        # 残りの部材は、いまの余りを超える分だけ購入長さを増やす
+        if cost + max(0.0, suffix[i] - slack) >= best['cost']:
+            return
+        need = cuts[i] + kerf
+        tried = set()
+        for b, load in enumerate(loads):
+            new = load + need
+            if new > capacity + 1e-9 or load in tried:
+                continue
+            # 使用量が同じ材は入れ替えても同じ計画になる
+            tried.add(load)
+            old_stock = _stock_for(load, stocks, kerf)
+            new_stock = _stock_for(new, stocks, kerf)
+            loads[b] = new
+            assign[i] = b
+            dfs(i + 1, cost - old_stock + new_stock, slack - (old_stock + kerf - load) + (new_stock + kerf - new))
+            loads[b] = load
+        stock = _stock_for(need, stocks, kerf)
+        loads.append(need)
+        assign[i] = len(loads) - 1
+        dfs(i + 1, cost + stock, slack + stock + kerf - need)
+        loads.pop()
+
+    dfs(0, 0.0, 0.0)
+    if best['assign'] is None:
+        return None
+    bars = [[] for _ in range(max(best['assign']) + 1)]
+    for length, b in zip(cuts, best['assign']):
+        bars[b].append(length)
+    return bars
+
+
+def _bars(groups, stocks, kerf: float) -> list:
+    result = []
+    for cuts in groups:
+        cuts = sorted(cuts, reverse=True)
+        load = sum(cuts) + kerf * (len(cuts) - 1)
+        stock = _stock_for(load + kerf, stocks, kerf)
+        result.append(Bar(stock, tuple(cuts), round(stock - load, 1)))
+    result.sort(key=lambda b: (-b.stock, b.remainder))
+    return result
+
+
+def plan(section: str, lengths, stocks=STOCK_LENGTHS, kerf: float = KERF,
+         exact: bool = False, exact_limit: int = EXACT_LIMIT) -> CuttingPlan:
+    """1種類の形鋼の切断計画を作ります。
+
+    Arguments:
+    section -- 形鋼名
+    lengths -- 部材長 (mm) の並び（同じ長さは本数分）
+    stocks -- 定尺 (mm)
+    kerf -- 切りしろ (mm)
+    exact -- True なら部材数が exact_limit 以下のとき分枝限定法で最小の計画を探す
+
+    Returns:
+    CuttingPlan。bars は長い定尺から順。
+    """
+    stocks = tuple(sorted(float(s) for s in stocks))
+    if not stocks:
+        raise ValueError('定尺が指定されていません')
+    cuts, oversize = [], []
+    for length in lengths:
+        (oversize if length > stocks[-1] + 1e-9 else cuts).append(float(length))
+    cuts.sort(reverse=True)
+
+    groups = _improve(_first_fit_decreasing(cuts, stocks, kerf), stocks, kerf)
+    if exact and 0 < len(cuts) <= exact_limit:
+        upper = sum(b.stock for b in _bars(groups, stocks, kerf))
+        better = _exact(cuts, stocks, kerf, upper)
+        if better is not None:
+            groups = better
+    return CuttingPlan(section, _bars(groups, stocks, kerf), tuple(sorted(oversize, reverse=True)))
+
+
+def parse_stock_lengths(text: str) -> tuple:
+    """'6000, 9000, 12000' のような文字列から定尺 (mm) の並びを返します。数値でなければ ValueError。"""
+    values = tuple(sorted({float(v) for v in text.replace('、', ',').replace(' ', ',').split(',') if v.strip()}))
+    if not values or values[0] <= 0.0:
+        raise ValueError(f'定尺の指定が正しくありません: {text}')
+    return values
+
+
+def plan_all(members: dict, stocks=STOCK_LENGTHS, kerf: float = KERF, exact: bool = False) -> list:
+    """{形鋼名: [部材長, ...]} から形鋼ごとの切断計画を名前順に作ります。"""
+    return [plan(section, lengths, stocks, kerf, exact) for section, lengths in sorted(members.items())]
+
+
+def stock_counts(cutting_plan: CuttingPlan) -> dict:
+    """{定尺: 本数}"""
+    counts = {}
+    for bar in cutting_plan.bars:
+        counts[bar.stock] = counts.get(bar.stock, 0) + 1
+    return counts
+
+
+def utilization(cutting_plan: CuttingPlan) -> float:
+    """歩留まり（部材長の合計 / 購入長さの合計）。材がなければ 0。"""
+    total = sum(bar.stock for bar in cutting_plan.bars)
+    return sum(sum(bar.cuts) for bar in cutting_plan.bars) / total if total else 0.0
+
+
+def summarize(plans) -> str:
+    """'H-300×150×6.5×9: 12m×14本, 9m×2本 (歩留まり 93.1%)' のような要約（形鋼ごとに1行）。"""
+    if not plans:
+        return '切断する部材がありません'
+    lines = []
+    for p in plans:
+        counts = stock_counts(p)
+        shown = ', '.join(f'{stock / 1000.0:g}m×{counts[stock]}本' for stock in sorted(counts, reverse=True))
+        line = f'{p.section}: {shown} (歩留まり {utilization(p) * 100.0:.1f}%)'
+        if p.oversize:
+            line += f' / 定尺超え {len(p.oversize)}本'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def write_csv(plans, stream) -> int:
+    """材ごとの切断リストを CSV で書き出し、行数を返します。定尺超えの部材は材番号を空にします。"""
+    writer = csv.writer(stream)
+    writer.writerow(CSV_HEADER)
+    n = 0
+    for p in plans:
+        for i, bar in enumerate(p.bars, 1):
+            writer.writerow([p.section, i, f'{bar.stock:g}', ' + '.join(f'{c:g}' for c in bar.cuts),
+                             f'{bar.remainder:g}'])
+            n += 1
+        for length in p.oversize:
+            writer.writerow([p.section, '', '', f'{length:g}', ''])
+            n += 1
+    return n
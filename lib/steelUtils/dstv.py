@@ -0,0 +1,199 @@
+"""形鋼・プレートの DSTV（NC1）ファイルの書き出し。
+
+CNC の孔あけ・切断ラインに渡す DSTV-NC（.nc1）を、形鋼名の寸法（section_names）と
+材長、PlateGeometry の外形・穴から直接書きます。ヘッダー（ST ブロック）の寸法・単位重量・
+塗装面積は section_properties と同じ式で求め、プレートは外形（AK）と穴（BO）を出力します。
+形鋼の穴は扱いません（形鋼はヘッダーだけ）。
+
+export_all は部材を1つずつ受け取ってすぐファイルに書くので、デザイン全体でも
+部材の数によらず一定のメモリで書き出せます。寸法は mm、文字は ASCII だけです。
+"""
+
+import os
+from collections import namedtuple
+
+from . import section_properties
+from .plate_geometry import STEEL_DENSITY
+from .section_names import parse_section_name
+
+# 既定の鋼種
+DEFAULT_GRADE = 'SS400'
+
+# 形鋼の種類 → DSTV の断面コード
+PROFILE_CODES = {
+    'H': 'I', 'LH': 'I', 'C': 'U', 'L': 'L', 'BOX': 'M', 'PIPE': 'RO',
+    'FB': 'B', 'RC': 'C', 'Z': 'SO', 'HAT': 'SO',
+}
+
+# プレートの断面コード
+PLATE_CODE = 'B'
+
+# ST ブロックの内容。height はせい（プレートは幅）、width はフランジ幅（プレートは板厚）、
+# weight は単位重量 (kg/m)、paint は塗装面積 (m2/m)
+NcHeader = namedtuple('NcHeader', 'order drawing phase piece grade quantity profile code length '
+                                  'height width flange web radius weight paint')
+
+# 書き出す部材。形鋼は geometry が None、プレートは length が 0
+NcPart = namedtuple('NcPart', 'name length geometry quantity')
+
+
+def _num(value: float) -> str:
+    return f'{value:10.2f}'
+
+
+def _ascii(value: str) -> str:
+    """ASCII 以外の文字を除いた文字列（空なら '-'）。"""
+    text = ''.join(c for c in value.replace('×', '*') if 32 <= ord(c) < 127).strip()
+    return text or '-'
+
+
+def _dims(kind: str, dims: tuple) -> tuple:
+    """形鋼の寸法から (せい, フランジ幅, フランジ厚, ウェブ厚, 半径)。"""
+    if kind == 'H':
+        h, b, tw, tf = dims
+        return h, b, tf, tw, section_properties.h_fillet_radius(h, b, tw, tf)
+    if kind == 'LH':
+        h, b, tw, tf = dims
+        return h, b, tf, tw, 0.0
+    if kind == 'C' and len(dims) == 4:
+        h, b, tw, tf = dims
+        return h, b, tf, tw, max(8.0, tf)
+    if kind == 'BOX':
+        h, b, t = dims
+        return h, b, t, t, 2.5 * t
+    if kind == 'PIPE':
+        d, t = dims
+        return d, d, t, t, 0.0
+    if kind == 'FB':
+        t, w = dims
+        return w, t, t, t, 0.0
+    if kind == 'L':
+        a, b, t = dims
+        return a, b, t, t, 0.0
+    if kind == 'HAT':
+        h, a, b, t = dims
+        return h, a + 2.0 * b, t, t, t
+    # 軽溝形・軽Z (H×A×t)、リップ溝形・リップZ (H×A×C×t): 内側の曲げ半径 t
+    return dims[0], dims[1], dims[-1], dims[-1], dims[-1]
+
+
+def profile_text(section) -> str:
+    """DSTV の断面名（'H300*150*6.5*9' のような ASCII）。"""
+    return section.kind + '*'.join(f'{v:g}' for v in section.dims)
+
+
+def member_header(name: str, length: float, quantity: int = 1, piece: str = '',
+                  grade: str = DEFAULT_GRADE, order: str = '') -> NcHeader:
+    """形鋼1本のヘッダー。寸法を読み取れない形鋼名は None。"""
+    section = parse_section_name(name)
+    if section is None or section.kind not in PROFILE_CODES:
+        return None
+    try:
+        height, width, flange, web, radius = _dims(section.kind, section.dims)
+    except ValueError:
+        return None
+    props = section_properties.properties(name.strip())
+    return NcHeader(order, '', '', piece, grade, quantity, profile_text(section), PROFILE_CODES[section.kind],
+                    length, height, width, flange, web, radius,
+                    props.weight if props else 0.0, props.paint_area if props else 0.0)
+
+
+def plate_header(geometry, quantity: int = 1, piece: str = '', grade: str = DEFAULT_GRADE,
+                 order: str = '') -> NcHeader:
+    """プレート1枚のヘッダー（長さは外接矩形の x 方向、幅は y 方向）。"""
+    t = geometry.thickness
+    width = geometry.height
+    weight = width * t * STEEL_DENSITY * 1000.0
+    return NcHeader(order, '', '', piece, grade, quantity, f'PL{t:g}*{width:g}', PLATE_CODE,
+                    geometry.width, width, t, t, t, 0.0, weight, 2.0 * (width + t) / 1000.0)
+
+
+def write_header(header: NcHeader, stream, comment: str = '') -> None:
+    """ST ブロック（と '**' のコメント行）を書きます。"""
+    lines = ['ST']
+    if comment:
+        lines.append(f'** {_ascii(comment)}')
+    lines += [f'  {_ascii(v)}' for v in (header.order, header.drawing, header.phase, header.piece, header.grade)]
+    lines.append(f'  {header.quantity}')
+    lines.append(f'  {_ascii(header.profile)}')
+    lines.append(f'  {header.code}')
+    # 材長、切断長さ、せい、フランジ幅、フランジ厚、ウェブ厚、半径、単位重量、塗装面積
+    lines += [_num(v) for v in (header.length, header.length, header.height, header.width, header.flange,
+                                header.web, header.radius, header.weight)]
+    lines.append(f'{header.paint:10.3f}')
+    # ウェブ・フランジの始端・終端の切断角度（直角）
+    lines += [_num(0.0)] * 4
+    # 文字情報 1〜4
+    lines += ['  -'] * 4
+    stream.write('\n'.join(lines) + '\n')
+
+
+def write_contour(geometry, stream) -> None:
+    """プレートの外形（AK ブロック、前面 v、外接矩形の左下が原点、始点に戻って閉じる）。"""
+    x0, y0, _, _ = geometry.bounding_box()
+    points = list(zip(geometry.outline_x, geometry.outline_y))
+    points.append(points[0])
+    lines = ['AK'] + [f'  v{_num(x - x0)}{_num(y - y0)}{_num(0.0)}' for x, y in points]
+    stream.write('\n'.join(lines) + '\n')
+
+
+def write_holes(geometry, stream) -> None:
+    """プレートの穴（BO ブロック、前面 v）。穴がなければ書きません。"""
+    if not geometry.hole_count:
+        return
+    x0, y0, _, _ = geometry.bounding_box()
+    lines = ['BO'] + [f'  v{_num(x - x0)}{_num(y - y0)}{_num(d)}'
+                      for x, y, d in zip(geometry.hole_x, geometry.hole_y, geometry.hole_d)]
+    stream.write('\n'.join(lines) + '\n')
+
+
+def write_member(header: NcHeader, stream, comment: str = '') -> None:
+    """形鋼1本の NC1（ヘッダーだけ）。"""
+    write_header(header, stream, comment)
+    stream.write('EN\n')
+
+
+def write_plate(header: NcHeader, geometry, stream, comment: str = '') -> None:
+    """プレート1枚の NC1（ヘッダー・外形・穴）。"""
+    write_header(header, stream, comment)
+    write_contour(geometry, stream)
+    write_holes(geometry, stream)
+    stream.write('EN\n')
+
+
+def export_all(parts, folder: str, grade: str = DEFAULT_GRADE, order: str = '') -> tuple:
+    """部材ごとに1ファイルの NC1 を書きます。
+
+    部材は並びから1つずつ取り出してすぐ書くので、ジェネレーターを渡せば全体を保持しません。
+    部材記号は形鋼が 'M1', 'M2', ...、プレートが 'P1', 'P2', ... で、ファイル名にも使います。
+
+    Arguments:
+    parts -- NcPart の並び
+    folder -- 書き出し先のフォルダー
+    grade -- 鋼種
+    order -- 工事番号（注文番号）
+
+    Returns:
+    (書いたファイル数, 寸法を読み取れず書かなかった形鋼名のリスト)
+    """
+    written, skipped = 0, []
+    serial = {'M': 0, 'P': 0}
+    for part in parts:
+        prefix = 'M' if part.geometry is None else 'P'
+        if prefix == 'M':
+            header = member_header(part.name, part.length, part.quantity, grade=grade, order=order)
+            if header is None:
+                skipped.append(part.name)
+                continue
+        else:
+            header = plate_header(part.geometry, part.quantity, grade=grade, order=order)
+        serial[prefix] += 1
+        piece = f'{prefix}{serial[prefix]}'
+        header = header._replace(piece=piece, drawing=piece)
+        with open(os.path.join(folder, f'{piece}.nc1'), 'w', encoding='ascii', newline='\r\n') as f:
+            if part.geometry is None:
+                write_member(header, f, part.name)
+            else:
+                write_plate(header, part.geometry, f, part.name)
+        written += 1
+    return written, skipped
@@ -0,0 +1,177 @@
+"""PlateGeometry（外形と穴）からのプレートの DXF（展開図）書き出し。
+
+Fusion のスケッチの DXF 書き出し（メインスレッドでしか呼べず、1枚ずつで遅い）を使わず、
+外形を閉じたポリライン、穴を円として DXF R12（AC1009）の ASCII を直接書きます。
+エンティティは1つずつストリームへ書くので、全体を文字列にまとめて保持しません。
+
+部品ごとに1ファイル（export_parts、枚数が多いときはプロセスプールで並列に書く）と、
+全部品を1枚に並べたファイル（write_sheet）の2通りに対応します。寸法は mm です。
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .plate_geometry import PlateGeometry
+
+# 画層 (名前, 色番号)
+LAYER_OUTLINE = 'OUTLINE'
+LAYER_HOLES = 'HOLES'
+LAYER_TEXT = 'TEXT'
+LAYERS = ((LAYER_OUTLINE, 7), (LAYER_HOLES, 1), (LAYER_TEXT, 3))
+
+# 部品名の文字の高さ、1枚にまとめるときの行の幅と部品の間隔 (mm)
+TEXT_HEIGHT = 10.0
+SHEET_WIDTH = 3000.0
+GAP = 30.0
+
+# プロセスプールを使うファイル数の下限
+POOL_MIN_PARTS = 1000
+
+# 1枚にまとめたときの部品の位置（外形の外接矩形の左下を (x, y) に置く）
+SheetItem = namedtuple('SheetItem', 'geometry x y')
+
+# ファイル名に使えない文字
+_INVALID_CHARS = '\\/:*?"<>| '
+
+
+def _num(value: float) -> str:
+    return f'{round(value, 4):.10g}'
+
+
+def _text(value: str) -> str:
+    """DXF の文字列。ASCII 以外は \\U+XXXX で書きます（R12 のコードページに依存しないように）。"""
+    return ''.join(c if ord(c) < 128 else f'\\U+{ord(c):04X}' for c in value)
+
+
+def _pairs(stream, *pairs) -> None:
+    stream.write(''.join(f'{code}\n{value}\n' for code, value in pairs))
+
+
+def begin(stream) -> None:
+    """ヘッダー・画層の表と、ENTITIES セクションの始まりを書きます。"""
+    _pairs(stream, (0, 'SECTION'), (2, 'HEADER'), (9, '$ACADVER'), (1, 'AC1009'),
+           (9, '$INSUNITS'), (70, 4), (0, 'ENDSEC'))
+    _pairs(stream, (0, 'SECTION'), (2, 'TABLES'),
+           (0, 'TABLE'), (2, 'LTYPE'), (70, 1),
+           (0, 'LTYPE'), (2, 'CONTINUOUS'), (70, 0), (3, 'Solid line'), (72, 65), (73, 0), (40, 0.0),
+           (0, 'ENDTAB'),
+           (0, 'TABLE'), (2, 'LAYER'), (70, len(LAYERS)))
+    for name, color in LAYERS:
+        _pairs(stream, (0, 'LAYER'), (2, name), (70, 0), (62, color), (6, 'CONTINUOUS'))
+    _pairs(stream, (0, 'ENDTAB'), (0, 'ENDSEC'), (0, 'SECTION'), (2, 'ENTITIES'))
+
+
+def end(stream) -> None:
+    """ENTITIES セクションとファイルを閉じます。"""
+    _pairs(stream, (0, 'ENDSEC'), (0, 'EOF'))
+
+
+def write_plate(stream, geometry: PlateGeometry, x: float = 0.0, y: float = 0.0, label: str = None) -> None:
+    """プレート1枚のエンティティを書きます。外形の外接矩形の左下を (x, y) に置きます。
+
+    Arguments:
+    stream -- 書き込み先（begin のあと）
+    geometry -- PlateGeometry
+    x, y -- 置く位置 (mm)
+    label -- 外形の下に書く部品名（None なら書かない）
+    """
+    x0, y0, _, _ = geometry.bounding_box()
+    dx, dy = x - x0, y - y0
+    _pairs(stream, (0, 'POLYLINE'), (8, LAYER_OUTLINE), (66, 1), (70, 1), (10, 0.0), (20, 0.0), (30, 0.0))
+    for px, py in zip(geometry.outline_x, geometry.outline_y):
+        _pairs(stream, (0, 'VERTEX'), (8, LAYER_OUTLINE), (10, _num(px + dx)), (20, _num(py + dy)), (30, 0.0))
+    _pairs(stream, (0, 'SEQEND'), (8, LAYER_OUTLINE))
+    for hx, hy, d in zip(geometry.hole_x, geometry.hole_y, geometry.hole_d):
+        _pairs(stream, (0, 'CIRCLE'), (8, LAYER_HOLES), (10, _num(hx + dx)), (20, _num(hy + dy)), (30, 0.0),
+               (40, _num(d / 2.0)))
+    if label:
+        _pairs(stream, (0, 'TEXT'), (8, LAYER_TEXT), (10, _num(x)), (20, _num(y - 1.5 * TEXT_HEIGHT)), (30, 0.0),
+               (40, _num(TEXT_HEIGHT)), (1, _text(label)))
+
+
+def label(geometry: PlateGeometry) -> str:
+    """'SPL H300 A6 t9' のような部品名。"""
+    return f'{geometry.name.strip()} t{geometry.thickness:g}'
+
+
+def write_part(geometry: PlateGeometry, stream) -> None:
+    """プレート1枚の DXF を書きます（外接矩形の左下が原点）。"""
+    begin(stream)
+    write_plate(stream, geometry, label=label(geometry))
+    end(stream)
+
+
+def shelf_layout(geometries, width: float = SHEET_WIDTH, gap: float = GAP):
+    """プレートを左から右へ並べ、幅を超えたら上の行へ移る位置（ジェネレーター）。
+
+    行の高さはその行で最も高いプレートに部品名の高さを足したものです。
+    """
+    x = y = row = 0.0
+    for geometry in geometries:
+        w, h = geometry.width, geometry.height
+        if x > 0.0 and x + w > width:
+            x, y, row = 0.0, y + row + gap, 0.0
+        # 部品名は外形の下に書くので、その分だけ上げて置く
+        yield SheetItem(geometry, x, y + 2.0 * TEXT_HEIGHT)
+        x += w + gap
+        row = max(row, h + 2.0 * TEXT_HEIGHT)
+
+
+def write_sheet(geometries, stream, width: float = SHEET_WIDTH, gap: float = GAP) -> int:
+    """全プレートを1枚に並べた DXF を書き、枚数を返します。"""
+    begin(stream)
+    n = 0
+    for item in shelf_layout(geometries, width, gap):
+        write_plate(stream, item.geometry, item.x, item.y, label(item.geometry))
+        n += 1
+    end(stream)
+    return n
+
+
+def file_name(name: str, used: set) -> str:
+    """部品名から重ならないファイル名（'SPL_H300_A6.dxf'）を作り、used に加えます。"""
+    base = ''.join('_' if c in _INVALID_CHARS else c for c in name.strip()) or 'plate'
+    candidate = f'{base}.dxf'
+    i = 2
+    while candidate.lower() in used:
+        candidate = f'{base}_{i}.dxf'
+        i += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _write_files(job) -> list:
+    """ファイルをまとめて書きます（プロセスプールのワーカーで実行するので引数は組み込み型だけ）。"""
+    folder, items = job
+    paths = []
+    for filename, name, outline, holes, thickness in items:
+        path = os.path.join(folder, filename)
+        with open(path, 'w', encoding='ascii', newline='\r\n') as f:
+            write_part(PlateGeometry(outline, holes, thickness=thickness, name=name), f)
+        paths.append(path)
+    return paths
+
+
+def export_parts(geometries, folder: str, workers: int = None) -> list:
+    """プレートごとに1ファイルの DXF を書き、書いたパスを返します。
+
+    Arguments:
+    geometries -- PlateGeometry の並び（name をファイル名にする）
+    folder -- 書き出し先のフォルダー
+    workers -- プロセス数。1 ならプロセスプールを使わない（None は CPU 数）
+    """
+    used = set()
+    items = [(file_name(g.name, used), g.name, tuple(g.outline), tuple(g.holes), g.thickness) for g in geometries]
+    workers = 1 if workers == 1 else (workers or os.cpu_count() or 1)
+    if workers > 1 and len(items) >= POOL_MIN_PARTS:
+        # プロセスごとに連続した範囲を受け持つ
+        size = -(-len(items) // workers)
+        jobs = [(folder, items[i:i + size]) for i in range(0, len(items), size)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                return [path for paths in pool.map(_write_files, jobs) for path in paths]
+        except Exception:
+            # 起動に失敗して例外になったときは順に書く（例外にならずに止まる環境では workers=1 を渡す）
+            pass
+    return _write_files((folder, items))
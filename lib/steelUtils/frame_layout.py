@@ -0,0 +1,142 @@
+"""線材（スケッチ線・エッジ）からの骨組配置の計算。
+
+各線の始点・終点から部材の座標系（材軸 = z）と長さを求め、同じ長さの部材を
+まとめます。配置側は長さごとに形鋼モデルを1回だけ読み込んで長さを合わせ、
+残りの部材は同じコンポーネントのオカレンスとして並べます。
+形鋼モデルは原点から z 方向に押し出されているものとします（形鋼タブの「高さ」と同じ）。
+配置先に選んだ面・エッジからの座標系（plane_frame / axis_frame）も同じ規則で求めます。
+"""
+
+import math
+from collections import namedtuple
+
+# 部材の座標系。origin は始点、z は材軸、y はウェブ（せい）方向、length は材長
+MemberFrame = namedtuple('MemberFrame', 'origin x y z length')
+
+WORLD_UP = (0.0, 0.0, 1.0)
+# 材軸が鉛直に近い（柱）ときに y 方向の基準にする向き
+COLUMN_UP = (0.0, 1.0, 0.0)
+VERTICAL_TOLERANCE = 0.999
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _unit(v):
+    n = math.sqrt(_dot(v, v))
+    return (v[0] / n, v[1] / n, v[2] / n)
+
+
+# 面の法線がこれより鉛直に近いときは x 方向を基準にする（従来の面整列と同じ）
+PLANE_VERTICAL_TOLERANCE = 0.95
+
+
+def axis_frame(origin, direction, up=WORLD_UP, roll: float = 0.0, length: float = 0.0) -> MemberFrame:
+    """材軸の向きから部材の座標系を求めます。向きの長さが 0 なら None。
+
+    Arguments:
+    origin -- 原点 (x, y, z)
+    direction -- 材軸 (z) の向き（正規化は不要）
+    up -- ウェブを向ける方向（既定は鉛直上向き）。材軸と平行なら COLUMN_UP を使う
+    roll -- 材軸まわりの回転角 (deg)。終点側から見て反時計回りが正
+    """
+    n = math.sqrt(_dot(direction, direction))
+    if n <= 1e-9:
+        return None
+    z = (direction[0] / n, direction[1] / n, direction[2] / n)
+    ref = _unit(up)
+    if abs(_dot(z, ref)) >= VERTICAL_TOLERANCE:
+        ref = COLUMN_UP if abs(_dot(z, COLUMN_UP)) < VERTICAL_TOLERANCE else (1.0, 0.0, 0.0)
+    # y は up を材軸に直交化した向き、x = y × z
+    d = _dot(ref, z)
+    y = _unit((ref[0] - d * z[0], ref[1] - d * z[1], ref[2] - d * z[2]))
+    x = _cross(y, z)
+    if roll:
+        c, s = math.cos(math.radians(roll)), math.sin(math.radians(roll))
+        x, y = (tuple(c * p + s * q for p, q in zip(x, y)),
+                tuple(c * q - s * p for p, q in zip(x, y)))
+    return MemberFrame(tuple(origin), x, y, z, length)
+
+
+def member_frame(start, end, up=WORLD_UP, roll: float = 0.0) -> MemberFrame:
+    """始点・終点から部材の座標系を求めます。長さ 0 の線は None。
+
+    Arguments:
+    start, end -- 始点・終点 (x, y, z)
+    up -- ウェブを向ける方向（既定は鉛直上向き）。材軸と平行なら COLUMN_UP を使う
+    roll -- 材軸まわりの回転角 (deg)。終点側から見て反時計回りが正
+    """
+    axis = _sub(end, start)
+    length = math.sqrt(_dot(axis, axis))
+    if length <= 1e-9:
+        return None
+    return axis_frame(start, axis, up, roll, length)
+
+
+def plane_frame(origin, normal) -> MemberFrame:
+    """平面の法線を材軸にした座標系。法線が鉛直に近いときは x 方向を y の基準にします。"""
+    n = _unit(normal)
+    up = WORLD_UP if abs(_dot(n, WORLD_UP)) <= PLANE_VERTICAL_TOLERANCE else (1.0, 0.0, 0.0)
+    return axis_frame(origin, n, up)
+
+
+def frame_at(frame: MemberFrame, point, on_axis: bool = False) -> MemberFrame:
+    """向きはそのままで原点を point に移した座標系。
+
+    on_axis が True なら point を材軸（frame.origin を通る z 方向の直線）へ投影した点を原点にします
+    （円筒面や直線エッジ上のクリック位置から軸上の原点を求める場合）。
+    """
+    if on_axis:
+        t = _dot(_sub(point, frame.origin), frame.z)
+        point = tuple(o + t * z for o, z in zip(frame.origin, frame.z))
+    return frame._replace(origin=tuple(point))
+
+
+def reversed_frame(frame: MemberFrame) -> MemberFrame:
+    """材軸を反転した座標系（y はそのまま、右手系を保つため x も反転）。"""
+    return frame._replace(x=tuple(-v for v in frame.x), z=tuple(-v for v in frame.z))
+
+
+def length_key(length: float, ndigits: int = 3) -> float:
+    """同じ長さとみなすためのキー（既定は 0.001 単位で丸める）。"""
+    return round(length, ndigits)
+
+
+def group_members(lines, up=WORLD_UP, ndigits: int = 3) -> dict:
+    """線の一覧を長さごとにまとめます。
+
+    Arguments:
+    lines -- [(始点, 終点), ...]
+    ndigits -- 長さを丸める桁数（cm なら 3 で 0.01mm）
+
+    Returns:
+    {丸めた長さ: [MemberFrame, ...]}（最初に現れた順）。長さ 0 の線は除きます。
+    """
+    groups = {}
+    for start, end in lines:
+        frame = member_frame(start, end, up)
+        if frame is None:
+            continue
+        groups.setdefault(length_key(frame.length, ndigits), []).append(frame)
+    return groups
+
+
+def summarize(groups: dict, scale: float = 10.0) -> str:
+    """'12本 / 3種類の長さ (3000, 4500, 6000mm)' のような要約。scale は長さを mm にする係数。"""
+    count = sum(len(frames) for frames in groups.values())
+    if not count:
+        return '線が選択されていません'
+    lengths = sorted(groups)
+    shown = ', '.join(f'{v * scale:g}' for v in lengths[:6])
+    if len(lengths) > 6:
+        shown += ', ...'
+    return f'{count}本 / {len(lengths)}種類の長さ ({shown}mm)'
@@ -0,0 +1,256 @@
+"""ブレース接合部のガセットプレート自動選定。
+
+取付部材（梁・柱）とブレースの軸方向から接合角度を求め、設計応力に必要な
+高力ボルト本数とボルト列をブレース軸に沿って並べます。最終列でのホイットモア
+有効幅（ボルト群の先頭から 30° で広がる幅）から必要板厚を求め、穴とホイットモア
+断面がすべて収まる最小のガセットを選びます。
+
+候補は GUSSET_SPECS の系列と、辺長を 10mm 刻みで振った三角形・角切りの生成形状です。
+候補は面積順に1度だけ並べておき、必要な外接寸法から二分探索で探し始めるので、
+候補数が数千あっても対話的に使えます。結果は角度と応力の組ごとにメモ化されます。
+
+座標は gusset_specs と同じく、取付部材の面を x 軸、直角の頂点（作業点）を原点とし、
+ブレースは x 軸から角度 θ の方向に伸びるものとします。
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from functools import lru_cache
+
+from .plate_geometry import PlateGeometry
+from . import gusset_specs, hole_validator
+from .bolt_capacity import SLIP_CAPACITY_LONG, TERM_FACTOR
+
+WHITMORE_ANGLE = 30.0          # ホイットモアの広がり角 (deg)
+MIN_ANGLE = 10.0               # 扱う接合角度の範囲 (deg)
+MAX_ANGLE = 80.0
+SINGLE_LINE_MAX_BOLTS = 4      # これを超えたら2列にする
+THICKNESSES = (9.0, 12.0, 16.0, 19.0, 22.0, 25.0, 28.0, 32.0)
+GENERATED_LEGS = tuple(float(v) for v in range(100, 610, 10))
+CORNER_CUT_RATIO = 0.2         # 生成する角切り形状の角切り長さ / 短辺
+
+GussetSizing = namedtuple('GussetSizing', [
+    'name',              # 系列名または生成形状の名前
+    'spec',              # GussetSpec（板厚・ボルト・列数を反映済み）
+    'geometry',          # 外形＋ブレース軸に沿ったボルト穴の PlateGeometry
+    'angle',             # 接合角度 (deg)
+    'bolts',             # ボルト本数
+    'lines',             # ボルト列の数
+    'per_line',          # 1列あたりの本数
+    'whitmore_width',    # ホイットモア有効幅 (mm)
+    'required_thickness',
+])
+
+
+# ============================================================================
+# 部材の向き
+# ============================================================================
+
+def _unit(v):
+    n = math.sqrt(sum(c * c for c in v))
+    if n <= 1e-12:
+        raise ValueError('方向ベクトルの長さが 0 です')
+    return tuple(c / n for c in v)
+
+
+def _dot(a, b):
+    return sum(p * q for p, q in zip(a, b))
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def connection_angle(main_dir, brace_dir) -> float:
+    """取付部材とブレースの軸方向 (x, y, z) のなす鋭角 (deg) を返します。"""
+    c = abs(_dot(_unit(main_dir), _unit(brace_dir)))
+    return math.degrees(math.acos(min(1.0, c)))
+
+
+def connection_frame(main_point, main_dir, brace_point, brace_dir) -> tuple:
+    """ガセットを置く座標系を求めます。
+
+    Arguments:
+    main_point, main_dir -- 取付部材の軸上の点と軸方向
+    brace_point, brace_dir -- ブレースの軸上の点（部材の中心など）と軸方向
+
+    Returns:
+    (原点, x 軸, y 軸, z 軸, 接合角度 deg)。原点は2軸の最接近点のうち取付部材側の点で、
+    x 軸は取付部材の軸、y 軸はブレースのある側、z 軸は板厚方向です。
+    """
+    d1, d2 = _unit(main_dir), _unit(brace_dir)
+    n = _cross(d1, d2)
+    if math.sqrt(_dot(n, n)) <= 1e-9:
+        raise ValueError('取付部材とブレースが平行です')
+    # 2直線の最接近点（取付部材側）
+    w = tuple(p - q for p, q in zip(main_point, brace_point))
+    b = _dot(d1, d2)
+    t = (b * _dot(d2, w) - _dot(d1, w)) / (1.0 - b * b)
+    origin = tuple(p + t * d for p, d in zip(main_point, d1))
+    # ブレースは原点から部材中心へ向かう向きにする
+    if _dot(d2, tuple(p - o for p, o in zip(brace_point, origin))) < 0.0:
+        d2 = tuple(-c for c in d2)
+    # x 軸はブレースと鋭角をなす向きにする
+    if _dot(d1, d2) < 0.0:
+        d1 = tuple(-c for c in d1)
+    y = _unit(tuple(q - _dot(d1, d2) * p for p, q in zip(d1, d2)))
+    z = _cross(d1, y)
+    return origin, d1, y, z, math.degrees(math.atan2(_dot(d2, y), _dot(d2, d1)))
+
+
+# ============================================================================
+# ボルト配置
+# ============================================================================
+
+def required_bolts(force_kn: float, bolt: str, shear_planes: int = 1, term: str = 'long') -> int:
+    """設計応力に必要な高力ボルト (F10T) の本数（2本以上）。"""
+    rs = SLIP_CAPACITY_LONG[bolt] * shear_planes * TERM_FACTOR[term]
+    return max(2, math.ceil(force_kn / rs - 1e-9))
+
+
+def bolt_layout(angle: float, bolts: int, bolt: str) -> tuple:
+    """ブレース軸に沿ったボルト穴とホイットモア断面を求めます。
+
+    Returns:
+    (穴 [(x, y), ...], 列数, 1列の本数, ホイットモア幅, ホイットモア断面の両端 ((x, y), (x, y)))
+    """
+    lines = 1 if bolts <= SINGLE_LINE_MAX_BOLTS else 2
+    per_line = max(2, math.ceil(bolts / lines))
+    p = gusset_specs.bolt_pitch(bolt)
+    e = gusset_specs.bolt_edge(bolt)
+    th = math.radians(angle)
+    c, s = math.cos(th), math.sin(th)
+    offsets = [(k - (lines - 1) / 2.0) * p for k in range(lines)]
+
+    # 先頭の穴が両方の取付面から縁端距離 e 以上離れる位置（5mm 単位）
+    s0 = max(max((e + o * s) / c, (e - o * c) / s) for o in offsets)
+    s0 = math.ceil(s0 / 5.0) * 5.0
+
+    holes = [(round(si * c - o * s, 3), round(si * s + o * c, 3))
+             for o in offsets for si in (s0 + i * p for i in range(per_line))]
+
+    sw = s0 + (per_line - 1) * p
+    half = ((lines - 1) * p + 2.0 * (per_line - 1) * p * math.tan(math.radians(WHITMORE_ANGLE))) / 2.0
+    ends = ((sw * c + half * s, sw * s - half * c), (sw * c - half * s, sw * s + half * c))
+    return holes, lines, per_line, 2.0 * half, ends
+
+
+def required_thickness(force_kn: float, whitmore_width: float, hole_dia: float, lines: int,
+                       steel_f: float = 235.0, term: str = 'long') -> float:
+    """ホイットモア断面（穴控除後）の引張から必要板厚 (mm) を返します。"""
+    net = whitmore_width - lines * hole_dia
+    if net <= 0.0:
+        return math.inf
+    return force_kn * 1000.0 / (net * steel_f / 1.5 * TERM_FACTOR[term])
+
+
+def _pick_thickness(required: float):
+    for t in THICKNESSES:
+        if t >= required - 1e-9:
+            return t
+    return None
+
+
+# ============================================================================
+# 候補の索引
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def _candidates() -> tuple:
+    """(面積, 幅 a, 高さ b) の配列と (名前, GussetSpec, 系列かどうか) を面積順に返します。"""
+    items = []
+    for name, spec in gusset_specs.GUSSET_SPECS.items():
+        outline = gusset_specs.gusset_outline(spec.shape, spec.a, spec.b, spec.cut)
+        items.append((PlateGeometry(outline).gross_area(), 0, name, spec))
+    for a in GENERATED_LEGS:
+        for b in GENERATED_LEGS:
+            for shape in ('triangle', 'corner_cut'):
+                cut = round(CORNER_CUT_RATIO * min(a, b) / 5.0) * 5.0 if shape == 'corner_cut' else 0.0
+                spec = gusset_specs.GussetSpec(shape, a, b, 0.0, cut, '', 0)
+                outline = gusset_specs.gusset_outline(shape, a, b, cut)
+                label = ' 角切り' if shape == 'corner_cut' else ''
+                items.append((PlateGeometry(outline).gross_area(), 1, f'ガセット {a:g}×{b:g}{label}', spec))
+    items.sort(key=lambda it: (it[0], it[1], it[2]))
+    areas = array('d', (it[0] for it in items))
+    widths = array('d', (it[3].a for it in items))
+    heights = array('d', (it[3].b for it in items))
+    entries = tuple((it[2], it[3], it[1] == 0) for it in items)
+    return areas, widths, heights, entries
+
+
+def _fits(spec, holes, hole_dia, ends) -> bool:
+    outline = gusset_specs.gusset_outline(spec.shape, spec.a, spec.b, spec.cut)
+    g = PlateGeometry(outline, holes, hole_dia)
+    if not all(g.contains(x, y) for x, y in ends):
+        return False
+    return not any(v.kind in ('edge', 'outside') for v in hole_validator.validate_geometry(g))
+
+
+@lru_cache(maxsize=1024)
+def _size(angle: float, force_kn: float, bolt: str, shear_planes: int, steel_f: float, term: str):
+    bolts = required_bolts(force_kn, bolt, shear_planes, term)
+    holes, lines, per_line, width, ends = bolt_layout(angle, bolts, bolt)
+    bolts = lines * per_line
+    hole_dia = gusset_specs.bolt_hole_diameter(bolt)
+    t_req = required_thickness(force_kn, width, hole_dia, lines, steel_f, term)
+    t = _pick_thickness(t_req)
+    if t is None:
+        return None
+
+    # 外接寸法の下限と、面積の下限（どの形状も外接矩形の半分以上）
+    e = hole_validator.min_edge_distance(hole_dia)
+    need_x = max(max(x for x, _ in holes) + e, max(x for x, _ in ends))
+    need_y = max(max(y for _, y in holes) + e, max(y for _, y in ends))
+    areas, widths, heights, entries = _candidates()
+    for i in range(bisect_left(areas, need_x * need_y / 2.0), len(areas)):
+        if widths[i] < need_x or heights[i] < need_y:
+            continue
+        name, spec, from_table = entries[i]
+        if from_table and spec.thickness < t:
+            continue
+        if not _fits(spec, holes, hole_dia, ends):
+            continue
+        spec = spec._replace(thickness=spec.thickness if from_table else t, bolt=bolt, lines=lines)
+        return name, spec, tuple(holes), hole_dia, bolts, lines, per_line, width, t_req
+    return None
+
+
+def size_gusset(angle: float, force_kn: float, bolt: str = 'M20', shear_planes: int = 1,
+                steel_f: float = 235.0, term: str = 'long'):
+    """接合角度と設計応力から最小のガセットを選びます。
+
+    Arguments:
+    angle -- 取付部材とブレースのなす角 (deg)
+    force_kn -- ブレースの設計応力 (kN)
+    bolt -- ボルト呼び
+    shear_planes -- 摩擦面の数（ガセットの片側にブレースを添えるなら 1）
+
+    Returns:
+    GussetSizing。角度が範囲外、または収まる候補がなければ None。
+    """
+    if not MIN_ANGLE <= angle <= MAX_ANGLE or force_kn <= 0.0:
+        return None
+    found = _size(round(float(angle), 1), round(float(force_kn), 1), bolt, int(shear_planes),
+                  float(steel_f), term)
+    if found is None:
+        return None
+    name, spec, holes, hole_dia, bolts, lines, per_line, width, t_req = found
+    outline = gusset_specs.gusset_outline(spec.shape, spec.a, spec.b, spec.cut)
+    geometry = PlateGeometry(outline, holes, hole_dia, spec.thickness, name)
+    return GussetSizing(name, spec, geometry, round(float(angle), 1), bolts, lines, per_line, width, t_req)
+
+
+def describe(result: GussetSizing) -> str:
+    """選定結果を表示用の文字列にします。"""
+    s = result.spec
+    return (f'{result.name} t{s.thickness:g}  角度 {result.angle:.1f}°  '
+            f'{s.bolt}×{result.bolts}本 ({result.lines}列×{result.per_line})  '
+            f'ホイットモア幅 {result.whitmore_width:.0f}mm  必要板厚 {result.required_thickness:.1f}mm')
+
+
+def clear_cache() -> None:
+    """メモ化した結果と候補の索引を破棄します。"""
+    _size.cache_clear()
+    _candidates.cache_clear()
@@ -0,0 +1,151 @@
+"""ガセットプレートのパラメトリック仕様表と形状生成。
+
+README のガセット系列（取付5G1、取付7G52 など）を、形状・寸法・板厚・ボルトの
+短い仕様で表し、外形とボルト穴を PlateGeometry として生成します。
+ファイルを用意しなくても、仕様表に1行足すだけで系列を増やせます。
+
+形状（直角をはさむ2辺を x 軸・y 軸に置き、直角の頂点を原点とする）
+  triangle   -- 直角三角形（a × b）
+  corner_cut -- 三角形の2つの鋭角を cut の長さで切り落とした五角形
+  rectangle  -- 矩形（a × b）
+
+ボルト穴は x 軸側の辺に平行な列として並べ、縁端距離を満たす位置だけを残します。
+形状は仕様ごとにメモ化されます。
+"""
+
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+from .plate_geometry import PlateGeometry
+from . import hole_validator
+
+GussetSpec = namedtuple('GussetSpec', [
+    'shape',      # 'triangle' / 'corner_cut' / 'rectangle'
+    'a',          # x 方向の辺の長さ (mm)
+    'b',          # y 方向の辺の長さ (mm)
+    'thickness',  # 板厚 (mm)
+    'cut',        # 角切りの長さ (mm)。corner_cut 以外は 0
+    'bolt',       # ボルト呼び ('M16' など)
+    'lines',      # ボルト列の数（'DG' 系は 2 列）
+])
+
+SHAPES = ('triangle', 'corner_cut', 'rectangle')
+
+# README のガセット系列
+GUSSET_SPECS = {
+    '取付5G1':    GussetSpec('triangle',   110.0, 110.0,  9.0,  0.0, 'M16', 1),
+    '取付7G52':   GussetSpec('corner_cut', 110.0, 110.0,  9.0, 25.0, 'M16', 1),
+    '取付9DG3':   GussetSpec('triangle',   140.0, 140.0,  9.0,  0.0, 'M16', 2),
+    '取付10G4':   GussetSpec('corner_cut', 140.0, 140.0,  9.0, 30.0, 'M16', 1),
+    '取付17G5':   GussetSpec('triangle',   140.0, 140.0,  9.0,  0.0, 'M16', 1),
+    '取付15G8':   GussetSpec('triangle',   170.0, 170.0,  9.0,  0.0, 'M20', 1),
+    '取付7G57':   GussetSpec('corner_cut', 170.0, 170.0,  9.0, 35.0, 'M20', 1),
+    '取付20G8':   GussetSpec('triangle',   170.0, 170.0, 12.0,  0.0, 'M20', 1),
+    '取付15DG10': GussetSpec('triangle',   170.0, 170.0,  9.0,  0.0, 'M20', 2),
+}
+
+_SHAPE_LABELS = {'triangle': '三角形', 'corner_cut': '角切り', 'rectangle': '矩形'}
+
+
+def bolt_hole_diameter(bolt: str) -> float:
+    """ボルト呼びから穴径を返します（M27 以上は +3mm、それ未満は +2mm）。"""
+    d = float(bolt.lstrip('Mm'))
+    return d + (3.0 if d >= 27.0 else 2.0)
+
+
+def bolt_pitch(bolt: str) -> float:
+    """ガセットのボルトピッチ（軸径の 2.5 倍を 5mm 単位に切り上げ）。"""
+    d = float(bolt.lstrip('Mm'))
+    return math.ceil(hole_validator.PITCH_FACTOR * d / 5.0) * 5.0
+
+
+def bolt_edge(bolt: str) -> float:
+    """最初の穴の位置（最小縁端距離を 5mm 単位に切り上げて 5mm の余裕を足す）。"""
+    limit = hole_validator.min_edge_distance(bolt_hole_diameter(bolt))
+    return math.ceil(limit / 5.0) * 5.0 + 5.0
+
+
+def gusset_outline(shape: str, a: float, b: float, cut: float = 0.0) -> list:
+    """形状の外形頂点 [(x, y), ...] を返します。"""
+    if shape == 'triangle':
+        return [(0.0, 0.0), (a, 0.0), (0.0, b)]
+    if shape == 'corner_cut':
+        if not 0.0 < cut < min(a, b):
+            raise ValueError(f'角切りの長さが不正です: {cut}')
+        return [(0.0, 0.0), (a, 0.0), (a, cut), (cut, b), (0.0, b)]
+    if shape == 'rectangle':
+        return [(0.0, 0.0), (a, 0.0), (a, b), (0.0, b)]
+    raise ValueError(f'未対応のガセット形状です: {shape}')
+
+
+@lru_cache(maxsize=None)
+def _generate(spec: GussetSpec) -> tuple:
+    outline = gusset_outline(spec.shape, spec.a, spec.b, spec.cut)
+    hole = bolt_hole_diameter(spec.bolt)
+    e = bolt_edge(spec.bolt)
+    p = bolt_pitch(spec.bolt)
+
+    # 外形の外接矩形いっぱいに候補の穴を並べ、縁端距離を満たさない穴を落とす
+    ys = [e + j * p for j in range(spec.lines) if e + j * p < spec.b]
+    xs = [e + i * p for i in range(int((spec.a - e) // p) + 1)]
+    candidates = [(x, y) for y in ys for x in xs]
+    geometry = PlateGeometry(outline, candidates, hole, spec.thickness)
+    rejected = set()
+    for v in hole_validator.validate_geometry(geometry):
+        if v.kind in ('edge', 'outside'):
+            rejected.update(v.holes)
+    holes = tuple(h for i, h in enumerate(candidates) if i not in rejected)
+    return tuple(outline), holes, hole
+
+
+def make_spec(a: float, b: float, thickness: float, bolt: str = 'M16', lines: int = 1,
+              shape: str = 'triangle', cut: float = 0.0) -> GussetSpec:
+    """仕様表にない寸法の GussetSpec を作ります。"""
+    if shape not in SHAPES:
+        raise ValueError(f'未対応のガセット形状です: {shape}')
+    return GussetSpec(shape, float(a), float(b), float(thickness), float(cut), bolt, int(lines))
+
+
+def get_spec(name: str):
+    """系列名から GussetSpec を返します。見つからなければ None。"""
+    return GUSSET_SPECS.get(name)
+
+
+def gusset_geometry(spec, name: str = '', thickness: float = None) -> PlateGeometry:
+    """GussetSpec（または系列名）から PlateGeometry を作ります。
+
+    Arguments:
+    spec -- GussetSpec または GUSSET_SPECS の系列名
+    name -- PlateGeometry の名前（省略時は系列名）
+    thickness -- 指定すると仕様の板厚を上書き (mm)
+    """
+    if isinstance(spec, str):
+        name = name or spec
+        spec = GUSSET_SPECS[spec]
+    if thickness is not None and float(thickness) != spec.thickness:
+        spec = spec._replace(thickness=float(thickness))
+    outline, holes, hole = _generate(spec)
+    return PlateGeometry(outline, holes, hole, spec.thickness, name)
+
+
+def gusset_plate_data(spec) -> dict:
+    """SPLICE_PLATE_TYPES と同じ形式（'outline' 付き）の辞書を返します。プレビュー用。"""
+    g = gusset_geometry(spec)
+    data = g.to_plate_data()
+    data['bolt'] = (GUSSET_SPECS[spec] if isinstance(spec, str) else spec).bolt
+    return data
+
+
+def describe(spec) -> str:
+    """'三角形 140×140×9 M16×3本' のような説明文を返します。"""
+    if isinstance(spec, str):
+        spec = GUSSET_SPECS[spec]
+    _, holes, _ = _generate(spec)
+    return (f'{_SHAPE_LABELS[spec.shape]} {spec.a:g}×{spec.b:g}×{spec.thickness:g} '
+            f'{spec.bolt}×{len(holes)}本')
+
+
+def clear_cache() -> None:
+    """メモ化した形状を破棄します。"""
+    _generate.cache_clear()
@@ -0,0 +1,107 @@
+"""ボルト穴配置の検査（縁端距離・ピッチ・穴の重なり・外形外の穴）。
+
+穴同士の距離は一様グリッドで近傍の穴だけを比べるので、ベースプレートのように
+数百個の穴があっても O(n) 程度で済みます。最小縁端距離は日本建築学会の
+鋼構造設計規準の値、最小ピッチはボルト軸径の 2.5 倍です。
+"""
+
+from collections import namedtuple
+
+from .plate_geometry import PlateGeometry
+
+# ボルト軸径 (mm) -> 最小縁端距離 (mm)
+#   rolled : 圧延縁・自動ガス切断縁・のこ引き縁・機械仕上げ縁
+#   sheared: せん断縁・手動ガス切断縁
+MIN_EDGE_DISTANCE = {
+    12: {'rolled': 16.0, 'sheared': 22.0},
+    16: {'rolled': 22.0, 'sheared': 28.0},
+    20: {'rolled': 26.0, 'sheared': 34.0},
+    22: {'rolled': 28.0, 'sheared': 38.0},
+    24: {'rolled': 32.0, 'sheared': 44.0},
+    27: {'rolled': 36.0, 'sheared': 49.0},
+    30: {'rolled': 40.0, 'sheared': 54.0},
+}
+
+PITCH_FACTOR = 2.5
+
+# kind: 'edge'（縁端距離不足）/ 'pitch'（ピッチ不足）/ 'overlap'（穴の重なり）/ 'outside'（外形外）
+Violation = namedtuple('Violation', 'kind holes value limit')
+
+_KIND_LABELS = {'edge': '縁端距離不足', 'pitch': 'ピッチ不足', 'overlap': '穴の重なり', 'outside': '外形外の穴'}
+
+
+def bolt_diameter(hole_dia: float) -> float:
+    """穴径からボルト軸径を推定します（M27 以上は +3mm、それ未満は +2mm）。"""
+    return hole_dia - (3.0 if hole_dia >= 30.0 else 2.0)
+
+
+def min_edge_distance(hole_dia: float, edge_type: str = 'rolled') -> float:
+    """穴径に対する最小縁端距離。表にない径は表の直近上位、範囲外は軸径×1.33 とします。"""
+    d = bolt_diameter(hole_dia)
+    for size in sorted(MIN_EDGE_DISTANCE):
+        if d <= size + 1e-9:
+            return MIN_EDGE_DISTANCE[size][edge_type]
+    return round(d * (1.33 if edge_type == 'rolled' else 1.8), 1)
+
+
+def validate_geometry(geometry: PlateGeometry, edge_type: str = 'rolled',
+                      pitch_factor: float = PITCH_FACTOR) -> list:
+    """1枚の板の穴配置を検査し、Violation のリストを返します（問題がなければ空）。"""
+    violations = []
+    n = geometry.hole_count
+    if n == 0:
+        return violations
+
+    # 縁端距離と外形外
+    rect = geometry.is_rectangle()
+    if rect:
+        x0, y0, x1, y1 = geometry.bounding_box()
+    for i, (e, x, y, d) in enumerate(zip(geometry.edge_distances(), geometry.hole_x, geometry.hole_y,
+                                         geometry.hole_d)):
+        inside = (x0 < x < x1 and y0 < y < y1) if rect else geometry.contains(x, y)
+        if not inside or e < d / 2.0:
+            violations.append(Violation('outside', (i,), e, d / 2.0))
+            continue
+        limit = min_edge_distance(d, edge_type)
+        if e < limit - 1e-6:
+            violations.append(Violation('edge', (i,), e, limit))
+
+    # ピッチと重なり（グリッド近傍のみ比較）
+    if n > 1:
+        hd = geometry.hole_d
+        search = pitch_factor * bolt_diameter(max(hd))
+        for i, j, dist in geometry.hole_pairs_within(search):
+            if dist < (hd[i] + hd[j]) / 2.0:
+                violations.append(Violation('overlap', (i, j), dist, (hd[i] + hd[j]) / 2.0))
+                continue
+            limit = pitch_factor * bolt_diameter(max(hd[i], hd[j]))
+            if dist < limit - 1e-6:
+                violations.append(Violation('pitch', (i, j), dist, limit))
+    return violations
+
+
+def validate_plate(plate_data: dict, **kwargs) -> list:
+    """SPLICE_PLATE_TYPES 形式の辞書を検査します。"""
+    return validate_geometry(PlateGeometry.from_plate_data(plate_data), **kwargs)
+
+
+def validate_table(plate_types: dict, **kwargs) -> dict:
+    """プレート表全体を検査し、問題のあるプレートだけを {名前: [Violation, ...]} で返します。"""
+    report = {}
+    for name, data in plate_types.items():
+        violations = validate_plate(data, **kwargs)
+        if violations:
+            report[name] = violations
+    return report
+
+
+def summarize(violations: list) -> str:
+    """'縁端距離不足 8箇所 (最小 18.0 < 22.0mm)' のような要約文字列を返します。"""
+    parts = []
+    for kind in ('outside', 'overlap', 'edge', 'pitch'):
+        items = [v for v in violations if v.kind == kind]
+        if not items:
+            continue
+        worst = min(items, key=lambda v: v.value - v.limit)
+        parts.append(f'{_KIND_LABELS[kind]} {len(items)}箇所 (最小 {worst.value:.1f} < {worst.limit:.1f}mm)')
+    return ' / '.join(parts)
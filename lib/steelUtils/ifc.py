@@ -0,0 +1,317 @@
+"""配置した形鋼・プレートの IFC（STEP 物理ファイル, IFC4）書き出し。
+
+BRep を三角形に分割せず、形鋼は形鋼名の寸法からのパラメトリックな断面
+（IfcIShapeProfileDef など）の押し出し、プレートは外形と穴（IfcArbitraryProfileDefWithVoids）の
+押し出しとして書きます。配置はオカレンスの変換行列から作る IfcLocalPlacement です。
+
+IfcWriter はエンティティを1行ずつストリームへ書き、保持するのは形鋼・プレートの種類ごとの
+断面の番号と、まだ書いていない空間構造への所属（RELATION_CHUNK 件ずつ書き出す）だけなので、
+部材の数によらずメモリは一定です。材軸が鉛直の部材は IfcColumn、それ以外は IfcBeam にします。
+"""
+
+import math
+import time
+import uuid
+
+from .frame_layout import VERTICAL_TOLERANCE, WORLD_UP
+from .section_names import parse_section_name
+from .section_properties import h_fillet_radius
+
+# IfcRelContainedInSpatialStructure 1件にまとめる部材の数
+RELATION_CHUNK = 1000
+
+# 書き出すアプリケーション名
+APPLICATION = 'ACME SteelHelper'
+
+# IFC の GlobalId（22文字）に使う64進数の文字
+_GUID_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_$'
+
+
+def new_guid() -> str:
+    """IFC の GlobalId（UUID を 22 文字の64進数にしたもの）。"""
+    n = uuid.uuid4().int
+    chars = []
+    for _ in range(22):
+        chars.append(_GUID_CHARS[n % 64])
+        n //= 64
+    return ''.join(reversed(chars))
+
+
+def _real(value: float) -> str:
+    """STEP の実数（'300.'、'6.5' の形。指数表記は使わない）。"""
+    text = f'{value:.6f}'.rstrip('0')
+    return '0.' if text in ('-0.', '0.') else text
+
+
+def _string(value: str) -> str:
+    """STEP の文字列。ASCII 以外は \\X2\\...\\X0\\（UTF-16 の16進）で書きます。"""
+    if value is None:
+        return '$'
+    out = []
+    for c in value:
+        if c == "'":
+            out.append("''")
+        elif c == '\\':
+            out.append('\\\\')
+        elif 32 <= ord(c) < 127:
+            out.append(c)
+        else:
+            units = c.encode('utf-16-be')
+            out.append('\\X2\\' + units.hex().upper() + '\\X0\\')
+    return "'" + ''.join(out) + "'"
+
+
+def _unit(v) -> tuple:
+    n = math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+    return (v[0] / n, v[1] / n, v[2] / n) if n > 0.0 else (0.0, 0.0, 1.0)
+
+
+def _hat_outline(h, a, b, t) -> list:
+    """ハット形鋼の外形（角は直角, A は頭部の幅, B はつばの幅）。"""
+    w = a + 2.0 * b
+    return [(0.0, 0.0), (b + t, 0.0), (b + t, h - t), (b + a - t, h - t), (b + a - t, 0.0), (w, 0.0),
+            (w, t), (b + a, t), (b + a, h), (b, h), (b, t), (0.0, t)]
+
+
+def _lipped_z_outline(h, a, c, t) -> list:
+    """リップZ形鋼の外形（角は直角）。"""
+    return [(t - a, 0.0), (t, 0.0), (t, h - t), (a - t, h - t), (a - t, h - c), (a, h - c), (a, h),
+            (0.0, h), (0.0, t), (2.0 * t - a, t), (2.0 * t - a, c), (t - a, c)]
+
+
+def _centered(points) -> list:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    cx, cy = (min(xs) + max(xs)) / 2.0, (min(ys) + max(ys)) / 2.0
+    return [(x - cx, y - cy) for x, y in points]
+
+
+def _axis_z(matrix) -> tuple:
+    return (matrix[2], matrix[6], matrix[10])
+
+
+def axis_scale(matrix) -> float:
+    """変換行列の材軸 (z) 方向のスケール（材長をオカレンスのスケールで変えた形鋼の倍率）。"""
+    z = _axis_z(matrix)
+    return math.sqrt(z[0] * z[0] + z[1] * z[1] + z[2] * z[2]) or 1.0
+
+
+def element_kind(z_axis) -> str:
+    """材軸の向きから IFC の要素（'IFCCOLUMN' / 'IFCBEAM'）。"""
+    z = _unit(z_axis)
+    dot = z[0] * WORLD_UP[0] + z[1] * WORLD_UP[1] + z[2] * WORLD_UP[2]
+    return 'IFCCOLUMN' if abs(dot) >= VERTICAL_TOLERANCE else 'IFCBEAM'
+
+
+class IfcWriter:
+    """IFC4 の STEP ファイルをストリームへ書きます。
+
+    writer = IfcWriter(stream, 'プロジェクト名')
+    writer.begin()
+    writer.add_member('H-300×150×6.5×9', 6000.0, matrix)   # 材軸の始端の断面中心が原点、z が材軸
+    writer.add_plate(geometry, matrix)                       # 外形の面が xy、板厚は +z
+    writer.end()
+
+    matrix は Matrix3D.asArray() と同じ行優先の 16 要素（モデル単位）で、unit は 1 モデル単位あたりの mm です。
+    """
+
+    def __init__(self, stream, project: str = '', unit: float = 10.0, file_name: str = ''):
+        self.stream = stream
+        self.project = project
+        self.unit = unit
+        self.file_name = file_name
+        self.next_id = 1
+        self.members = 0
+        self.plates = 0
+        self.skipped = []
+        self._profiles = {}
+        self._pending = []
+
+    def _add(self, text: str) -> int:
+        i = self.next_id
+        self.next_id += 1
+        self.stream.write(f'#{i}={text};\n')
+        return i
+
+    def _point(self, *coords) -> int:
+        return self._add(f'IFCCARTESIANPOINT(({",".join(_real(v) for v in coords)}))')
+
+    def _direction(self, v) -> int:
+        return self._add(f'IFCDIRECTION(({",".join(_real(c) for c in v)}))')
+
+    # ------------------------------------------------------------------
+    # ファイルの始まりと終わり
+    # ------------------------------------------------------------------
+
+    def begin(self) -> None:
+        """ヘッダーと、プロジェクト・単位・表現コンテキスト・敷地・建物・階を書きます。"""
+        stamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.stream.write('ISO-10303-21;\nHEADER;\n'
+                          "FILE_DESCRIPTION(('ViewDefinition [ReferenceView_V1.2]'),'2;1');\n"
+                          f"FILE_NAME({_string(self.file_name)},'{stamp}',(''),(''),"
+                          f"{_string(APPLICATION)},{_string(APPLICATION)},'');\n"
+                          "FILE_SCHEMA(('IFC4'));\nENDSEC;\nDATA;\n")
+        origin = self._point(0.0, 0.0, 0.0)
+        self._z = self._direction((0.0, 0.0, 1.0))
+        self._identity = self._add(f'IFCAXIS2PLACEMENT3D(#{origin},$,$)')
+        model = self._add(f"IFCGEOMETRICREPRESENTATIONCONTEXT($,'Model',3,1.E-05,#{self._identity},$)")
+        self._context = self._add(f"IFCGEOMETRICREPRESENTATIONSUBCONTEXT('Body','Model',*,*,*,*,#{model},$,"
+                                  '.MODEL_VIEW.,$)')
+        length = self._add('IFCSIUNIT(*,.LENGTHUNIT.,.MILLI.,.METRE.)')
+        angle = self._add('IFCSIUNIT(*,.PLANEANGLEUNIT.,$,.RADIAN.)')
+        units = self._add(f'IFCUNITASSIGNMENT((#{length},#{angle}))')
+        project = self._add(f"IFCPROJECT('{new_guid()}',$,{_string(self.project)},$,$,$,$,(#{model}),#{units})")
+
+        site_placement = self._add(f'IFCLOCALPLACEMENT($,#{self._identity})')
+        site = self._add(f"IFCSITE('{new_guid()}',$,'Site',$,$,#{site_placement},$,$,.ELEMENT.,$,$,$,$,$)")
+        building_placement = self._add(f'IFCLOCALPLACEMENT(#{site_placement},#{self._identity})')
+        building = self._add(f"IFCBUILDING('{new_guid()}',$,'Building',$,$,#{building_placement},$,$,"
+                             '.ELEMENT.,$,$,$)')
+        self._storey_placement = self._add(f'IFCLOCALPLACEMENT(#{building_placement},#{self._identity})')
+        self._storey = self._add(f"IFCBUILDINGSTOREY('{new_guid()}',$,'Steel',$,$,#{self._storey_placement},"
+                                 '$,$,.ELEMENT.,0.)')
+        for parent, child in ((project, site), (site, building), (building, self._storey)):
+            self._add(f"IFCRELAGGREGATES('{new_guid()}',$,$,$,#{parent},(#{child}))")
+
+    def end(self) -> None:
+        """残りの空間構造への所属を書き、ファイルを閉じます。"""
+        self._flush()
+        self.stream.write('ENDSEC;\nEND-ISO-10303-21;\n')
+
+    def _flush(self) -> None:
+        if self._pending:
+            related = ','.join(f'#{i}' for i in self._pending)
+            self._add(f"IFCRELCONTAINEDINSPATIALSTRUCTURE('{new_guid()}',$,$,$,({related}),#{self._storey})")
+            self._pending = []
+
+    # ------------------------------------------------------------------
+    # 断面
+    # ------------------------------------------------------------------
+
+    def _polyline(self, points) -> int:
+        ids = [self._point(x, y) for x, y in points]
+        ids.append(ids[0])
+        return self._add(f'IFCPOLYLINE(({",".join(f"#{i}" for i in ids)}))')
+
+    def _section_profile(self, name: str) -> int:
+        """形鋼名の断面（種類ごとのパラメトリック断面）。寸法を読み取れなければ None。"""
+        section = parse_section_name(name)
+        if section is None:
+            return None
+        kind, d = section.kind, section.dims
+        label = _string(name.strip())
+        head = f".AREA.,{label},$"
+        if kind in ('H', 'LH') and len(d) == 4:
+            h, b, tw, tf = d
+            r = _real(h_fillet_radius(h, b, tw, tf)) if kind == 'H' else '$'
+            return self._add(f'IFCISHAPEPROFILEDEF({head},{_real(b)},{_real(h)},{_real(tw)},{_real(tf)},{r},$,$)')
+        if kind == 'C' and len(d) == 4:
+            h, b, tw, tf = d
+            return self._add(f'IFCUSHAPEPROFILEDEF({head},{_real(h)},{_real(b)},{_real(tw)},{_real(tf)},'
+                             f'{_real(max(8.0, tf))},{_real(max(8.0, tf) / 2.0)},$)')
+        if kind == 'C' and len(d) == 3:
+            h, a, t = d
+            return self._add(f'IFCUSHAPEPROFILEDEF({head},{_real(h)},{_real(a)},{_real(t)},{_real(t)},'
+                             f'{_real(t)},$,$)')
+        if kind == 'L' and len(d) == 3:
+            a, b, t = d
+            return self._add(f'IFCLSHAPEPROFILEDEF({head},{_real(a)},{_real(b)},{_real(t)},$,$,$)')
+        if kind == 'BOX' and len(d) == 3:
+            h, b, t = d
+            return self._add(f'IFCRECTANGLEHOLLOWPROFILEDEF({head},{_real(b)},{_real(h)},{_real(t)},'
+                             f'{_real(1.5 * t)},{_real(2.5 * t)})')
+        if kind == 'PIPE' and len(d) == 2:
+            D, t = d
+            return self._add(f'IFCCIRCLEHOLLOWPROFILEDEF({head},{_real(D / 2.0)},{_real(t)})')
+        if kind == 'FB' and len(d) == 2:
+            t, w = d
+            return self._add(f'IFCRECTANGLEPROFILEDEF({head},{_real(w)},{_real(t)})')
+        if kind == 'RC' and len(d) == 4:
+            h, a, c, t = d
+            return self._add(f'IFCCSHAPEPROFILEDEF({head},{_real(h)},{_real(a)},{_real(t)},{_real(c)},{_real(t)})')
+        if kind == 'Z' and len(d) == 3:
+            h, a, t = d
+            return self._add(f'IFCZSHAPEPROFILEDEF({head},{_real(h)},{_real(a)},{_real(t)},{_real(t)},'
+                             f'{_real(t)},$)')
+        # パラメトリックな断面のないリップZ・ハットは、角を直角にした外形で書く
+        if kind == 'Z' and len(d) == 4:
+            outline = _lipped_z_outline(*d)
+        elif kind == 'HAT' and len(d) == 4:
+            outline = _hat_outline(*d)
+        else:
+            return None
+        curve = self._polyline(_centered(outline))
+        return self._add(f'IFCARBITRARYCLOSEDPROFILEDEF(.AREA.,{label},#{curve})')
+
+    def _plate_profile(self, geometry, name: str) -> int:
+        """プレートの外形と穴の断面（外形の座標のまま）。"""
+        outer = self._polyline(list(zip(geometry.outline_x, geometry.outline_y)))
+        holes = []
+        for x, y, d in zip(geometry.hole_x, geometry.hole_y, geometry.hole_d):
+            center = self._point(x, y)
+            position = self._add(f'IFCAXIS2PLACEMENT2D(#{center},$)')
+            holes.append(self._add(f'IFCCIRCLE(#{position},{_real(d / 2.0)})'))
+        if not holes:
+            return self._add(f'IFCARBITRARYCLOSEDPROFILEDEF(.AREA.,{_string(name)},#{outer})')
+        inner = ','.join(f'#{i}' for i in holes)
+        return self._add(f'IFCARBITRARYPROFILEDEFWITHVOIDS(.AREA.,{_string(name)},#{outer},({inner}))')
+
+    # ------------------------------------------------------------------
+    # 部材
+    # ------------------------------------------------------------------
+
+    def _placement(self, matrix) -> tuple:
+        """変換行列から (IfcLocalPlacement の番号, 材軸 z)。軸はスケールを除いて正規化します。"""
+        x = _unit((matrix[0], matrix[4], matrix[8]))
+        z = _unit(_axis_z(matrix))
+        origin = self._point(matrix[3] * self.unit, matrix[7] * self.unit, matrix[11] * self.unit)
+        axis = self._direction(z)
+        ref = self._direction(x)
+        placement = self._add(f'IFCAXIS2PLACEMENT3D(#{origin},#{axis},#{ref})')
+        return self._add(f'IFCLOCALPLACEMENT(#{self._storey_placement},#{placement})'), z
+
+    def _element(self, entity: str, profile: int, depth: float, matrix, name: str, tag: str,
+                 predefined: str = None) -> int:
+        placement, z = self._placement(matrix)
+        if entity is None:
+            entity = element_kind(z)
+            predefined = '.COLUMN.' if entity == 'IFCCOLUMN' else '.BEAM.'
+        solid = self._add(f'IFCEXTRUDEDAREASOLID(#{profile},#{self._identity},#{self._z},{_real(depth)})')
+        representation = self._add(f"IFCSHAPEREPRESENTATION(#{self._context},'Body','SweptSolid',(#{solid}))")
+        shape = self._add(f'IFCPRODUCTDEFINITIONSHAPE($,$,(#{representation}))')
+        element = self._add(f"{entity}('{new_guid()}',$,{_string(name)},$,$,#{placement},#{shape},"
+                            f'{_string(tag)},{predefined})')
+        self._pending.append(element)
+        if len(self._pending) >= RELATION_CHUNK:
+            self._flush()
+        return element
+
+    def add_member(self, name: str, length: float, matrix, tag: str = '') -> int:
+        """形鋼1本（材長 mm）。寸法を読み取れない形鋼名は書かずに None を返します。
+
+        matrix が材軸方向にスケールを含むとき（配置時に材長をスケールで合わせた形鋼）は、
+        材長にその倍率を掛けます。断面は形鋼名の寸法のままです。
+        """
+        key = ('section', name.strip())
+        if key not in self._profiles:
+            self._profiles[key] = self._section_profile(name)
+        profile = self._profiles[key]
+        if profile is None:
+            if name.strip() not in self.skipped:
+                self.skipped.append(name.strip())
+            return None
+        self.members += 1
+        return self._element(None, profile, length * axis_scale(matrix), matrix, name.strip(), tag)
+
+    def add_plate(self, geometry, matrix, name: str = None, tag: str = '') -> int:
+        """プレート1枚。外形はコンポーネントの xy 面、板厚は +z 方向です。
+
+        断面は名前と形状（外形・穴）ごとに1回だけ書きます（同じ名前で穴径だけ違うプレートもあるため）。
+        """
+        name = (name or geometry.name).strip()
+        key = ('plate', name, tuple(geometry.outline_x), tuple(geometry.outline_y),
+               tuple(geometry.hole_x), tuple(geometry.hole_y), tuple(geometry.hole_d))
+        if key not in self._profiles:
+            self._profiles[key] = self._plate_profile(geometry, name)
+        self.plates += 1
+        return self._element('IFCPLATE', self._profiles[key], geometry.thickness, matrix, name, tag, '.SHEET.')
@@ -0,0 +1,443 @@
+"""プレート（スプライス・ガセット・任意形状）の鋼板からの板取り（2次元ネスティング）。
+
+プレートを板厚ごとにまとめ、定尺の鋼板（既定 3×6 / 4×8 / 5×10）に外形を並べます。
+既定の矩形モードでは外接矩形をスカイライン法の左下詰め（90°回転あり）で大きい順に
+最も大きい定尺へ1枚ずつ詰め、最後の1枚は全部が入る最小の定尺へ替えます。ある鋼板に
+入らなかった寸法はその鋼板では二度と試さないので、同じプレートが数千枚あっても速く並べられます。
+
+多角形モード（三角形・角切りのガセット向け）では、凸包の辺に合わせて外接矩形の面積が
+最小になる向きに回し、180°回した2枚を組み合わせた方が小さければ2枚1組で並べます。
+凹んだ外形は凸包として扱うので、凹みに別の部品を入れることはしません。
+
+寸法は mm です。部品どうしの間隔 spacing と鋼板の縁の余白 margin を見込みます。配置は
+部品の外形を原点まわりに angle（度, 反時計回り）回してから (x, y) だけ平行移動した位置で、
+鋼板の左下が原点です。板厚のグループが複数あるときはプロセスプールで並列に計算します。
+"""
+
+import csv
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# 既定の鋼板の定尺 (幅, 長さ mm): 3×6, 4×8, 5×10
+SHEET_SIZES = ((914.0, 1829.0), (1219.0, 2438.0), (1524.0, 3048.0))
+
+# 部品の間隔と鋼板の縁の余白 (mm)
+SPACING = 10.0
+MARGIN = 10.0
+
+# プロセスプールを使う部品数の下限（少ないとプロセスの起動の方が遅い）
+POOL_MIN_PARTS = 1000
+
+# 部品1枚の配置。angle は原点まわりの回転（度）、(x, y) は回したあとの平行移動
+NestPlacement = namedtuple('NestPlacement', 'name x y angle')
+
+# 鋼板1枚。used_area は並べた部品の外形の面積の合計 (mm2)
+NestSheet = namedtuple('NestSheet', 'width height placements used_area')
+
+# 板厚1種類の板取り。oversize は最も大きい定尺にも入らない部品の名前
+NestingPlan = namedtuple('NestingPlan', 'thickness sheets oversize')
+
+# 並べる単位（部品1枚、または組み合わせた2枚）。members は (部品番号, 回転角, x, y)
+_Unit = namedtuple('_Unit', 'width height members')
+
+CSV_HEADER = ('板厚(mm)', '鋼板番号', '鋼板(mm)', '鋼板の歩留まり(%)', '名称', 'X(mm)', 'Y(mm)', '回転(°)')
+
+_EPS = 1e-9
+
+
+# ----------------------------------------------------------------------
+# 多角形の計算
+# ----------------------------------------------------------------------
+
+def _rotation(angle: float) -> tuple:
+    """角度（度）の (cos, sin)。90°の倍数は丸め誤差のない値にします。"""
+    a = angle % 360.0
+    exact = {0.0: (1.0, 0.0), 90.0: (0.0, 1.0), 180.0: (-1.0, 0.0), 270.0: (0.0, -1.0)}
+    if a in exact:
+        return exact[a]
+    r = math.radians(a)
+    return math.cos(r), math.sin(r)
+
+
+def _rotate(points, angle: float) -> list:
+    c, s = _rotation(angle)
+    return [(c * x - s * y, s * x + c * y) for x, y in points]
+
+
+def _bounds(points) -> tuple:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _convex_hull(points) -> list:
+    """凸包の頂点（反時計回り、Andrew のモノトーンチェーン）。"""
+    pts = sorted(set(points))
+    if len(pts) < 3:
+        return pts
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in pts:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(pts):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def _best_angle(hull) -> float:
+    """外接矩形の面積が最小になる回転角（凸包のいずれかの辺を x 軸に合わせる角度）。"""
+    x0, y0, x1, y1 = _bounds(hull)
+    best_angle, best_area = 0.0, (x1 - x0) * (y1 - y0)
+    for (ax, ay), (bx, by) in zip(hull, hull[1:] + hull[:1]):
+        # 90°ずつ回しても外接矩形の面積は同じなので 0〜90°にそろえる
+        angle = round(-math.degrees(math.atan2(by - ay, bx - ax)) % 90.0, 6)
+        x0, y0, x1, y1 = _bounds(_rotate(hull, angle))
+        area = (x1 - x0) * (y1 - y0)
+        if area < best_area - 1e-6:
+            best_angle, best_area = angle, area
+    return best_angle
+
+
+def _x_range(poly, y: float) -> tuple:
+    """凸多角形と水平線 y の交わりの (左端, 右端)。交わらなければ None。"""
+    lo, hi = math.inf, -math.inf
+    for (x0, y0), (x1, y1) in zip(poly, poly[1:] + poly[:1]):
+        if min(y0, y1) - _EPS <= y <= max(y0, y1) + _EPS:
+            if abs(y1 - y0) < _EPS:
+                xs = (x0, x1)
+            else:
+                xs = (x0 + (x1 - x0) * (y - y0) / (y1 - y0),)
+            lo = min(lo, *xs)
+            hi = max(hi, *xs)
+    return (lo, hi) if lo <= hi else None
+
+
+def _pair_offset(a, b, height: float, spacing: float) -> float:
+    """凸多角形 b を a の右へ spacing 以上離して置くときの x 方向のずらし量。
+
+    a, b はどちらも外接矩形が [0, height] の高さにそろっている前提です。b の左端と、
+    上下 spacing の範囲での a の右端の差は区分線形で、最大は頂点の高さ（と ±spacing）で決まります。
+    """
+    ys = {0.0, height}
+    for _, y in a + b:
+        for v in (y - spacing, y, y + spacing):
+            ys.add(min(max(v, 0.0), height))
+    need = -math.inf
+    for y in ys:
+        left = _x_range(b, y)
+        if left is None:
+            continue
+        window = [min(max(y - spacing, 0.0), height), min(max(y + spacing, 0.0), height)]
+        window += [py for _, py in a if abs(py - y) <= spacing]
+        rights = [r[1] for r in (_x_range(a, t) for t in window) if r]
+        if rights:
+            need = max(need, max(rights) + spacing - left[0])
+    return need
+
+
+# ----------------------------------------------------------------------
+# 並べる単位
+# ----------------------------------------------------------------------
+
+def _units_for(outline, index: int, polygon: bool, spacing: float) -> tuple:
+    """部品1種類の並べる単位 (1枚, 2枚1組 または None)。"""
+    if not polygon:
+        x0, y0, x1, y1 = _bounds(outline)
+        return _Unit(x1 - x0, y1 - y0, ((index, 0.0, -x0, -y0),)), None
+
+    hull = _convex_hull(outline)
+    angle = _best_angle(hull)
+    a = _rotate(hull, angle)
+    x0, y0, x1, y1 = _bounds(a)
+    w, h = x1 - x0, y1 - y0
+    single = _Unit(w, h, ((index, angle, -x0, -y0),))
+    if len(hull) < 3:
+        return single, None
+
+    b = _rotate(hull, angle + 180.0)
+    bx0, by0, _, _ = _bounds(b)
+    dx = _pair_offset([(x - x0, y - y0) for x, y in a], [(x - bx0, y - by0) for x, y in b], h, spacing)
+    left = min(0.0, dx)
+    pair_w = max(w, dx + w) - left
+    if (pair_w + spacing) >= 2.0 * (w + spacing) - 1e-6:
+        return single, None
+    members = ((index, angle, -x0 - left, -y0), (index, (angle + 180.0) % 360.0, dx - bx0 - left, -by0))
+    return single, _Unit(pair_w, h, members)
+
+
+def _turned(unit: _Unit) -> _Unit:
+    """単位を 90° 回したもの（回したあとも外接矩形の左下が原点）。"""
+    h = unit.height
+    return _Unit(unit.height, unit.width,
+                 tuple((i, (angle + 90.0) % 360.0, h - ty, tx) for i, angle, tx, ty in unit.members))
+
+
+def _usable(size, spacing: float, margin: float) -> tuple:
+    """部品の右・上に spacing を足した寸法で詰めるときの鋼板の寸法。"""
+    return size[0] - 2.0 * margin + spacing, size[1] - 2.0 * margin + spacing
+
+
+def _fits(unit: _Unit, size, spacing: float, margin: float) -> bool:
+    uw, uh = _usable(size, spacing, margin)
+    w, h = unit.width + spacing, unit.height + spacing
+    return (w <= uw + _EPS and h <= uh + _EPS) or (h <= uw + _EPS and w <= uh + _EPS)
+
+
+# ----------------------------------------------------------------------
+# スカイライン法
+# ----------------------------------------------------------------------
+
+class _Skyline:
+    """スカイライン法の左下詰め。区間 i は xs[i] から次の区間の始まりまでで、高さは ys[i]。"""
+
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.xs = [0.0]
+        self.ys = [0.0]
+
+    def _fit(self, i: int, w: float, h: float) -> float:
+        """区間 i の左端に置くときの下端の高さ。入らなければ None。"""
+        xs, ys = self.xs, self.ys
+        end = xs[i] + w
+        if end > self.width + _EPS:
+            return None
+        y = 0.0
+        j = i
+        while j < len(xs) and xs[j] < end - _EPS:
+            if ys[j] > y:
+                y = ys[j]
+                if y + h > self.height + _EPS:
+                    return None
+            j += 1
+        return y
+
+    def find(self, w: float, h: float) -> tuple:
+        """上端が最も低く、次に最も左の位置 (上端, x, 区間番号, 下端)。入らなければ None。"""
+        best = None
+        for i, x in enumerate(self.xs):
+            y = self._fit(i, w, h)
+            if y is not None and (best is None or (y + h, x) < best[:2]):
+                best = (y + h, x, i, y)
+        return best
+
+    def place(self, i: int, w: float, h: float, y: float) -> None:
+        xs, ys = self.xs, self.ys
+        x = xs[i]
+        end = x + w
+        j = i + 1
+        while j < len(xs) and xs[j] < end - _EPS:
+            j += 1
+        # 最後に覆う区間の右側の残り
+        right = xs[j] if j < len(xs) else self.width
+        new_x, new_y = [x], [y + h]
+        if right > end + _EPS:
+            new_x.append(end)
+            new_y.append(ys[j - 1])
+        xs[i:j] = new_x
+        ys[i:j] = new_y
+        # 同じ高さの隣の区間とまとめる
+        for k in range(min(i + len(new_x), len(xs) - 1), max(i, 1) - 1, -1):
+            if abs(ys[k] - ys[k - 1]) < _EPS:
+                del xs[k]
+                del ys[k]
+
+
+def _fill(units, size, spacing: float, margin: float) -> tuple:
+    """単位を並びの順に1枚の鋼板へ詰めます。戻り値は ([(単位, x, y), ...], 入らなかった単位)。"""
+    sky = _Skyline(*_usable(size, spacing, margin))
+    placed, rest, failed = [], [], set()
+    for unit in units:
+        key = (unit.width, unit.height)
+        if key in failed:
+            rest.append(unit)
+            continue
+        w, h = unit.width + spacing, unit.height + spacing
+        best = sky.find(w, h)
+        turned = sky.find(h, w) if abs(w - h) > _EPS else None
+        if turned is not None and (best is None or turned[:2] < best[:2]):
+            sky.place(turned[2], h, w, turned[3])
+            placed.append((_turned(unit), turned[1] + margin, turned[3] + margin))
+        elif best is not None:
+            sky.place(best[2], w, h, best[3])
+            placed.append((unit, best[1] + margin, best[3] + margin))
+        else:
+            # スカイラインは下がらないので、この寸法はこの鋼板にはもう入らない
+            failed.add(key)
+            rest.append(unit)
+    return placed, rest
+
+
+def _sort_key(unit: _Unit) -> tuple:
+    return -max(unit.width, unit.height), -min(unit.width, unit.height)
+
+
+def _sheet(size, placed, shapes) -> NestSheet:
+    placements = []
+    used = 0.0
+    for unit, px, py in placed:
+        for index, angle, tx, ty in unit.members:
+            name, _, area, _ = shapes[index]
+            placements.append(NestPlacement(name, round(px + tx, 3), round(py + ty, 3), round(angle % 360.0, 6)))
+            used += area
+    return NestSheet(size[0], size[1], tuple(placements), used)
+
+
+def _nest_group(job) -> NestingPlan:
+    """板厚1種類の板取り（プロセスプールのワーカーで実行するので引数は組み込み型だけ）。"""
+    thickness, shapes, sheets, spacing, margin, polygon = job
+    sheets = sorted(sheets, key=lambda s: s[0] * s[1])
+    largest = sheets[-1]
+
+    units, oversize = [], []
+    for index, (name, outline, _, count) in enumerate(shapes):
+        single, pair = _units_for(outline, index, polygon, spacing)
+        if pair is not None and _fits(pair, largest, spacing, margin):
+            units.extend([pair] * (count // 2))
+            count %= 2
+        if _fits(single, largest, spacing, margin):
+            units.extend([single] * count)
+        else:
+            oversize.extend([name] * count)
+    units.sort(key=_sort_key)
+
+    layouts = []
+    while units:
+        placed, units = _fill(units, largest, spacing, margin)
+        layouts.append((largest, placed))
+
+    # 最後の1枚は全部が入る最小の定尺へ替える
+    if layouts:
+        last = sorted((unit for unit, _, _ in layouts[-1][1]), key=_sort_key)
+        for size in sheets[:-1]:
+            placed, rest = _fill(last, size, spacing, margin)
+            if not rest:
+                layouts[-1] = (size, placed)
+                break
+
+    return NestingPlan(thickness, tuple(_sheet(size, placed, shapes) for size, placed in layouts), tuple(oversize))
+
+
+# ----------------------------------------------------------------------
+# 公開関数
+# ----------------------------------------------------------------------
+
+def nest_all(parts, sheets=SHEET_SIZES, spacing: float = SPACING, margin: float = MARGIN,
+             polygon: bool = False, workers: int = None) -> list:
+    """プレートを板厚ごとにまとめて鋼板に並べます。
+
+    Arguments:
+    parts -- [(名称, PlateGeometry, 枚数), ...]
+    sheets -- 鋼板の定尺 [(幅, 長さ), ...] (mm)
+    spacing -- 部品の間隔 (mm)
+    margin -- 鋼板の縁の余白 (mm)
+    polygon -- True なら多角形モード（面積が最小になる向きと2枚の組み合わせ）
+    workers -- プロセス数。1 ならプロセスプールを使わない（None は CPU 数）
+
+    Returns:
+    板厚ごとの NestingPlan（板厚の順）。
+    """
+    sheets = tuple((float(w), float(h)) for w, h in sheets)
+    if not sheets:
+        raise ValueError('鋼板の定尺が指定されていません')
+    groups = {}
+    total = 0
+    for name, geometry, count in parts:
+        if count <= 0:
+            continue
+        groups.setdefault(round(geometry.thickness, 1), []).append(
+            (name, tuple(geometry.outline), geometry.gross_area(), count))
+        total += count
+    jobs = [(t, tuple(shapes), sheets, float(spacing), float(margin), polygon)
+            for t, shapes in sorted(groups.items())]
+
+    if len(jobs) > 1 and workers != 1 and total >= POOL_MIN_PARTS:
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(jobs), workers or os.cpu_count() or 1)) as pool:
+                return list(pool.map(_nest_group, jobs))
+        except Exception:
+            # 起動に失敗して例外になったときは順に計算する（例外にならずに止まる環境では workers=1 を渡す）
+            pass
+    return [_nest_group(job) for job in jobs]
+
+
+def parse_sheet_sizes(text: str) -> tuple:
+    """'1219×2438, 1524×3048' のような文字列から鋼板の定尺 ((幅, 長さ), ...) を返します。"""
+    sizes = set()
+    for item in text.replace('、', ',').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.lower().replace('×', 'x').replace('*', 'x').split('x')
+        try:
+            w, h = (float(v) for v in parts)
+        except ValueError:
+            raise ValueError(f'鋼板の定尺の指定が正しくありません: {item}')
+        if w <= 0.0 or h <= 0.0:
+            raise ValueError(f'鋼板の定尺の指定が正しくありません: {item}')
+        sizes.add((min(w, h), max(w, h)))
+    if not sizes:
+        raise ValueError('鋼板の定尺が指定されていません')
+    return tuple(sorted(sizes, key=lambda s: s[0] * s[1]))
+
+
+def sheet_utilization(sheet: NestSheet) -> float:
+    """鋼板1枚の歩留まり（部品の外形の面積 / 鋼板の面積）。"""
+    return sheet.used_area / (sheet.width * sheet.height)
+
+
+def utilization(nesting_plan: NestingPlan) -> float:
+    """歩留まり（部品の外形の面積の合計 / 鋼板の面積の合計）。鋼板がなければ 0。"""
+    total = sum(s.width * s.height for s in nesting_plan.sheets)
+    return sum(s.used_area for s in nesting_plan.sheets) / total if total else 0.0
+
+
+def sheet_counts(nesting_plan: NestingPlan) -> dict:
+    """{(幅, 長さ): 枚数}"""
+    counts = {}
+    for s in nesting_plan.sheets:
+        counts[(s.width, s.height)] = counts.get((s.width, s.height), 0) + 1
+    return counts
+
+
+def summarize(plans) -> str:
+    """'t9: 1219×2438×3枚, 914×1829×1枚 (歩留まり 78.5%)' のような要約（板厚ごとに1行）。"""
+    if not plans:
+        return '板取りするプレートがありません'
+    lines = []
+    for p in plans:
+        counts = sheet_counts(p)
+        shown = ', '.join(f'{w:g}×{h:g}×{counts[(w, h)]}枚'
+                          for w, h in sorted(counts, key=lambda s: -s[0] * s[1]))
+        line = f't{p.thickness:g}: {shown} (歩留まり {utilization(p) * 100.0:.1f}%)'
+        if p.oversize:
+            line += f' / 定尺超え {len(p.oversize)}枚'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def write_csv(plans, stream) -> int:
+    """部品ごとの配置を CSV で書き出し、行数を返します。定尺超えの部品は鋼板番号を空にします。"""
+    writer = csv.writer(stream)
+    writer.writerow(CSV_HEADER)
+    n = 0
+    for p in plans:
+        for i, sheet in enumerate(p.sheets, 1):
+            size = f'{sheet.width:g}×{sheet.height:g}'
+            rate = f'{sheet_utilization(sheet) * 100.0:.1f}'
+            for pl in sheet.placements:
+                writer.writerow([f'{p.thickness:g}', i, size, rate, pl.name, f'{pl.x:g}', f'{pl.y:g}', f'{pl.angle:g}'])
+                n += 1
+        for name in p.oversize:
+            writer.writerow([f'{p.thickness:g}', '', '', '', name, '', '', ''])
+            n += 1
+    return n
@@ -0,0 +1,359 @@
+"""プレートの2D形状カーネル。
+
+外形ポリゴンとボルト穴の配列だけで板を表現し、面積・重量・重心・縁端距離・
+ピッチ・外接矩形を計算します。座標は mm、値は array('d') に保持します。
+プレビュー描画・Fusion のスケッチ作成・各種エクスポートはすべてこの表現から
+形状を取り出します。adsk には依存しません。
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+# 鋼材の密度 (kg/mm3)
+STEEL_DENSITY = 7.85e-6
+
+# 等間隔の穴の矩形配列。原点 (x0, y0) の穴を nx × ny に並べる
+HoleGrid = namedtuple('HoleGrid', 'x0 y0 nx dx ny dy dia')
+
+
+class PlateGeometry:
+    """外形ポリゴン＋穴配列で表した板（単位 mm）。
+
+    outline_x / outline_y -- 外形頂点（閉じ点は含まない）
+    hole_x / hole_y / hole_d -- 穴中心と穴径
+    """
+
+    __slots__ = ('name', 'thickness', 'outline_x', 'outline_y', 'hole_x', 'hole_y', 'hole_d')
+
+    def __init__(self, outline, holes=(), hole_dia: float = 0.0, thickness: float = 0.0, name: str = ''):
+        """
+        Arguments:
+        outline -- 外形頂点 [(x, y), ...]
+        holes -- 穴中心 [(x, y), ...] または [(x, y, 径), ...]
+        hole_dia -- 径を省略した穴の径
+        thickness -- 板厚
+        name -- 名前（プレートタイプ名など）
+        """
+        self.name = name
+        self.thickness = float(thickness)
+        self.outline_x = array('d', (p[0] for p in outline))
+        self.outline_y = array('d', (p[1] for p in outline))
+        self.hole_x = array('d', (h[0] for h in holes))
+        self.hole_y = array('d', (h[1] for h in holes))
+        self.hole_d = array('d', (h[2] if len(h) > 2 else hole_dia for h in holes))
+        if len(self.outline_x) < 3:
+            raise ValueError('外形には3点以上が必要です')
+
+    # ------------------------------------------------------------------
+    # 生成
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def rectangle(cls, width: float, height: float, holes=(), hole_dia: float = 0.0,
+                  thickness: float = 0.0, name: str = ''):
+        """原点を左下とする矩形プレートを作成します。"""
+        outline = [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)]
+        return cls(outline, holes, hole_dia, thickness, name)
+
+    @classmethod
+    def from_plate_data(cls, plate_data: dict, name: str = '', thickness: float = None, hole_dia: float = None):
+        """SPLICE_PLATE_TYPES 形式の辞書から作成します。
+
+        'outline' があれば外形として使い、なければ width × height の矩形とします。
+        thickness / hole_dia を指定するとカタログ値を上書きします（ダイアログ入力値用）。
+        """
+        t = float(plate_data.get('thickness', 0.0) if thickness is None else thickness)
+        d = float(plate_data.get('hole_dia', 0.0) if hole_dia is None else hole_dia)
+        holes = plate_data.get('holes', ())
+        outline = plate_data.get('outline')
+        if outline:
+            return cls(outline, holes, d, t, name)
+        return cls.rectangle(float(plate_data['width']), float(plate_data['height']), holes, d, t, name)
+
+    def to_plate_data(self) -> dict:
+        """SPLICE_PLATE_TYPES 形式の辞書に戻します（穴径は先頭の穴の径）。"""
+        x0, y0, x1, y1 = self.bounding_box()
+        data = {
+            'width': x1 - x0,
+            'height': y1 - y0,
+            'thickness': self.thickness,
+            'hole_dia': self.hole_d[0] if len(self.hole_d) else 0.0,
+            'holes': list(zip(self.hole_x, self.hole_y)),
+        }
+        if not self.is_rectangle():
+            data['outline'] = self.outline
+        return data
+
+    def with_hole_diameter(self, hole_dia: float):
+        """全穴の径を置き換えたコピーを返します。"""
+        return PlateGeometry(self.outline, list(zip(self.hole_x, self.hole_y)), hole_dia, self.thickness, self.name)
+
+    # ------------------------------------------------------------------
+    # アクセサ
+    # ------------------------------------------------------------------
+
+    @property
+    def outline(self) -> list:
+        return list(zip(self.outline_x, self.outline_y))
+
+    @property
+    def holes(self) -> list:
+        """[(x, y, 径), ...]"""
+        return list(zip(self.hole_x, self.hole_y, self.hole_d))
+
+    @property
+    def hole_count(self) -> int:
+        return len(self.hole_x)
+
+    def is_rectangle(self) -> bool:
+        """外形が軸に平行な矩形かどうか。"""
+        if len(self.outline_x) != 4:
+            return False
+        x0, y0, x1, y1 = self.bounding_box()
+        corners = {(x0, y0), (x1, y0), (x1, y1), (x0, y1)}
+        return (len(corners) == 4 and set(self.outline) == corners
+                and abs(self.gross_area() - (x1 - x0) * (y1 - y0)) < 1e-6)
+
+    # ------------------------------------------------------------------
+    # 面積・重量・重心
+    # ------------------------------------------------------------------
+
+    def bounding_box(self) -> tuple:
+        """(xmin, ymin, xmax, ymax)"""
+        return min(self.outline_x), min(self.outline_y), max(self.outline_x), max(self.outline_y)
+
+    @property
+    def width(self) -> float:
+        return max(self.outline_x) - min(self.outline_x)
+
+    @property
+    def height(self) -> float:
+        return max(self.outline_y) - min(self.outline_y)
+
+    def _signed_area(self) -> float:
+        xs, ys = self.outline_x, self.outline_y
+        n = len(xs)
+        return 0.5 * sum(xs[i] * ys[(i + 1) % n] - xs[(i + 1) % n] * ys[i] for i in range(n))
+
+    def gross_area(self) -> float:
+        """穴を引かない外形面積 (mm2)。"""
+        return abs(self._signed_area())
+
+    def hole_areas(self) -> array:
+        """各穴の面積 (mm2)。"""
+        return array('d', (math.pi * d * d / 4.0 for d in self.hole_d))
+
+    def net_area(self) -> float:
+        """穴を引いた面積 (mm2)。"""
+        return self.gross_area() - math.fsum(self.hole_areas())
+
+    def volume(self) -> float:
+        """体積 (mm3)。"""
+        return self.net_area() * self.thickness
+
+    def weight(self, density: float = STEEL_DENSITY) -> float:
+        """重量 (kg)。"""
+        return self.volume() * density
+
+    def centroid(self) -> tuple:
+        """穴を考慮した図心 (x, y)。"""
+        xs, ys = self.outline_x, self.outline_y
+        n = len(xs)
+        a = self._signed_area()
+        cx = cy = 0.0
+        for i in range(n):
+            j = (i + 1) % n
+            cross = xs[i] * ys[j] - xs[j] * ys[i]
+            cx += (xs[i] + xs[j]) * cross
+            cy += (ys[i] + ys[j]) * cross
+        cx /= 6.0 * a
+        cy /= 6.0 * a
+        areas = self.hole_areas()
+        ah = math.fsum(areas)
+        if ah <= 0.0:
+            return cx, cy
+        ag = abs(a)
+        mx = math.fsum(map(lambda w, x: w * x, areas, self.hole_x))
+        my = math.fsum(map(lambda w, y: w * y, areas, self.hole_y))
+        return (ag * cx - mx) / (ag - ah), (ag * cy - my) / (ag - ah)
+
+    def contains(self, x: float, y: float) -> bool:
+        """点 (x, y) が外形の内側にあるかどうか（穴は考慮しない）。"""
+        xs, ys = self.outline_x, self.outline_y
+        n = len(xs)
+        inside = False
+        for i in range(n):
+            x0, y0 = xs[i], ys[i]
+            x1, y1 = xs[(i + 1) % n], ys[(i + 1) % n]
+            if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+        return inside
+
+    # ------------------------------------------------------------------
+    # 縁端距離・ピッチ
+    # ------------------------------------------------------------------
+
+    def edge_distances(self) -> array:
+        """各穴中心から外形までの最短距離 (mm)。穴の並びと同じ順序です。"""
+        xs, ys = self.outline_x, self.outline_y
+        n = len(xs)
+        # 辺ごとの係数を先に求めておき、穴ごとのループを軽くする
+        edges = []
+        for i in range(n):
+            ax, ay = xs[i], ys[i]
+            dx, dy = xs[(i + 1) % n] - ax, ys[(i + 1) % n] - ay
+            ll = dx * dx + dy * dy
+            edges.append((ax, ay, dx, dy, ll if ll > 0 else 1.0))
+        out = array('d')
+        for px, py in zip(self.hole_x, self.hole_y):
+            best = math.inf
+            for ax, ay, dx, dy, ll in edges:
+                t = ((px - ax) * dx + (py - ay) * dy) / ll
+                t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                ex = ax + t * dx - px
+                ey = ay + t * dy - py
+                d2 = ex * ex + ey * ey
+                if d2 < best:
+                    best = d2
+            out.append(math.sqrt(best))
+        return out
+
+    def min_edge_distance(self) -> float:
+        d = self.edge_distances()
+        return min(d) if len(d) else math.inf
+
+    def check_edge_distance(self, min_edge: float) -> list:
+        """縁端距離が min_edge 未満の穴のインデックス。"""
+        return [i for i, d in enumerate(self.edge_distances()) if d < min_edge - 1e-9]
+
+    def hole_pairs_within(self, distance: float) -> list:
+        """中心間距離が distance 未満の穴のペア [(i, j, 距離), ...] (i < j)。
+
+        一様グリッドに穴を振り分け、隣接セルだけを比較するので
+        穴数 n に対してほぼ O(n) で動作します。
+        """
+        n = len(self.hole_x)
+        if n < 2 or distance <= 0:
+            return []
+        cell = float(distance)
+        grid = {}
+        for i, (x, y) in enumerate(zip(self.hole_x, self.hole_y)):
+            grid.setdefault((int(math.floor(x / cell)), int(math.floor(y / cell))), []).append(i)
+        limit2 = distance * distance
+        hx, hy = self.hole_x, self.hole_y
+        pairs = []
+        for (gx, gy), members in grid.items():
+            for ox in (-1, 0, 1):
+                for oy in (-1, 0, 1):
+                    others = grid.get((gx + ox, gy + oy))
+                    if not others:
+                        continue
+                    for i in members:
+                        for j in others:
+                            if j <= i:
+                                continue
+                            dx = hx[i] - hx[j]
+                            dy = hy[i] - hy[j]
+                            d2 = dx * dx + dy * dy
+                            if d2 < limit2 - 1e-9:
+                                pairs.append((i, j, math.sqrt(d2)))
+        pairs.sort()
+        return pairs
+
+    def check_pitch(self, min_pitch: float) -> list:
+        """ピッチ（中心間距離）が min_pitch 未満の穴のペア。"""
+        return self.hole_pairs_within(min_pitch)
+
+    def min_pitch(self) -> float:
+        """最小の中心間距離。穴が2つ未満なら inf。"""
+        n = len(self.hole_x)
+        if n < 2:
+            return math.inf
+        # x でソートし、現在の最小値より x 差が大きい組を打ち切る
+        order = sorted(range(n), key=self.hole_x.__getitem__)
+        hx, hy = self.hole_x, self.hole_y
+        best = math.inf
+        for a in range(n):
+            i = order[a]
+            for b in range(a + 1, n):
+                j = order[b]
+                dx = hx[j] - hx[i]
+                if dx >= best:
+                    break
+                d = math.hypot(dx, hy[j] - hy[i])
+                if d < best:
+                    best = d
+        return best
+
+    # ------------------------------------------------------------------
+    # 穴の配列パターン
+    # ------------------------------------------------------------------
+
+    def hole_grids(self, ndigits: int = 6):
+        """穴を等間隔の矩形配列 (HoleGrid) の組に分解します。
+
+        穴径ごとに、穴の集合が「x 座標の一覧 × y 座標の一覧」の直積になっている場合だけ
+        分解できます。x / y の一覧はピッチが変わる所で区切るので、継手部で間隔が空く
+        スプライスプレートの配置は (x の区間数 × y の区間数) 個の配列になります。
+
+        Returns:
+        HoleGrid のリスト。穴がない場合は空リスト、直積にならない場合は None。
+        """
+        by_dia = {}
+        for x, y, d in zip(self.hole_x, self.hole_y, self.hole_d):
+            by_dia.setdefault(round(d, ndigits), []).append((round(x, ndigits), round(y, ndigits)))
+
+        grids = []
+        for d, points in by_dia.items():
+            xs = sorted({p[0] for p in points})
+            ys = sorted({p[1] for p in points})
+            if len(xs) * len(ys) != len(points) or len(set(points)) != len(points):
+                return None
+            for xr in _split_runs(xs, ndigits):
+                for yr in _split_runs(ys, ndigits):
+                    grids.append(HoleGrid(xr[0], yr[0], len(xr), _run_pitch(xr), len(yr), _run_pitch(yr), d))
+        return grids
+
+    # ------------------------------------------------------------------
+    # 変換
+    # ------------------------------------------------------------------
+
+    def translated(self, dx: float, dy: float):
+        """平行移動したコピーを返します。"""
+        return PlateGeometry([(x + dx, y + dy) for x, y in self.outline],
+                             [(x + dx, y + dy, d) for x, y, d in self.holes],
+                             thickness=self.thickness, name=self.name)
+
+    def mirrored_x(self):
+        """外接矩形の中心線で左右反転したコピーを返します。"""
+        x0, _, x1, _ = self.bounding_box()
+        s = x0 + x1
+        return PlateGeometry([(s - x, y) for x, y in reversed(self.outline)],
+                             [(s - x, y, d) for x, y, d in self.holes],
+                             thickness=self.thickness, name=self.name)
+
+    def __repr__(self):
+        return (f'PlateGeometry({self.name!r}, {self.width:g}x{self.height:g}x{self.thickness:g}, '
+                f'holes={self.hole_count})')
+
+
+def _split_runs(values: list, ndigits: int) -> list:
+    """昇順の値をピッチが一定の区間に区切ります。"""
+    runs = [[values[0]]]
+    for v in values[1:]:
+        run = runs[-1]
+        if len(run) == 1 or round(v - run[-1], ndigits) == round(run[1] - run[0], ndigits):
+            run.append(v)
+        else:
+            runs.append([v])
+    return runs
+
+
+def _run_pitch(run: list) -> float:
+    return run[1] - run[0] if len(run) > 1 else 0.0
+
+
+def from_plate_table(plate_types: dict) -> dict:
+    """{名前: plate_data} の表を {名前: PlateGeometry} に変換します。"""
+    return {name: PlateGeometry.from_plate_data(data, name=name) for name, data in plate_types.items()}
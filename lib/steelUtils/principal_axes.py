@@ -0,0 +1,169 @@
+"""ボディの頂点（メッシュの節点）座標から部材の主軸と材長を求めます。
+
+座標は x, y, z を並べた1本の array('d') で受け取り、面から求めた軸
+（section_recognition.member_axes）への投影の範囲から材長と断面の中心を求めます。
+面から軸が求まらないときだけ、共分散行列の固有ベクトル（ヤコビ法）のうち分散の
+最も大きい向きを材軸 z にします。Fusion 360 の Python では
+NumPy を使えないため、3×3 の計算は標準ライブラリだけで行います。
+
+結果は frame_layout.MemberFrame（origin は材軸の始端の断面中心）で、カタログの
+メタデータ（mm）との変換に to_metadata / from_metadata を使います。
+"""
+
+import math
+from array import array
+
+from .frame_layout import MemberFrame
+
+# ヤコビ法の反復回数の上限と収束判定
+JACOBI_MAX_SWEEPS = 50
+JACOBI_EPSILON = 1e-12
+
+
+def _mean(coords) -> tuple:
+    n = len(coords) // 3
+    sx = sy = sz = 0.0
+    for i in range(0, 3 * n, 3):
+        sx += coords[i]
+        sy += coords[i + 1]
+        sz += coords[i + 2]
+    return sx / n, sy / n, sz / n
+
+
+def _covariance(coords):
+    """平均と共分散行列（3×3 の入れ子リスト）。"""
+    n = len(coords) // 3
+    mean = _mean(coords)
+    c = [[0.0] * 3 for _ in range(3)]
+    for i in range(0, 3 * n, 3):
+        d = (coords[i] - mean[0], coords[i + 1] - mean[1], coords[i + 2] - mean[2])
+        for r in range(3):
+            for k in range(r, 3):
+                c[r][k] += d[r] * d[k]
+    for r in range(3):
+        for k in range(r, 3):
+            c[r][k] /= n
+            c[k][r] = c[r][k]
+    return mean, c
+
+
+def _jacobi(a):
+    """対称 3×3 行列の固有値と固有ベクトル（列）を返します。"""
+    a = [row[:] for row in a]
+    v = [[1.0 if r == k else 0.0 for k in range(3)] for r in range(3)]
+    for _ in range(JACOBI_MAX_SWEEPS):
+        off = a[0][1] ** 2 + a[0][2] ** 2 + a[1][2] ** 2
+        if off <= JACOBI_EPSILON * (a[0][0] ** 2 + a[1][1] ** 2 + a[2][2] ** 2 + 1e-300):
+            break
+        for p, q in ((0, 1), (0, 2), (1, 2)):
+            if abs(a[p][q]) <= 1e-300:
+                continue
+            theta = (a[q][q] - a[p][p]) / (2.0 * a[p][q])
+            t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1.0))
+            c = 1.0 / math.sqrt(t * t + 1.0)
+            s = t * c
+            for k in range(3):
+                akp, akq = a[k][p], a[k][q]
+                a[k][p], a[k][q] = c * akp - s * akq, s * akp + c * akq
+            for k in range(3):
+                apk, aqk = a[p][k], a[q][k]
+                a[p][k], a[q][k] = c * apk - s * aqk, s * apk + c * aqk
+            for k in range(3):
+                vkp, vkq = v[k][p], v[k][q]
+                v[k][p], v[k][q] = c * vkp - s * vkq, s * vkp + c * vkq
+    values = [a[i][i] for i in range(3)]
+    vectors = [tuple(v[k][i] for k in range(3)) for i in range(3)]
+    return values, vectors
+
+
+def _canonical(v):
+    """向きの符号をそろえる（絶対値の最も大きい成分を正にする）。"""
+    k = max(range(3), key=lambda i: abs(v[i]))
+    return v if v[k] > 0 else (-v[0], -v[1], -v[2])
+
+
+def principal_axes(coords) -> tuple:
+    """座標の平均と主軸を分散の大きい順に返します。
+
+    Arguments:
+    coords -- x, y, z を並べた座標（array('d') やリスト, モデル単位）
+
+    Returns:
+    (平均, [第1主軸, 第2主軸, 第3主軸])。各主軸は単位ベクトル。
+    """
+    mean, c = _covariance(coords)
+    values, vectors = _jacobi(c)
+    order = sorted(range(3), key=lambda i: -values[i])
+    return mean, [_canonical(vectors[i]) for i in order]
+
+
+def _model_axes(z) -> tuple:
+    """材軸 z に直交する x / y。モデルの X 軸（z とほぼ平行なら Y 軸）を z に直交させて x にします。"""
+    e = (0.0, 1.0, 0.0) if abs(z[0]) > 0.9 else (1.0, 0.0, 0.0)
+    d = e[0] * z[0] + e[1] * z[1] + e[2] * z[2]
+    v = (e[0] - d * z[0], e[1] - d * z[1], e[2] - d * z[2])
+    n = math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+    x = (v[0] / n, v[1] / n, v[2] / n)
+    return x, (z[1] * x[2] - z[2] * x[1], z[2] * x[0] - z[0] * x[2], z[0] * x[1] - z[1] * x[0])
+
+
+def member_axis(coords, axes=None) -> MemberFrame:
+    """座標から部材の座標系（材軸 z、始端の断面中心が原点）と材長を求めます。点が足りなければ None。
+
+    Arguments:
+    coords -- x, y, z を並べた座標（モデル単位）
+    axes -- 面から求めた (x, y, z)（section_recognition.member_axes）。座標は範囲を求めるだけに使う
+
+    axes がなければ最後の手段として分散の最も大きい向きを材軸にします。断面の形と材長の
+    両方が分散に効くので（短い材や山形鋼では当てにならない）、x / y は主軸ではなく
+    モデルの軸を材軸に直交させた向きにします。
+    """
+    if len(coords) < 6:
+        return None
+    if axes is None:
+        mean, (z, _, _) = principal_axes(coords)
+        x, y = _model_axes(z)
+    else:
+        mean = _mean(coords)
+        x, y, z = axes
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+    for i in range(0, len(coords) - 2, 3):
+        d = (coords[i] - mean[0], coords[i + 1] - mean[1], coords[i + 2] - mean[2])
+        for k, axis in enumerate((x, y, z)):
+            t = d[0] * axis[0] + d[1] * axis[1] + d[2] * axis[2]
+            lo[k] = min(lo[k], t)
+            hi[k] = max(hi[k], t)
+    cx, cy = (lo[0] + hi[0]) / 2.0, (lo[1] + hi[1]) / 2.0
+    origin = tuple(m + cx * a + cy * b + lo[2] * c for m, a, b, c in zip(mean, x, y, z))
+    return MemberFrame(origin, x, y, z, hi[2] - lo[2])
+
+
+def box_coordinates(box_min, box_max) -> array:
+    """外接箱の8頂点の座標（メッシュが取れないときの代わり）。"""
+    coords = array('d')
+    for px in (box_min[0], box_max[0]):
+        for py in (box_min[1], box_max[1]):
+            for pz in (box_min[2], box_max[2]):
+                coords.extend((px, py, pz))
+    return coords
+
+
+def to_metadata(frame: MemberFrame, unit: float = 10.0) -> dict:
+    """カタログに保存する辞書（origin と length は mm）。"""
+    return {
+        'origin': [round(v * unit, 3) for v in frame.origin],
+        'x': [round(v, 6) for v in frame.x],
+        'y': [round(v, 6) for v in frame.y],
+        'z': [round(v, 6) for v in frame.z],
+        'length': round(frame.length * unit, 3),
+    }
+
+
+def from_metadata(data: dict, unit: float = 10.0) -> MemberFrame:
+    """カタログの辞書から MemberFrame（モデル単位）に戻します。形式が違えば None。"""
+    try:
+        return MemberFrame(tuple(v / unit for v in data['origin']), tuple(data['x']), tuple(data['y']),
+                           tuple(data['z']), data['length'] / unit)
+    except (KeyError, TypeError, ValueError):
+        return None
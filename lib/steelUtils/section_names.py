@@ -0,0 +1,75 @@
+"""形鋼の呼び名（カタログのモデル名）の解析。
+
+'H-200×100×5.5×8' のような名前を、形状の種類と寸法 (mm) に分解します。
+区切りは '×' のほか 'x' / 'X' / '*' も受け付けます。
+"""
+
+import re
+from collections import namedtuple
+
+# kind: 'H' / 'LH'(軽H) / 'C' / 'L' / 'BOX' / 'RC'(リップ溝形) / 'Z'(リップZ・軽Z) / 'HAT'(ハット) / 'PIPE' / 'FB'
+Section = namedtuple('Section', 'kind dims name')
+
+_SEP = re.compile(r'\s*[×xX*]\s*')
+_NUM = re.compile(r'(\d+(?:\.\d+)?)')
+
+# 接頭辞 → 種類（長いものから順に照合する）
+_PREFIXES = (
+    ('軽H-', 'LH'),
+    ('RC-', 'RC'),
+    ('RZ-', 'Z'),
+    ('ハット-', 'HAT'),
+    ('HAT-', 'HAT'),
+    ('FB-', 'FB'),
+    ('H-', 'H'),
+    ('C-', 'C'),
+    ('L-', 'L'),
+    ('Z-', 'Z'),
+    ('▢-', 'BOX'),
+    ('□-', 'BOX'),
+    ('Φ', 'PIPE'),
+    ('φ', 'PIPE'),
+    ('P-', 'PIPE'),
+)
+
+
+def _numbers(text: str) -> tuple:
+    values = []
+    for part in _SEP.split(text.strip()):
+        m = _NUM.search(part)
+        if not m:
+            return ()
+        values.append(float(m.group(1)))
+    return tuple(values)
+
+
+def parse_section_name(name: str):
+    """形鋼名を解析します。
+
+    Arguments:
+    name -- カタログのモデル名（'H-200×100×5.5×8'、'Φ267.4×6.6'、'FB-6t×50' など）
+
+    Returns:
+    Section(kind, dims, name)。解析できない名前は None。
+    FB は名前の順（'FB-6t×50' / 'FB-50×9'）によらず dims = (厚さ, 幅) に正規化します。
+    """
+    if not name:
+        return None
+    text = name.strip()
+    for prefix, kind in _PREFIXES:
+        if text.startswith(prefix):
+            dims = _numbers(text[len(prefix):])
+            if not dims:
+                return None
+            if kind == 'FB' and len(dims) >= 2:
+                dims = (min(dims[:2]), max(dims[:2])) + dims[2:]
+            return Section(kind, dims, name)
+    return None
+
+
+def parse_h_section(name: str):
+    """H形鋼名から (H, B, tw, tf) を返します。H形鋼でなければ None。"""
+    sec = parse_section_name(name)
+    if sec is None or sec.kind not in ('H', 'LH') or len(sec.dims) < 4:
+        return None
+    return sec.dims[:4]
@@ -0,0 +1,202 @@
+"""形鋼の断面積・単位重量・塗装面積の解析計算。
+
+形鋼名（section_names）の寸法から、種類ごとの式で断面積 (cm2)、単位重量 (kg/m)、
+1m あたりの塗装面積 (m2/m) を求めます。Fusion の物理プロパティ（ボディごとの質量計算）を
+使わずに重量・塗装面積・概算費用の集計ができるようにするためのものです。
+
+カタログ全体は table() で種類・寸法の数ごとに列（array('d')）へまとめて一度に計算し、
+名前の並びごとにキャッシュします。フィレット・角の丸みは次の近似で扱います。
+
+- 熱間圧延H形鋼: フィレット半径 r を JIS G 3192 の代表値に合わせた規則で決める
+- 溝形鋼: r1 = max(8, tf)、フランジ先端 r2 = r1 / 2
+- 山形鋼: フィレットと先端の丸みは打ち消し合うものとして無視
+- 角形鋼管: 外側の角 2.5t、内側の角 1.5t
+- 軽量形鋼（リップ溝形・リップZ・ハット・軽溝形・軽Z）: 内側の曲げ半径 t の板厚中心線で計算
+- 鋼管・平鋼・溶接軽量H形鋼: 丸みなし
+"""
+
+import math
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+from .plate_geometry import STEEL_DENSITY
+from .section_names import parse_section_name
+
+# area 断面積 (cm2)、weight 単位重量 (kg/m)、paint_area 塗装面積 (m2/m)
+SectionProperties = namedtuple('SectionProperties', 'kind area weight paint_area')
+
+# 名前の並びに対応する列。計算できない名前は kind が None で値は 0
+SectionTable = namedtuple('SectionTable', 'names kinds area weight paint_area')
+
+# 1本の角の丸みで失われる面積・周長の係数
+_CORNER_AREA = 1.0 - math.pi / 4.0
+_CORNER_LENGTH = 2.0 - math.pi / 2.0
+
+
+def h_fillet_radius(h: float, b: float, tw: float, tf: float) -> float:
+    """熱間圧延H形鋼のフィレット半径 (mm)。JIS G 3192 の代表値に合わせた近似です。"""
+    if b >= 400.0 or (h >= 390.0 and b >= 390.0):
+        return 22.0
+    if b >= 290.0 and h <= 310.0:
+        return 18.0
+    if h >= 275.0 or tf >= 11.0:
+        return 13.0
+    return 8.0
+
+
+def _hot_h(h, b, tw, tf):
+    area, perimeter = array('d'), array('d')
+    for hi, bi, twi, tfi in zip(h, b, tw, tf):
+        r = h_fillet_radius(hi, bi, twi, tfi)
+        area.append(2.0 * bi * tfi + (hi - 2.0 * tfi) * twi + 4.0 * _CORNER_AREA * r * r)
+        perimeter.append(2.0 * hi + 4.0 * bi - 2.0 * twi - 4.0 * _CORNER_LENGTH * r)
+    return area, perimeter
+
+
+def _welded_h(h, b, tw, tf):
+    area = array('d', (2.0 * bi * tfi + (hi - 2.0 * tfi) * twi for hi, bi, twi, tfi in zip(h, b, tw, tf)))
+    perimeter = array('d', (2.0 * hi + 4.0 * bi - 2.0 * twi for hi, bi, twi in zip(h, b, tw)))
+    return area, perimeter
+
+
+def _channel(h, b, tw, tf):
+    area, perimeter = array('d'), array('d')
+    for hi, bi, twi, tfi in zip(h, b, tw, tf):
+        r1 = max(8.0, tfi)
+        r2 = r1 / 2.0
+        area.append(2.0 * bi * tfi + (hi - 2.0 * tfi) * twi + 2.0 * _CORNER_AREA * (r1 * r1 - r2 * r2))
+        perimeter.append(2.0 * hi + 4.0 * bi - 2.0 * twi - 2.0 * _CORNER_LENGTH * (r1 + r2))
+    return area, perimeter
+
+
+def _angle(a, b, t):
+    area = array('d', ((ai + bi - ti) * ti for ai, bi, ti in zip(a, b, t)))
+    perimeter = array('d', (2.0 * (ai + bi) for ai, bi in zip(a, b)))
+    return area, perimeter
+
+
+def _box(h, b, t):
+    area, perimeter = array('d'), array('d')
+    for hi, bi, ti in zip(h, b, t):
+        outer, inner = 2.5 * ti, 1.5 * ti
+        area.append(2.0 * (hi + bi) * ti - 4.0 * ti * ti - 4.0 * _CORNER_AREA * (outer * outer - inner * inner))
+        perimeter.append(2.0 * (hi + bi) - 4.0 * _CORNER_LENGTH * outer)
+    return area, perimeter
+
+
+def _cold_formed(center, t, bends):
+    """板厚中心線の長さ（角を直角とした値）から、曲げ部の丸みを引いた断面積と周長。"""
+    area, perimeter = array('d'), array('d')
+    for li, ti in zip(center, t):
+        # 内側の曲げ半径 t のとき、1か所で中心線が (2 - π/2)(t + t/2) 短くなる
+        li -= bends * _CORNER_LENGTH * 1.5 * ti
+        area.append(li * ti)
+        perimeter.append(2.0 * li + 2.0 * ti)
+    return area, perimeter
+
+
+def _lipped(h, a, c, t):
+    # リップ溝形鋼・リップZ形鋼: H×A×C×t（ウェブ・フランジ2枚・リップ2枚、曲げ4か所）
+    return _cold_formed([hi + 2.0 * ai + 2.0 * ci - 4.0 * ti for hi, ai, ci, ti in zip(h, a, c, t)], t, 4)
+
+
+def _light_channel(h, a, t):
+    # 軽溝形鋼・軽Z形鋼: H×A×t（曲げ2か所）
+    return _cold_formed([hi + 2.0 * ai - 2.0 * ti for hi, ai, ti in zip(h, a, t)], t, 2)
+
+
+def _hat(h, a, b, t):
+    # ハット形鋼: H×A×B×t（A は頭部の幅、B はつばの幅、曲げ4か所）
+    return _cold_formed([ai + 2.0 * hi + 2.0 * bi - 4.0 * ti for hi, ai, bi, ti in zip(h, a, b, t)], t, 4)
+
+
+def _pipe(d, t):
+    area = array('d', (math.pi * (di - ti) * ti for di, ti in zip(d, t)))
+    perimeter = array('d', (math.pi * di for di in d))
+    return area, perimeter
+
+
+def _flat(t, w):
+    area = array('d', (ti * wi for ti, wi in zip(t, w)))
+    perimeter = array('d', (2.0 * (ti + wi) for ti, wi in zip(t, w)))
+    return area, perimeter
+
+
+# (種類, 寸法の数) → 列ごとの計算式。戻り値は (断面積 mm2, 周長 mm)
+_FORMULAS = {
+    ('H', 4): _hot_h,
+    ('LH', 4): _welded_h,
+    ('C', 4): _channel,
+    ('C', 3): _light_channel,
+    ('L', 3): _angle,
+    ('BOX', 3): _box,
+    ('RC', 4): _lipped,
+    ('Z', 4): _lipped,
+    ('Z', 3): _light_channel,
+    ('HAT', 4): _hat,
+    ('PIPE', 2): _pipe,
+    ('FB', 2): _flat,
+}
+
+
+@lru_cache(maxsize=16)
+def table(names: tuple) -> SectionTable:
+    """形鋼名の並びの断面性能をまとめて計算します（同じ並びは再計算しません）。
+
+    Arguments:
+    names -- 形鋼名のタプル（カタログのモデル名）
+
+    Returns:
+    SectionTable。値は names と同じ順の array('d')。
+    """
+    n = len(names)
+    kinds = [None] * n
+    area = array('d', bytes(8 * n))
+    weight = array('d', bytes(8 * n))
+    paint = array('d', bytes(8 * n))
+
+    # 種類・寸法の数ごとに寸法を列にまとめる
+    groups = {}
+    for i, name in enumerate(names):
+        section = parse_section_name(name)
+        if section is None:
+            continue
+        key = (section.kind, len(section.dims))
+        if key not in _FORMULAS:
+            continue
+        rows, columns = groups.setdefault(key, ([], [array('d') for _ in section.dims]))
+        rows.append(i)
+        for column, value in zip(columns, section.dims):
+            column.append(value)
+
+    for (kind, _), (rows, columns) in groups.items():
+        area_mm2, perimeter = _FORMULAS[(kind, len(columns))](*columns)
+        for i, a, p in zip(rows, area_mm2, perimeter):
+            kinds[i] = kind
+            area[i] = a / 100.0
+            weight[i] = a * STEEL_DENSITY * 1000.0
+            paint[i] = p / 1000.0
+    return SectionTable(tuple(names), kinds, area, weight, paint)
+
+
+@lru_cache(maxsize=None)
+def properties(name: str) -> SectionProperties:
+    """1つの形鋼名の断面性能。計算できない名前は None。"""
+    t = table((name,))
+    if t.kinds[0] is None:
+        return None
+    return SectionProperties(t.kinds[0], t.area[0], t.weight[0], t.paint_area[0])
+
+
+def describe(props: SectionProperties) -> str:
+    """'A=46.78cm² / 36.7kg/m / 塗装 1.17m²/m' のような説明。"""
+    if props is None:
+        return '寸法を読み取れない形鋼名です'
+    return f'A={props.area:.2f}cm² / {props.weight:.1f}kg/m / 塗装 {props.paint_area:.2f}m²/m'
+
+
+def clear_cache() -> None:
+    """計算済みの断面性能を破棄します。"""
+    table.cache_clear()
+    properties.cache_clear()
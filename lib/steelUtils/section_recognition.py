@@ -0,0 +1,235 @@
+"""インポートしたボディ（STEP/IGES など）の面から形鋼の種類と寸法を求めます。
+
+平面は法線の向きごとにまとめ、向きごとの面の位置（段）から材軸と断面を判定します。
+材軸方向は両端面の2段、断面方向は種類ごとに次の段になります（フィレットや角の丸みの
+曲面は判定に使いません）。
+
+- H: せい方向4段（中央が広い）、幅方向4段（中央 = ウェブ厚が狭い）
+- BOX: 両方向とも4段（中央が広い）
+- C: せい方向4段、幅方向3段（ウェブ背・ウェブ内面・フランジ先端）
+- L: 両方向とも3段
+- PIPE: 側面に平面がなく、材軸と同じ向きの円筒面（外面・内面）
+
+寸法は section_names と同じ順 (mm) で、形鋼カタログと同じ書式の名前にできます。
+"""
+
+import math
+from collections import namedtuple
+
+# kind は section_names.Section と同じ記号。origin は材軸上で z = 0 の点（断面の外接矩形の中心）、
+# x / y / z は幅方向・せい方向・材軸、start / end は origin から材軸方向の範囲（モデル単位）、
+# end_faces は始端・終端の面の番号（planes の並び。パイプで端面がなければ None）
+RecognizedSection = namedtuple('RecognizedSection', 'kind dims origin x y z start end end_faces')
+
+# 同じ平面とみなす位置の許容差（モデル単位）、直交とみなす内積
+PLANE_TOLERANCE = 0.005
+ORTHOGONAL_TOLERANCE = 1e-3
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _unit(v):
+    n = math.sqrt(_dot(v, v))
+    return (v[0] / n, v[1] / n, v[2] / n) if n > 1e-12 else None
+
+
+def _canonical(v):
+    """向きの符号をそろえる（z、y、x の順に最初の非ゼロ成分を正にする）。"""
+    for c in (v[2], v[1], v[0]):
+        if abs(c) > 1e-9:
+            return v if c > 0 else (-v[0], -v[1], -v[2])
+    return v
+
+
+def _levels(values, tolerance):
+    """[(位置, 面番号), ...] を許容差でまとめ、[(位置, [面番号...]), ...] を昇順に返します。"""
+    levels = []
+    for v, i in sorted(values):
+        if levels and v - levels[-1][0] <= tolerance:
+            levels[-1][1].append(i)
+        else:
+            levels.append((v, [i]))
+    return levels
+
+
+def _group_planes(planes, tolerance):
+    """平面を法線の向きごとにまとめます。{キー: (向き, 段の一覧)}"""
+    groups = {}
+    for i, (point, normal) in enumerate(planes):
+        u = _unit(normal)
+        if u is None:
+            continue
+        u = _canonical(u)
+        key = tuple(round(c, 3) for c in u)
+        groups.setdefault(key, (u, []))[1].append((_dot(point, u), i))
+    return {key: (u, _levels(values, tolerance)) for key, (u, values) in groups.items()}
+
+
+def _gaps(offsets):
+    return [q - p for p, q in zip(offsets, offsets[1:])]
+
+
+def _classify(first, second, unit, tolerance):
+    """断面方向2つの段から (種類, 寸法, せい方向, 幅方向のオフセット, せい方向のオフセット)。"""
+    (u1, o1), (u2, o2) = first, second
+    n1, n2 = len(o1), len(o2)
+    mm = lambda v: round(v * unit, 1)
+    if n1 == 4 and n2 == 4:
+        wide1 = _gaps(o1)[1] > _gaps(o1)[0] + tolerance
+        wide2 = _gaps(o2)[1] > _gaps(o2)[0] + tolerance
+        if wide1 and wide2:
+            # 角形鋼管: せい方向は外寸の大きい方
+            (uy, oy), (ux, ox) = (first, second) if o1[3] - o1[0] >= o2[3] - o2[0] else (second, first)
+            return 'BOX', (mm(oy[3] - oy[0]), mm(ox[3] - ox[0]), mm(oy[1] - oy[0])), uy, ox, oy
+        if wide1 == wide2:
+            return None
+        (uy, oy), (ux, ox) = (first, second) if wide1 else (second, first)
+        return 'H', (mm(oy[3] - oy[0]), mm(ox[3] - ox[0]), mm(ox[2] - ox[1]), mm(oy[1] - oy[0])), uy, ox, oy
+    if {n1, n2} == {3, 4}:
+        (uy, oy), (ux, ox) = (first, second) if n1 == 4 else (second, first)
+        return 'C', (mm(oy[3] - oy[0]), mm(ox[2] - ox[0]), mm(min(_gaps(ox))), mm(oy[1] - oy[0])), uy, ox, oy
+    if n1 == 3 and n2 == 3:
+        # 山形鋼: 長い辺をせい方向にする
+        (uy, oy), (ux, ox) = (first, second) if o1[2] - o1[0] >= o2[2] - o2[0] else (second, first)
+        return 'L', (mm(oy[2] - oy[0]), mm(ox[2] - ox[0]), mm(min(_gaps(oy)))), uy, ox, oy
+    return None
+
+
+def _pipe(groups, cylinders, unit, tolerance):
+    """側面に平面がないボディを鋼管として判定します。"""
+    if not cylinders or len(groups) > 1:
+        return None
+    z = _canonical(_unit(cylinders[0][1]))
+    radii = []
+    center = cylinders[0][0]
+    for origin, axis, radius in cylinders:
+        a = _unit(axis)
+        if a is None or abs(abs(_dot(a, z)) - 1.0) > ORTHOGONAL_TOLERANCE:
+            return None
+        d = tuple(p - q for p, q in zip(origin, center))
+        t = _dot(d, z)
+        off = tuple(v - t * c for v, c in zip(d, z))
+        if math.sqrt(_dot(off, off)) > tolerance:
+            return None
+        radii.append(radius)
+    r_out, r_in = max(radii), min(radii)
+    if r_out - r_in <= tolerance:
+        return None
+
+    t0 = _dot(center, z)
+    origin = tuple(p - t0 * c for p, c in zip(center, z))
+    end_faces = None
+    if groups:
+        u, levels = next(iter(groups.values()))
+        if abs(abs(_dot(u, z)) - 1.0) > ORTHOGONAL_TOLERANCE or len(levels) != 2:
+            return None
+        start, end = levels[0][0], levels[1][0]
+        end_faces = (levels[0][1][0], levels[1][1][0])
+    else:
+        start = end = 0.0
+    ref = (0.0, 0.0, 1.0) if abs(z[2]) < 0.999 else (0.0, 1.0, 0.0)
+    y = _unit(tuple(r - _dot(ref, z) * c for r, c in zip(ref, z)))
+    x = _cross(y, z)
+    dims = (round(2.0 * r_out * unit, 1), round((r_out - r_in) * unit, 1))
+    return RecognizedSection('PIPE', dims, origin, x, y, z, start, end, end_faces)
+
+
+def recognize(planes, cylinders=(), unit: float = 10.0, tolerance: float = PLANE_TOLERANCE):
+    """ボディの面から形鋼の種類・寸法・材軸を求めます。
+
+    Arguments:
+    planes -- [(面上の点, 法線), ...]（モデル単位）
+    cylinders -- [(軸上の点, 軸の向き, 半径), ...]。鋼管の判定にだけ使う
+    unit -- 1 モデル単位あたりの mm（cm なら 10）
+
+    Returns:
+    RecognizedSection。判定できなければ None。
+    """
+    groups = _group_planes(planes, tolerance)
+    pipe = _pipe(groups, list(cylinders), unit, tolerance)
+    if pipe is not None or len(groups) != 3:
+        return pipe
+
+    # 材軸は端面の2段で、ほかの2方向と直交する向き
+    items = list(groups.values())
+    for k, (z, levels) in enumerate(items):
+        others = [items[j] for j in range(3) if j != k]
+        if len(levels) == 2 and all(abs(_dot(z, u)) <= ORTHOGONAL_TOLERANCE for u, _ in others):
+            break
+    else:
+        return None
+    (u1, l1), (u2, l2) = others
+    if abs(_dot(u1, u2)) > ORTHOGONAL_TOLERANCE:
+        return None
+    found = _classify((u1, [v for v, _ in l1]), (u2, [v for v, _ in l2]), unit, tolerance)
+    if found is None:
+        return None
+    kind, dims, y, ox, oy = found
+    nx = u1 if y is u2 else u2
+    x = _cross(y, z)
+    # 断面の外接矩形の中心。x は ±nx なので、幅方向の位置は nx で組み立てる
+    cy = (oy[0] + oy[-1]) / 2.0
+    cx = (ox[0] + ox[-1]) / 2.0
+    origin = tuple(cy * a + cx * b for a, b in zip(y, nx))
+    return RecognizedSection(kind, dims, origin, x, y, z, levels[0][0], levels[1][0],
+                             (levels[0][1][0], levels[1][1][0]))
+
+
+def member_axes(planes, cylinders=(), tolerance: float = PLANE_TOLERANCE):
+    """ボディの面から部材の軸 (x, y, z) を求めます。
+
+    形鋼と判定できれば recognize と同じ幅方向・せい方向・材軸です。判定できない断面
+    （Z・ハット・リップ溝形・平鋼など）でも、2段の平面の向きがほかの平面すべてと直交していれば
+    それを端面とみなして材軸 z にし（候補が複数なら2段の間隔の最も長いもの）、側面の向きのうち
+    段の範囲の最も広いものをせい方向 y にします。端面が見つからなければ None。
+    """
+    section = recognize(planes, cylinders, tolerance=tolerance)
+    if section is not None:
+        return section.x, section.y, section.z
+    items = list(_group_planes(planes, tolerance).values())
+    best = None
+    for k, (z, levels) in enumerate(items):
+        others = [items[j] for j in range(len(items)) if j != k]
+        if len(levels) != 2 or not others or any(abs(_dot(z, u)) > ORTHOGONAL_TOLERANCE for u, _ in others):
+            continue
+        span = levels[1][0] - levels[0][0]
+        if best is None or span > best[0]:
+            best = (span, z, others)
+    if best is None:
+        return None
+    _, z, others = best
+    y, _ = max(others, key=lambda item: item[1][-1][0] - item[1][0][0])
+    return _cross(y, z), y, z
+
+
+def section_name(section: RecognizedSection) -> str:
+    """形鋼カタログと同じ書式の名前（'H-300×150×6.5×9'、'▢-150×100×4.5'、'Φ267.4×6.6' など）。"""
+    d = section.dims
+    if section.kind == 'PIPE':
+        return f'Φ{d[0]:g}×{d[1]:g}'
+    if section.kind == 'BOX':
+        return f'▢-{d[0]:g}×{d[1]:g}×{d[2]:.1f}'
+    return f'{section.kind}-' + '×'.join(f'{v:g}' for v in d)
+
+
+def length(section: RecognizedSection) -> float:
+    """材長（モデル単位）。"""
+    return section.end - section.start
+
+
+def fingerprint(face_count: int, box_min, box_max, ndigits: int = 4) -> tuple:
+    """ボディの形状の指紋（面の数と外接箱, モデル単位）。
+
+    長さなどを変えると別の指紋になるので、キャッシュした認識結果が古くなったことを見分けられます。
+    外径と長さが同じで肉厚だけが違う鋼管などは同じ指紋になるため、別のボディの区別には
+    使えません（ボディの entityToken などと組み合わせます）。
+    """
+    return (face_count,
+            tuple(round(v, ndigits) for v in box_min),
+            tuple(round(v, ndigits) for v in box_max))
@@ -0,0 +1,167 @@
+"""H形鋼の継手の認識と、スプライスプレートの配置計算。
+
+section_recognition で認識したH形鋼の材軸・せい方向・フランジ幅方向と
+断面寸法 (h, b, tw, tf) を使います。同じ材軸に並ぶ2本の部材の向かい合う端、
+または1本の部材上の指定位置を継手とし、splice_rules のプレートを
+フランジ外側（上下）・フランジ内側（4枚）・ウェブ（両面）に並べた配置行列を
+役割ごとに array('d') にまとめて返します。長さはモデル単位、断面寸法は mm です。
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+from . import transforms
+
+# 認識したH形鋼。origin は材軸上で z = 0 の点（断面の中心）、x はフランジ幅方向、
+# y はせい方向、z は材軸。start / end は origin から材軸方向の範囲（モデル単位）
+HSection = namedtuple('HSection', 'origin x y z h b tw tf start end')
+
+# 継手。origin は継手位置の断面中心、gap は部材端の隙間 (mm)
+SpliceJoint = namedtuple('SpliceJoint', 'origin x y z section gap')
+
+# 同じ向きとみなす内積
+PARALLEL_TOLERANCE = 0.999
+
+# 同じ材軸とみなす距離 (mm) と、継手とみなす部材端の隙間の上限 (mm)
+AXIS_TOLERANCE = 1.0
+MAX_JOINT_GAP = 50.0
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def h_section(section) -> HSection:
+    """section_recognition.recognize の結果をH形鋼の断面にします。H形鋼でなければ None。"""
+    if section is None or section.kind != 'H':
+        return None
+    h, b, tw, tf = section.dims
+    return HSection(section.origin, section.x, section.y, section.z, h, b, tw, tf, section.start, section.end)
+
+
+def section_name(section: HSection) -> str:
+    """'H-300×150×6.5×9' 形式の名前（形鋼カタログと同じ書式）。"""
+    return f'H-{section.h:g}×{section.b:g}×{section.tw:g}×{section.tf:g}'
+
+
+def transformed(section: HSection, matrix) -> HSection:
+    """ボディ座標で認識した断面を、オカレンスの変換でモデル座標に移します。"""
+    o = transforms.apply(matrix, section.origin)
+    base = transforms.apply(matrix, (0.0, 0.0, 0.0))
+
+    def rotate(v):
+        p = transforms.apply(matrix, v)
+        return (p[0] - base[0], p[1] - base[1], p[2] - base[2])
+
+    return section._replace(origin=o, x=rotate(section.x), y=rotate(section.y), z=rotate(section.z))
+
+
+def _point_on_axis(section: HSection, t: float) -> tuple:
+    return tuple(o + t * z for o, z in zip(section.origin, section.z))
+
+
+def _same_section(a: HSection, b: HSection, tolerance: float = 0.5) -> bool:
+    return all(abs(p - q) <= tolerance for p, q in zip((a.h, a.b, a.tw, a.tf), (b.h, b.b, b.tw, b.tf)))
+
+
+def joint_between(a: HSection, b: HSection, unit: float = 10.0,
+                  max_gap: float = MAX_JOINT_GAP) -> SpliceJoint:
+    """同じ材軸・同じ断面で向かい合う2本の部材の継手。継手にならなければ None。
+
+    継手の座標系は a の向きで、原点は向かい合う端の中間です。
+    """
+    if abs(_dot(a.z, b.z)) < PARALLEL_TOLERANCE or abs(_dot(a.y, b.y)) < PARALLEL_TOLERANCE:
+        return None
+    if not _same_section(a, b):
+        return None
+    d = tuple(p - q for p, q in zip(b.origin, a.origin))
+    t = _dot(d, a.z)
+    off = tuple(v - t * z for v, z in zip(d, a.z))
+    if math.sqrt(_dot(off, off)) * unit > AXIS_TOLERANCE:
+        return None
+
+    # b の範囲を a の材軸上の位置に直す
+    s = 1.0 if _dot(a.z, b.z) > 0 else -1.0
+    lo, hi = sorted((t + s * b.start, t + s * b.end))
+    if lo >= a.end - 1e-9:
+        gap, at = lo - a.end, (a.end + lo) / 2.0
+    elif hi <= a.start + 1e-9:
+        gap, at = a.start - hi, (hi + a.start) / 2.0
+    else:
+        return None
+    if gap * unit > max_gap:
+        return None
+    return SpliceJoint(_point_on_axis(a, at), a.x, a.y, a.z, a, round(gap * unit, 1))
+
+
+def joint_at(section: HSection, point) -> SpliceJoint:
+    """1本の部材上の位置（分割した面の境界など）を継手にします。位置は材軸へ投影します。"""
+    d = tuple(p - o for p, o in zip(point, section.origin))
+    t = min(max(_dot(d, section.z), section.start), section.end)
+    return SpliceJoint(_point_on_axis(section, t), section.x, section.y, section.z, section, 0.0)
+
+
+def find_joints(sections, unit: float = 10.0, max_gap: float = MAX_JOINT_GAP) -> list:
+    """選択した部材の中から、同じ材軸で向かい合う組をすべて継手にします。"""
+    joints = []
+    for i, a in enumerate(sections):
+        for b in sections[i + 1:]:
+            joint = joint_between(a, b, unit, max_gap)
+            if joint is not None:
+                joints.append(joint)
+    return joints
+
+
+def _plate_placements(section: HSection, plates: dict, unit: float):
+    """継手座標系での各プレートの配置 (役割, 原点の (x, y, z), プレートの x, y, z 軸)。
+
+    プレートは原点を左下として x = 長さ（材軸方向）、y = 幅、z = 板厚の向きに作られる前提です。
+    上下・左右のプレートは回転で向きを変え、穴の並びが母材に対して対称になるようにします。
+    """
+    h, b, tw, tf = (v / unit for v in (section.h, section.b, section.tw, section.tf))
+    X, Y, Z = (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)
+
+    def neg(v):
+        return (-v[0], -v[1], -v[2])
+
+    outer = plates.get('flange_outer')
+    if outer:
+        half = outer['width'] / unit / 2.0
+        # 上フランジの外面から上へ、下フランジの外面から下へ
+        yield 'flange_outer', (-b / 2.0, h / 2.0, -half), Z, X, Y
+        yield 'flange_outer', (b / 2.0, -h / 2.0, -half), Z, neg(X), neg(Y)
+    inner = plates.get('flange_inner')
+    if inner:
+        half = inner['width'] / unit / 2.0
+        yi = h / 2.0 - tf
+        # 穴の y はフランジの縁から測るので、プレートの y は縁からウェブへ向ける
+        yield 'flange_inner', (b / 2.0, yi, -half), Z, neg(X), neg(Y)
+        yield 'flange_inner', (-b / 2.0, yi, half), neg(Z), X, neg(Y)
+        yield 'flange_inner', (b / 2.0, -yi, half), neg(Z), neg(X), Y
+        yield 'flange_inner', (-b / 2.0, -yi, -half), Z, X, Y
+    web = plates.get('web')
+    if web:
+        half = web['width'] / unit / 2.0
+        hw = web['height'] / unit / 2.0
+        yield 'web', (tw / 2.0, hw, -half), Z, neg(Y), X
+        yield 'web', (-tw / 2.0, -hw, -half), Z, Y, neg(X)
+
+
+def plate_frames(joint: SpliceJoint, plates: dict, unit: float = 10.0) -> dict:
+    """継手にプレートを並べる配置行列を役割ごとにまとめます。
+
+    Arguments:
+    joint -- SpliceJoint
+    plates -- splice_rules.splice_plates_for の結果
+    unit -- 1 モデル単位あたりの mm
+
+    Returns:
+    {役割: array('d')}（役割は splice_rules.PLATE_ROLES の順）。
+    """
+    to_model = transforms.frame(joint.origin, joint.x, joint.y, joint.z)
+    batches = {}
+    for role, origin, px, py, pz in _plate_placements(joint.section, plates, unit):
+        local = transforms.frame(origin, px, py, pz)
+        batches.setdefault(role, array('d')).extend(transforms.multiply(to_model, local))
+    return batches
@@ -0,0 +1,219 @@
+"""H形鋼の寸法から継手のスプライスプレートを求めるルールエンジン。
+
+フランジ外側・フランジ内側・ウェブの各プレートを SPLICE_PLATE_TYPES と同じ
+辞書形式 (mm) で返します。必要ボルト本数は、フランジは引張（長期許容応力度
+F/1.5 × フランジ断面積）、ウェブはせん断（F/(1.5√3) × ウェブ断面積）を、
+高力ボルトの長期許容すべり耐力（2面摩擦。内側の添え板がないフランジは
+外側1枚の1面摩擦）で割って求めます。板厚は添え板の断面積が母材の断面積以上に
+なる最小の規格板厚です。
+結果は断面寸法とルールの組ごとにメモ化されます。
+"""
+
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+from .section_names import parse_h_section
+
+SpliceRules = namedtuple('SpliceRules', [
+    'bolts',             # ((フランジ幅の上限, ボルト呼び, 軸径), ...) フランジ幅の昇順
+    'slip_capacity',     # ((ボルト呼び, 1面あたり長期許容すべり耐力 kN), ...) F10T
+    'min_edge',          # ((ボルト呼び, 最小縁端距離 mm), ...)
+    'hole_clearance',    # 穴径 = 軸径 + hole_clearance
+    'pitch',             # ボルトピッチ
+    'edge',              # 標準の縁端距離
+    'joint_gap',         # 継手をはさむボルト列の間隔
+    'gauges',            # ((フランジ幅, ゲージ g1), ...) 該当がなければ 0.6B
+    'web_clearance',     # ウェブプレートとフィレットの隙間
+    'thicknesses',       # 使用する板厚の一覧
+    'flange_min_thickness',
+    'web_min_thickness',
+    'steel_f',           # 鋼材の基準強度 F (N/mm2)
+])
+
+DEFAULT_RULES = SpliceRules(
+    bolts=((149.0, 'M16', 16.0), (249.0, 'M20', 20.0), (math.inf, 'M22', 22.0)),
+    slip_capacity=(('M16', 30.2), ('M20', 47.1), ('M22', 57.0), ('M24', 67.9)),
+    min_edge=(('M16', 22.0), ('M20', 26.0), ('M22', 28.0), ('M24', 32.0)),
+    hole_clearance=2.0,
+    pitch=60.0,
+    edge=40.0,
+    joint_gap=85.0,
+    gauges=((100.0, 60.0), (125.0, 75.0), (150.0, 90.0), (175.0, 105.0), (200.0, 120.0),
+            (250.0, 150.0), (300.0, 150.0)),
+    web_clearance=5.0,
+    thicknesses=(6.0, 9.0, 12.0, 16.0, 19.0, 22.0, 25.0, 28.0, 32.0),
+    flange_min_thickness=9.0,
+    web_min_thickness=6.0,
+    steel_f=235.0,
+)
+
+# プレートの役割と、生成したプレート名の接尾辞
+PLATE_ROLES = (
+    ('flange_outer', 'フランジ外'),
+    ('flange_inner', 'フランジ内'),
+    ('web', 'ウェブ'),
+)
+
+
+def default_fillet_radius(h: float, b: float) -> float:
+    """JIS G 3192 の代表的なフィレット半径 r を返します。"""
+    if h >= 700:
+        return 18.0
+    if h < 300 and b < 175:
+        return 8.0
+    return 13.0
+
+
+def select_bolt(b: float, rules: SpliceRules = DEFAULT_RULES) -> tuple:
+    """フランジ幅からボルト (呼び, 軸径) を選びます。"""
+    for limit, name, dia in rules.bolts:
+        if b <= limit:
+            return name, dia
+    return rules.bolts[-1][1], rules.bolts[-1][2]
+
+
+def flange_gauge(b: float, rules: SpliceRules = DEFAULT_RULES) -> float:
+    """フランジのゲージ g1 を返します。"""
+    for width, g in rules.gauges:
+        if abs(width - b) < 0.5:
+            return g
+    return round(0.6 * b / 5.0) * 5.0
+
+
+def _pick_thickness(required: float, minimum: float, rules: SpliceRules) -> float:
+    need = max(required, minimum)
+    for t in rules.thicknesses:
+        if t >= need - 1e-9:
+            return t
+    return rules.thicknesses[-1]
+
+
+def _bolt_columns(x_edge: float, cols: int, rules: SpliceRules) -> tuple:
+    """継手をはさんで左右対称に並ぶボルト列の x 座標と板の長さ。"""
+    p = rules.pitch
+    left = [x_edge + i * p for i in range(cols)]
+    x_right0 = left[-1] + rules.joint_gap
+    right = [x_right0 + i * p for i in range(cols)]
+    length = right[-1] + x_edge
+    return left + right, length
+
+
+@lru_cache(maxsize=None)
+def _generate(h: float, b: float, tw: float, tf: float, r: float, rules: SpliceRules) -> tuple:
+    bolt, d = select_bolt(b, rules)
+    hole = d + rules.hole_clearance
+    rs = dict(rules.slip_capacity)[bolt] * 1000.0   # N / 1面
+    min_edge = dict(rules.min_edge)[bolt]
+    f = rules.steel_f
+
+    # --- フランジ ---
+    af = b * tf
+    g = flange_gauge(b, rules)
+    y_edge = (b - g) / 2.0
+    if y_edge >= min_edge:
+        ys = (y_edge, b - y_edge)
+    else:
+        # フランジが狭くゲージ2列が取れない場合は中央1列
+        y_edge = b / 2.0
+        ys = (y_edge,)
+    inner_w = round((b - tw - 2.0 * r) / 2.0 / 5.0) * 5.0
+    has_inner = len(ys) == 2 and inner_w >= 2.0 * min_edge and inner_w - y_edge >= min_edge
+
+    # 内側の添え板がなければ外側1枚だけなので摩擦面は1面
+    planes = 2 if has_inner else 1
+    n_flange = max(1, math.ceil(af * f / 1.5 / (planes * rs)))
+    cols = max(2, math.ceil(n_flange / len(ys)))
+    xs, length = _bolt_columns(rules.edge, cols, rules)
+
+    # 添え板の断面積（外側＋内側2枚）がフランジ断面積以上になる板厚
+    area_per_t = b + (2.0 * inner_w if has_inner else 0.0)
+    t_flange = _pick_thickness(af / area_per_t, rules.flange_min_thickness, rules)
+
+    outer = {
+        'width': length, 'height': b, 'thickness': t_flange, 'hole_dia': hole, 'bolt': bolt,
+        'holes': [(x, y) for y in ys for x in xs],
+    }
+    inner = None
+    if has_inner:
+        inner = {
+            'width': length, 'height': inner_w, 'thickness': t_flange, 'hole_dia': hole, 'bolt': bolt,
+            'holes': [(x, y_edge) for x in xs],
+        }
+
+    # --- ウェブ ---
+    web = None
+    aw = (h - 2.0 * tf) * tw
+    n_web = max(1, math.ceil(aw * f / (1.5 * math.sqrt(3.0)) / (2.0 * rs)))
+    clear = h - 2.0 * tf - 2.0 * r - 2.0 * rules.web_clearance
+    p = rules.pitch
+    rows = int((clear - 2.0 * rules.edge) // p) + 1 if clear >= 2.0 * rules.edge else 1
+    y_edge_w = rules.edge
+    while rows > 0:
+        y_edge_w = min(rules.edge, (clear - (rows - 1) * p) / 2.0)
+        if y_edge_w >= min_edge:
+            break
+        rows -= 1
+    if rows > 0:
+        web_cols = max(1, math.ceil(n_web / rows))
+        wxs, wlength = _bolt_columns(rules.edge, web_cols, rules)
+        height = 2.0 * y_edge_w + (rows - 1) * p
+        t_web = _pick_thickness(aw / (2.0 * height), rules.web_min_thickness, rules)
+        web = {
+            'width': wlength, 'height': height, 'thickness': t_web, 'hole_dia': hole, 'bolt': bolt,
+            'holes': [(x, y_edge_w + j * p) for j in range(rows) for x in wxs],
+        }
+
+    return (('flange_outer', outer), ('flange_inner', inner), ('web', web))
+
+
+def _copy_plate(plate):
+    if plate is None:
+        return None
+    data = dict(plate)
+    data['holes'] = list(plate['holes'])
+    return data
+
+
+def splice_plates_for(h: float, b: float, tw: float, tf: float, r: float = None,
+                      rules: SpliceRules = DEFAULT_RULES) -> dict:
+    """H形鋼の寸法から継手プレートを求めます。
+
+    Arguments:
+    h, b, tw, tf -- 梁せい・フランジ幅・ウェブ厚・フランジ厚 (mm)
+    r -- フィレット半径。省略時は default_fillet_radius
+    rules -- SpliceRules
+
+    Returns:
+    {'flange_outer': dict, 'flange_inner': dict または None, 'web': dict または None}
+    各 dict は SPLICE_PLATE_TYPES と同じ形式で、'bolt'（ボルト呼び）を含みます。
+    """
+    if r is None:
+        r = default_fillet_radius(h, b)
+    plates = _generate(float(h), float(b), float(tw), float(tf), float(r), rules)
+    return {role: _copy_plate(plate) for role, plate in plates}
+
+
+def splice_plates_for_section(section_name: str, rules: SpliceRules = DEFAULT_RULES) -> dict:
+    """'H-200×100×5.5×8' 形式の名前から継手プレートを求めます。H形鋼でなければ {}。"""
+    dims = parse_h_section(section_name)
+    if dims is None:
+        return {}
+    return splice_plates_for(*dims, rules=rules)
+
+
+def splice_plate_table(section_names, rules: SpliceRules = DEFAULT_RULES) -> dict:
+    """複数の形鋼名から {'<形鋼名> <役割>': plate_data} の表を作ります。"""
+    table = {}
+    for name in section_names:
+        plates = splice_plates_for_section(name, rules)
+        for role, suffix in PLATE_ROLES:
+            plate = plates.get(role)
+            if plate is not None:
+                table[f'{name} {suffix}'] = plate
+    return table
+
+
+def clear_cache() -> None:
+    """メモ化した結果を破棄します。"""
+    _generate.cache_clear()
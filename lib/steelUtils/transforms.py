@@ -0,0 +1,114 @@
+"""配置用の 4×4 変換行列の計算。
+
+行列は Matrix3D.asArray() / setWithArray() と同じ行優先の 16 要素で扱います
+（回転の各列が x, y, z 軸、平行移動は第4列）。座標系の合成・スケール・平行移動を
+Python 側で済ませ、API には配置ごとに setWithArray を1回だけ渡します。
+N 本の部材の行列は array('d') に 16 要素ずつ並べて一度に作ります。
+"""
+
+from array import array
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0)
+
+
+def frame(origin, x, y, z) -> tuple:
+    """原点と3軸から座標系の行列（Matrix3D.setWithCoordinateSystem と同じ）。"""
+    return (x[0], y[0], z[0], origin[0],
+            x[1], y[1], z[1], origin[1],
+            x[2], y[2], z[2], origin[2],
+            0.0, 0.0, 0.0, 1.0)
+
+
+def translation(offset) -> tuple:
+    """平行移動の行列。"""
+    return (1.0, 0.0, 0.0, offset[0],
+            0.0, 1.0, 0.0, offset[1],
+            0.0, 0.0, 1.0, offset[2],
+            0.0, 0.0, 0.0, 1.0)
+
+
+def scaling(sx: float, sy: float = None, sz: float = None) -> tuple:
+    """軸ごとのスケール行列。sy, sz を省略すると sx で一様にスケールします。"""
+    sy = sx if sy is None else sy
+    sz = sx if sz is None else sz
+    return (sx, 0.0, 0.0, 0.0,
+            0.0, sy, 0.0, 0.0,
+            0.0, 0.0, sz, 0.0,
+            0.0, 0.0, 0.0, 1.0)
+
+
+def multiply(a, b) -> tuple:
+    """a × b（b を先に適用）。"""
+    return tuple(a[r] * b[c] + a[r + 1] * b[c + 4] + a[r + 2] * b[c + 8] + a[r + 3] * b[c + 12]
+                 for r in (0, 4, 8, 12) for c in range(4))
+
+
+def compose(*matrices) -> tuple:
+    """compose(a, b, c) = a × b × c（右から順に適用）。"""
+    result = IDENTITY
+    for m in matrices:
+        result = multiply(result, m)
+    return result
+
+
+def inverse(m) -> tuple:
+    """回転と平行移動だけの行列の逆行列（回転部分を転置し、平行移動を戻す）。"""
+    t = (m[3], m[7], m[11])
+    return (m[0], m[4], m[8], -(m[0] * t[0] + m[4] * t[1] + m[8] * t[2]),
+            m[1], m[5], m[9], -(m[1] * t[0] + m[5] * t[1] + m[9] * t[2]),
+            m[2], m[6], m[10], -(m[2] * t[0] + m[6] * t[1] + m[10] * t[2]),
+            0.0, 0.0, 0.0, 1.0)
+
+
+def with_translation(m, point) -> tuple:
+    """回転部分はそのままで、平行移動を point に置き換えた行列（最終行は 0, 0, 0, 1）。"""
+    return (m[0], m[1], m[2], point[0],
+            m[4], m[5], m[6], point[1],
+            m[8], m[9], m[10], point[2],
+            0.0, 0.0, 0.0, 1.0)
+
+
+def scale_linear(m, factor: float) -> tuple:
+    """回転・スケール部分（上 3×3）だけを factor 倍した行列。平行移動は変えません。"""
+    return (m[0] * factor, m[1] * factor, m[2] * factor, m[3],
+            m[4] * factor, m[5] * factor, m[6] * factor, m[7],
+            m[8] * factor, m[9] * factor, m[10] * factor, m[11],
+            m[12], m[13], m[14], m[15])
+
+
+def apply(m, point) -> tuple:
+    """点 (x, y, z) を変換します。"""
+    x, y, z = point
+    return (m[0] * x + m[1] * y + m[2] * z + m[3],
+            m[4] * x + m[5] * y + m[6] * z + m[7],
+            m[8] * x + m[9] * y + m[10] * z + m[11])
+
+
+def frames(members, local=None) -> array:
+    """部材の座標系（origin, x, y, z を持つもの。MemberFrame など）を行列に並べます。
+
+    Arguments:
+    members -- 座標系の一覧
+    local -- 各部材に共通で先に適用するローカル変換（オフセット・スケールなど）
+
+    Returns:
+    16 要素ずつ並べた array('d')。i 本目は item(batch, i) で取り出します。
+    """
+    batch = array('d')
+    for f in members:
+        m = frame(f.origin, f.x, f.y, f.z)
+        batch.extend(multiply(m, local) if local is not None else m)
+    return batch
+
+
+def count(batch) -> int:
+    """まとめた行列の本数。"""
+    return len(batch) // 16
+
+
+def item(batch, i: int) -> tuple:
+    """まとめた行列の i 本目（setWithArray に渡せる 16 要素）。"""
+    return tuple(batch[i * 16:(i + 1) * 16])
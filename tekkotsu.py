@@ -1,6 +1,7 @@
 # Assuming you have not changed the general structure of the template no modification is needed in this file.
-from . import commands
 from .lib import fusionAddInUtils as futil
+with futil.profile_step('addin', 'import commands'):
+    from . import commands
 from pathlib import Path
 import base64
 import os
@@ -22,13 +23,17 @@ def _ensure_png_icons():
 
 def run(context):
     try:
-        _ensure_png_icons()
-        # This will run the start function in each of your commands as defined in commands/__init__.py
-        commands.start()
+        with futil.profile_step('addin', 'run'):
+            _ensure_png_icons()
+            # This will run the start function in each of your commands as defined in commands/__init__.py
+            commands.start()
 
     except:
         futil.handle_error('run')
 
+    # Persist the startup profile of this launch (only when profiling is enabled)
+    futil.save_startup_profile()
+
 
 def stop(context):
     try: